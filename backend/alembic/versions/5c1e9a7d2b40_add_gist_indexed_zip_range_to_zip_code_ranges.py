@@ -0,0 +1,47 @@
+"""add gist indexed zip_range to zip_code_ranges
+
+Revision ID: 5c1e9a7d2b40
+Revises: 61c074f99078
+Create Date: 2026-10-18 09:12:41.318204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1e9a7d2b40"
+down_revision: Union[str, None] = "61c074f99078"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # generated from the two bounds, so it can never drift from min_zip_code / max_zip_code
+    op.add_column(
+        "zip_code_ranges",
+        sa.Column(
+            "zip_range",
+            postgresql.INT4RANGE(),
+            sa.Computed("int4range(min_zip_code, max_zip_code, '[]')", persisted=True),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_zip_code_ranges_zip_range",
+        "zip_code_ranges",
+        ["zip_range"],
+        unique=False,
+        postgresql_using="gist",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_zip_code_ranges_zip_range", table_name="zip_code_ranges", postgresql_using="gist")
+    op.drop_column("zip_code_ranges", "zip_range")
@@ -0,0 +1,32 @@
+import hashlib
+
+from fastapi import Request, Response
+from starlette.status import HTTP_304_NOT_MODIFIED
+
+from app.core.config import settings
+
+
+def etag(*parts) -> str:
+    """Strong ETag over the parts. Read them before the body: a tag older than the body only costs a 200 later,
+    a tag newer than the body would answer 304 with stale data."""
+    return '"' + hashlib.sha256(":".join(str(part) for part in parts).encode()).hexdigest()[:32] + '"'
+
+
+def is_not_modified(request: Request, tag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    # If-None-Match compares weakly, a W/ prefix does not matter
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return tag in candidates or "*" in candidates
+
+
+def set_cache_headers(response: Response, tag: str) -> None:
+    response.headers["ETag"] = tag
+    response.headers["Cache-Control"] = settings.FACILITY_HTTP_CACHE_CONTROL
+
+
+def not_modified(tag: str) -> Response:
+    response = Response(status_code=HTTP_304_NOT_MODIFIED)
+    set_cache_headers(response, tag)
+    return response
@@ -1,14 +1,20 @@
-from typing import AsyncGenerator
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from typing import AsyncGenerator, Callable, TypeVar
 
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
 
+from app.core.config import settings
 from app.domain.repositories.facility_repository import FacilityRepository as FacilityRepositoryBase
 from app.domain.repositories.patient_repository import PatientRepository as PatientRepositoryBase
-from app.infrastructure.database.session import get_db_session
+from app.infrastructure.cache.cache_backend import cache_backend
+from app.infrastructure.database.session import get_db_session, get_read_db_session, get_stream_session_factory
 from app.infrastructure.repositories.facility_repository import FacilityRepository
 from app.infrastructure.repositories.patient_repository import PatientRepository
 
+Repository = TypeVar("Repository")
+
 
 async def get_patient_repository(
     session: AsyncSession = Depends(get_db_session),
@@ -16,7 +22,51 @@ async def get_patient_repository(
     yield PatientRepository(session)
 
 
+async def get_read_patient_repository(
+    session: AsyncSession = Depends(get_read_db_session),
+) -> AsyncGenerator[PatientRepositoryBase, None]:
+    yield PatientRepository(session)
+
+
 async def get_facility_repository(
     session: AsyncSession = Depends(get_db_session),
 ) -> AsyncGenerator[FacilityRepositoryBase, None]:
-    yield FacilityRepository(session)
+    yield _facility_repository(session)
+
+
+async def get_read_facility_repository(
+    session: AsyncSession = Depends(get_read_db_session),
+) -> AsyncGenerator[FacilityRepositoryBase, None]:
+    yield _facility_repository(session)
+
+
+def get_stream_patient_repository(
+    session_factory: sessionmaker = Depends(get_stream_session_factory),
+) -> Callable[[], AbstractAsyncContextManager[PatientRepositoryBase]]:
+    return _open_repository(session_factory, PatientRepository)
+
+
+def get_stream_facility_repository(
+    session_factory: sessionmaker = Depends(get_stream_session_factory),
+) -> Callable[[], AbstractAsyncContextManager[FacilityRepositoryBase]]:
+    return _open_repository(session_factory, _facility_repository)
+
+
+def _open_repository(
+    session_factory: sessionmaker, create: Callable[[AsyncSession], Repository]
+) -> Callable[[], AbstractAsyncContextManager[Repository]]:
+    # for StreamingResponse bodies, the repository gets its own session when the body starts
+    @asynccontextmanager
+    async def open_repository() -> AsyncGenerator[Repository, None]:
+        async with session_factory() as session:
+            yield create(session)
+
+    return open_repository
+
+
+def _facility_repository(session: AsyncSession) -> FacilityRepository:
+    return FacilityRepository(
+        session,
+        cache=cache_backend if settings.FACILITY_CACHE_ENABLED else None,
+        cache_ttl_seconds=settings.CACHE_TTL_SECONDS,
+    )
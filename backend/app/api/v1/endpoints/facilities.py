@@ -1,12 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException
-from starlette.status import HTTP_201_CREATED, HTTP_404_NOT_FOUND
-
-from app.api.v1.dependencies.repositories import get_facility_repository
-from app.api.v1.schemas.facility import FacilityCreate, FacilityResponse, FacilityUpdate
+from contextlib import AbstractAsyncContextManager
+from functools import partial
+from typing import Callable
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
+
+from app.api.v1.conditional import etag, is_not_modified, not_modified, set_cache_headers
+from app.api.v1.dependencies.repositories import (
+    get_facility_repository,
+    get_read_facility_repository,
+    get_stream_facility_repository,
+)
+from app.api.v1.export import ExportFormat, export_response
+from app.api.v1.pagination import NEXT_CURSOR_HEADER
+from app.api.v1.responses import facilities_json, facility_json, json_response
+from app.api.v1.schemas.facility import (
+    FacilityBulkCapacityResponse,
+    FacilityBulkCapacityUpdate,
+    FacilityCapacityResponse,
+    FacilityCapacityUpdate,
+    FacilityCreate,
+    FacilityResponse,
+    FacilityUpdate,
+)
+from app.api.v1.schemas.facility_import import FacilityImportError, FacilityImportResponse
 from app.domain.models.capacity_type import CapacityType
 from app.domain.models.care_type import CareType
 from app.domain.models.facility import Facility
 from app.domain.repositories.facility_repository import FacilityRepository
+from app.infrastructure.database.session import after_commit, get_db_session
+from app.use_cases.facility_changes import facility_changes
+from app.use_cases.import_facilities import ImportFacilitiesUseCase, iter_csv_records, iter_jsonl_records, iter_lines
 
 router = APIRouter()
 
@@ -15,6 +42,7 @@ router = APIRouter()
 async def create_facility(
     facility_in: FacilityCreate,
     facility_repo: FacilityRepository = Depends(get_facility_repository),
+    session: AsyncSession = Depends(get_db_session),
 ) -> FacilityResponse:
     facility = Facility(
         id=None,  # db-generated
@@ -29,39 +57,113 @@ async def create_facility(
         {"min_zip_code": zr.min_zip_code, "max_zip_code": zr.max_zip_code} for zr in facility_in.zip_code_ranges
     ]
 
-    return await facility_repo.create_with_zip_ranges(facility, zip_ranges_data)
+    created_facility = await facility_repo.create_with_zip_ranges(facility, zip_ranges_data)
+    after_commit(session, partial(facility_changes.facility_saved, created_facility))
+    return created_facility
+
+
+@router.post("/import", response_model=FacilityImportResponse)
+async def import_facilities(
+    request: Request,
+    facility_repo: FacilityRepository = Depends(get_facility_repository),
+    session: AsyncSession = Depends(get_db_session),
+) -> FacilityImportResponse:
+    """Bulk import from a JSON lines (one FacilityCreate per line) or CSV request body, in one transaction.
+
+    CSV needs a header row with name, zip_code, capacity, care_types and zip_code_ranges, where list cells
+    are separated by "|" and ranges are written as min-max, e.g. "10000-10999|12000-12999".
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    parse = iter_csv_records if content_type == "text/csv" else iter_jsonl_records
+
+    try:
+        result = await ImportFacilitiesUseCase(facility_repository=facility_repo).execute(
+            parse(iter_lines(request.stream()))
+        )
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+
+    after_commit(session, partial(facility_changes.facilities_imported, result.care_types))
+
+    return FacilityImportResponse(
+        imported=result.imported,
+        failed=result.failed,
+        errors=[FacilityImportError(row=error.row, error=error.error) for error in result.errors],
+    )
 
 
 @router.get("", response_model=list[FacilityResponse])
 async def get_facilities(
+    request: Request,
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1),
+    cursor: str | None = None,
     capacity: CapacityType | None = None,
     care_type: CareType | None = None,
     zip_code: str | None = None,
-    facility_repo: FacilityRepository = Depends(get_facility_repository),
+    facility_repo: FacilityRepository = Depends(get_read_facility_repository),
 ) -> list[FacilityResponse]:
+    tag = etag("facilities", await facility_repo.get_table_version(), request.url.query)
+    if is_not_modified(request, tag):
+        return not_modified(tag)
+    set_cache_headers(response, tag)
+
     if capacity:
-        return await facility_repo.get_by_capacity(capacity)
+        facilities = await facility_repo.get_by_capacity(capacity)
     elif care_type:
-        return await facility_repo.get_by_care_type(care_type)
+        facilities = await facility_repo.get_by_care_type(care_type)
     elif zip_code:
-        return await facility_repo.get_by_zip_code(zip_code)
-    return await facility_repo.get_all(skip=skip, limit=limit)
+        facilities = await facility_repo.get_by_zip_code(zip_code)
+    elif skip:
+        facilities = await facility_repo.get_all(skip=skip, limit=limit)
+    else:
+        try:
+            facilities, next_cursor = await facility_repo.get_page(limit=limit, cursor=cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+        if next_cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return json_response(facilities_json(facilities), response)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_facilities(
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    open_facility_repo: Callable[[], AbstractAsyncContextManager[FacilityRepository]] = Depends(
+        get_stream_facility_repository
+    ),
+) -> StreamingResponse:
+    return export_response(
+        open_facility_repo,
+        lambda facility_repo: facility_repo.stream_all(),
+        FacilityResponse,
+        export_format,
+        filename="facilities",
+    )
 
 
 @router.get("/{facility_id}", response_model=FacilityResponse)
 async def get_facility(
+    request: Request,
+    response: Response,
     facility_id: str,
-    facility_repo: FacilityRepository = Depends(get_facility_repository),
+    facility_repo: FacilityRepository = Depends(get_read_facility_repository),
 ) -> FacilityResponse:
+    updated_at = await facility_repo.get_updated_at(facility_id)
+    if updated_at is not None:
+        tag = etag("facility", facility_id, updated_at.isoformat(), await facility_repo.get_table_version())
+        if is_not_modified(request, tag):
+            return not_modified(tag)
+        set_cache_headers(response, tag)
+
     facility = await facility_repo.get_by_id(facility_id)
     if facility is None:
         raise HTTPException(
             status_code=HTTP_404_NOT_FOUND,
             detail=f"Facility with ID {facility_id} not found",
         )
-    return facility
+    return json_response(facility_json(facility), response)
 
 
 @router.put("/{facility_id}", response_model=FacilityResponse)
@@ -69,6 +171,7 @@ async def update_facility(
     facility_id: str,
     facility_in: FacilityUpdate,
     facility_repo: FacilityRepository = Depends(get_facility_repository),
+    session: AsyncSession = Depends(get_db_session),
 ) -> FacilityResponse:
     current_facility = await facility_repo.get_by_id(facility_id)
     if current_facility is None:
@@ -87,19 +190,56 @@ async def update_facility(
         zip_code_ranges=update_data.get("zip_code_ranges", current_facility.zip_code_ranges),
     )
 
-    result = await facility_repo.update(facility_id, updated_facility)
+    result = await facility_repo.update(facility_id, updated_facility, current=current_facility)
     if result is None:
         raise HTTPException(
             status_code=HTTP_404_NOT_FOUND,
             detail=f"Facility with ID {facility_id} not found",
         )
+    after_commit(session, partial(facility_changes.facility_saved, result))
     return result
 
 
+@router.patch("/capacity", response_model=FacilityBulkCapacityResponse)
+async def update_facilities_capacity(
+    capacity_in: FacilityBulkCapacityUpdate,
+    facility_repo: FacilityRepository = Depends(get_facility_repository),
+    session: AsyncSession = Depends(get_db_session),
+) -> FacilityBulkCapacityResponse:
+    ids = list(dict.fromkeys(str(facility_id) for facility_id in capacity_in.ids))
+    updated = await facility_repo.set_capacity(ids, capacity_in.capacity)
+    after_commit(session, partial(facility_changes.capacity_changed, facility_repo, updated, capacity_in.capacity))
+
+    updated_ids = set(updated)
+    return FacilityBulkCapacityResponse(
+        capacity=capacity_in.capacity,
+        updated=[facility_id for facility_id in ids if facility_id in updated_ids],
+        not_found=[facility_id for facility_id in ids if facility_id not in updated_ids],
+    )
+
+
+@router.patch("/{facility_id}/capacity", response_model=FacilityCapacityResponse)
+async def update_facility_capacity(
+    facility_id: UUID,
+    capacity_in: FacilityCapacityUpdate,
+    facility_repo: FacilityRepository = Depends(get_facility_repository),
+    session: AsyncSession = Depends(get_db_session),
+) -> FacilityCapacityResponse:
+    ids = [str(facility_id)]
+    if not await facility_repo.set_capacity(ids, capacity_in.capacity):
+        raise HTTPException(
+            status_code=HTTP_404_NOT_FOUND,
+            detail=f"Facility with ID {facility_id} not found",
+        )
+    after_commit(session, partial(facility_changes.capacity_changed, facility_repo, ids, capacity_in.capacity))
+    return FacilityCapacityResponse(id=str(facility_id), capacity=capacity_in.capacity)
+
+
 @router.delete("/{facility_id}", response_model=bool)
 async def delete_facility(
     facility_id: str,
     facility_repo: FacilityRepository = Depends(get_facility_repository),
+    session: AsyncSession = Depends(get_db_session),
 ) -> bool:
     result = await facility_repo.soft_delete(facility_id)
     if not result:
@@ -107,4 +247,5 @@ async def delete_facility(
             status_code=HTTP_404_NOT_FOUND,
             detail=f"Facility with ID {facility_id} not found",
         )
+    after_commit(session, partial(facility_changes.facility_removed, facility_id))
     return result
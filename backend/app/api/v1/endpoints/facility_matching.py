@@ -1,19 +1,69 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Body, Depends
 
-from app.api.v1.dependencies.repositories import get_facility_repository
+from app.api.v1.dependencies.repositories import get_facility_repository, get_read_facility_repository
+from app.api.v1.responses import json_response, match_json, matches_json
 from app.api.v1.schemas.facility_match import FacilityMatchRequest, FacilityMatchResponse
+from app.core.config import settings
 from app.domain.repositories.facility_repository import FacilityRepository
-from app.use_cases.match_facility import MatchFacilityUseCase
+from app.use_cases.match_cache import match_cache
+from app.use_cases.match_facility import MatchCandidate, MatchFacilityUseCase
+from app.use_cases.match_table import facility_match_tables
+from app.use_cases.zip_range_index import facility_zip_index
+
+MAX_BATCH_SIZE = 1000
 
 router = APIRouter()
 
 
+def get_match_facility_use_case(
+    facility_repo: FacilityRepository = Depends(get_read_facility_repository),
+    primary_facility_repo: FacilityRepository = Depends(get_facility_repository),
+) -> MatchFacilityUseCase:
+    use_zip_index = settings.MATCH_ZIP_INDEX_ENABLED or settings.MATCH_TABLE_ENABLED
+    # the zip index is loaded once and then follows the writes, a load from a lagging replica would stick
+    return MatchFacilityUseCase(
+        facility_repository=primary_facility_repo if use_zip_index else facility_repo,
+        zip_index=facility_zip_index if use_zip_index else None,
+        match_cache=match_cache if settings.MATCH_CACHE_ENABLED else None,
+        match_tables=facility_match_tables if settings.MATCH_TABLE_ENABLED else None,
+    )
+
+
+async def find_candidates(
+    match_facility_use_case: MatchFacilityUseCase, request: FacilityMatchRequest
+) -> list[MatchCandidate]:
+    return await match_facility_use_case.find_candidates(
+        request.care_type,
+        request.zip_code,
+        top_k=request.top_k,
+        exclude_ids={str(facility_id) for facility_id in request.exclude_ids},
+    )
+
+
 @router.post("/match-facility", response_model=FacilityMatchResponse)
 async def match_facility(
     request: FacilityMatchRequest,
-    facility_repo: FacilityRepository = Depends(get_facility_repository),
+    match_facility_use_case: MatchFacilityUseCase = Depends(get_match_facility_use_case),
+):
+    return json_response(match_json(await find_candidates(match_facility_use_case, request)))
+
+
+@router.post("/match-facilities", response_model=list[FacilityMatchResponse])
+async def match_facilities(
+    requests: list[FacilityMatchRequest] = Body(..., max_length=MAX_BATCH_SIZE),
+    match_facility_use_case: MatchFacilityUseCase = Depends(get_match_facility_use_case),
 ):
-    match_facility_use_case = MatchFacilityUseCase(facility_repository=facility_repo)
-    facility = await match_facility_use_case.execute(request.care_type, request.zip_code)
+    # plain single matches share one load per care type, ranked requests are answered one by one
+    single = [position for position, request in enumerate(requests) if request.top_k == 1 and not request.exclude_ids]
+    facilities = await match_facility_use_case.execute_many(
+        [(requests[position].care_type, requests[position].zip_code) for position in single]
+    )
 
-    return FacilityMatchResponse(matched=facility is not None, facility=facility)
+    matches: list[list[MatchCandidate] | None] = [None] * len(requests)
+    for position, facility in zip(single, facilities):
+        zip_code = requests[position].zip_code
+        matches[position] = [match_facility_use_case.to_candidate(facility, int(zip_code))] if facility else []
+    for position, request in enumerate(requests):
+        if matches[position] is None:
+            matches[position] = await find_candidates(match_facility_use_case, request)
+    return json_response(matches_json(matches))
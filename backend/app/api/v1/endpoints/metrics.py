@@ -0,0 +1,22 @@
+from fastapi import APIRouter
+
+from app.api.v1.schemas.metrics import MetricsResponse, PoolMetricsResponse
+from app.infrastructure.database.pool import pool_metrics
+from app.infrastructure.database.session import engine, read_engine
+from app.use_cases.match_cache import match_cache
+
+router = APIRouter()
+
+
+@router.get("", response_model=MetricsResponse)
+async def get_metrics() -> MetricsResponse:
+    """Per-process counters, every worker reports its own."""
+    engines = {"primary": engine, "read": read_engine}
+    return MetricsResponse(
+        db_pools={
+            name: PoolMetricsResponse(**pool_metrics(pool_engine).snapshot())
+            for name, pool_engine in engines.items()
+            if pool_engine is not None
+        },
+        match_cache=match_cache.stats(),
+    )
@@ -1,7 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
-from starlette.status import HTTP_201_CREATED, HTTP_404_NOT_FOUND
+from contextlib import AbstractAsyncContextManager
+from typing import Callable
 
-from app.api.v1.dependencies.repositories import get_patient_repository
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from starlette.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
+
+from app.api.v1.dependencies.repositories import (
+    get_patient_repository,
+    get_read_patient_repository,
+    get_stream_patient_repository,
+)
+from app.api.v1.export import ExportFormat, export_response
+from app.api.v1.pagination import NEXT_CURSOR_HEADER
 from app.api.v1.schemas.patient import PatientCreate, PatientResponse, PatientUpdate
 from app.domain.models.care_type import CareType
 from app.domain.models.patient import Patient
@@ -26,23 +36,50 @@ async def create_patient(
 
 @router.get("", response_model=list[PatientResponse])
 async def get_patients(
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1),
+    cursor: str | None = None,
     care_type: CareType | None = None,
     zip_code: str | None = None,
-    patient_repo: PatientRepository = Depends(get_patient_repository),
+    patient_repo: PatientRepository = Depends(get_read_patient_repository),
 ) -> list[PatientResponse]:
     if care_type:
         return await patient_repo.get_by_care_type(care_type)
     elif zip_code:
         return await patient_repo.get_by_zip_code(zip_code)
-    return await patient_repo.get_all(skip=skip, limit=limit)
+    if skip:
+        return await patient_repo.get_all(skip=skip, limit=limit)
+
+    try:
+        patients, next_cursor = await patient_repo.get_page(limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return patients
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_patients(
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    open_patient_repo: Callable[[], AbstractAsyncContextManager[PatientRepository]] = Depends(
+        get_stream_patient_repository
+    ),
+) -> StreamingResponse:
+    return export_response(
+        open_patient_repo,
+        lambda patient_repo: patient_repo.stream_all(),
+        PatientResponse,
+        export_format,
+        filename="patients",
+    )
 
 
 @router.get("/{patient_id}", response_model=PatientResponse)
 async def get_patient(
     patient_id: str,
-    patient_repo: PatientRepository = Depends(get_patient_repository),
+    patient_repo: PatientRepository = Depends(get_read_patient_repository),
 ) -> PatientResponse:
     patient = await patient_repo.get_by_id(patient_id)
     if patient is None:
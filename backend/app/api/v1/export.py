@@ -0,0 +1,76 @@
+import csv
+import io
+from contextlib import AbstractAsyncContextManager
+from enum import Enum
+from typing import AsyncIterator, Callable
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.use_cases.import_facilities import CSV_LIST_SEPARATOR
+
+# rows per chunk written to the response, large enough to avoid tiny writes and small enough for a fast first byte
+EXPORT_CHUNK_ROWS = 500
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+EXPORT_MEDIA_TYPES = {ExportFormat.ndjson: "application/x-ndjson", ExportFormat.csv: "text/csv"}
+
+
+def _csv_value(value) -> str:
+    # lists are joined as the CSV import splits them, nested objects (zip code ranges) with "-"
+    if isinstance(value, list):
+        return CSV_LIST_SEPARATOR.join(_csv_value(item) for item in value)
+    if isinstance(value, dict):
+        return "-".join(str(item) for item in value.values())
+    return "" if value is None else str(value)
+
+
+def export_response(
+    open_repository: Callable[[], AbstractAsyncContextManager],
+    rows: Callable[[object], AsyncIterator],
+    response_model: type[BaseModel],
+    export_format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    """Stream rows(repository) as NDJSON or CSV, chunk by chunk, so memory does not grow with the table.
+
+    The repository is opened by the response body: it runs after the request's dependencies have exited.
+    """
+
+    async def body() -> AsyncIterator[str]:
+        columns = list(response_model.model_fields)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        if export_format == ExportFormat.csv:
+            writer.writerow(columns)
+
+        count = 0
+        async with open_repository() as repository:
+            async for item in rows(repository):
+                model = response_model.model_validate(item, from_attributes=True)
+                if export_format == ExportFormat.csv:
+                    data = model.model_dump(mode="json")
+                    writer.writerow([_csv_value(data[column]) for column in columns])
+                else:
+                    buffer.write(model.model_dump_json())
+                    buffer.write("\n")
+
+                count += 1
+                if count % EXPORT_CHUNK_ROWS == 0:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'},
+    )
@@ -0,0 +1,2 @@
+# response header carrying the cursor of the next page for keyset-paginated listings
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
@@ -0,0 +1,61 @@
+from typing import Any, Sequence
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.api.v1.schemas.facility import FacilityResponse, ZipCodeRangeCreate
+from app.domain.models.facility import Facility
+from app.use_cases.match_facility import MatchCandidate
+
+# the FacilityResponse fields of a domain Facility: facilities are serialized straight to JSON bytes, without
+# FastAPI validating them into FacilityResponse models first and then encoding those
+FACILITY_RESPONSE_FIELDS = {
+    **{field: True for field in FacilityResponse.model_fields},
+    "zip_code_ranges": {"__all__": {field: True for field in ZipCodeRangeCreate.model_fields}},
+}
+MATCH_RESPONSE_FIELDS = {
+    "matched": True,
+    "facility": FACILITY_RESPONSE_FIELDS,
+    "candidates": {"__all__": {"facility": FACILITY_RESPONSE_FIELDS, "distance": True}},
+}
+
+_FACILITY = TypeAdapter(Facility)
+_FACILITIES = TypeAdapter(list[Facility])
+_MATCH = TypeAdapter(dict[str, Any])
+_MATCHES = TypeAdapter(list[dict[str, Any]])
+
+
+def json_response(content: bytes, response: Response | None = None, status_code: int = 200) -> Response:
+    """A JSON body that is already serialized, with the headers set on the handler's `response` parameter."""
+    json = Response(content, status_code=status_code, media_type="application/json")
+    if response is not None:
+        # FastAPI only merges those into responses it builds itself
+        json.raw_headers.extend(response.raw_headers)
+    return json
+
+
+def facility_json(facility: Facility) -> bytes:
+    return _FACILITY.dump_json(facility, include=FACILITY_RESPONSE_FIELDS)
+
+
+def facilities_json(facilities: Sequence[Facility]) -> bytes:
+    return _FACILITIES.dump_json(facilities, include={"__all__": FACILITY_RESPONSE_FIELDS})
+
+
+def match_json(candidates: Sequence[MatchCandidate]) -> bytes:
+    """FacilityMatchResponse from the candidates of a match request."""
+    return _MATCH.dump_json(_match(candidates), include=MATCH_RESPONSE_FIELDS)
+
+
+def matches_json(matches: Sequence[Sequence[MatchCandidate]]) -> bytes:
+    return _MATCHES.dump_json(
+        [_match(candidates) for candidates in matches], include={"__all__": MATCH_RESPONSE_FIELDS}
+    )
+
+
+def _match(candidates: Sequence[MatchCandidate]) -> dict[str, Any]:
+    return {
+        "matched": bool(candidates),
+        "facility": candidates[0].facility if candidates else None,
+        "candidates": [{"facility": candidate.facility, "distance": candidate.distance} for candidate in candidates],
+    }
@@ -1,8 +1,12 @@
+from uuid import UUID
+
 from pydantic import BaseModel, Field
 
 from app.domain.models.capacity_type import CapacityType
 from app.domain.models.care_type import CareType
 
+MAX_CAPACITY_UPDATE_IDS = 1000
+
 
 class ZipCodeRangeCreate(BaseModel):
     min_zip_code: int
@@ -38,3 +42,20 @@ class FacilityInDB(FacilityBase):
 
 class FacilityResponse(FacilityInDB):
     pass
+
+
+class FacilityCapacityUpdate(BaseModel):
+    capacity: CapacityType
+
+
+class FacilityCapacityResponse(FacilityCapacityUpdate):
+    id: str
+
+
+class FacilityBulkCapacityUpdate(FacilityCapacityUpdate):
+    ids: list[UUID] = Field(..., min_length=1, max_length=MAX_CAPACITY_UPDATE_IDS)
+
+
+class FacilityBulkCapacityResponse(FacilityCapacityUpdate):
+    updated: list[str]
+    not_found: list[str]
@@ -0,0 +1,12 @@
+from pydantic import BaseModel, Field
+
+
+class FacilityImportError(BaseModel):
+    row: int
+    error: str
+
+
+class FacilityImportResponse(BaseModel):
+    imported: int
+    failed: int
+    errors: list[FacilityImportError] = Field(default_factory=list)
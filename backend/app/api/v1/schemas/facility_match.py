@@ -1,15 +1,28 @@
-from pydantic import BaseModel
+from uuid import UUID
+
+from pydantic import BaseModel, Field
 
 from app.api.v1.schemas.facility import FacilityResponse
 from app.domain.models.care_type import CareType
 
+MAX_TOP_K = 50
+
 
 class FacilityMatchRequest(BaseModel):
     patient_name: str
     care_type: CareType
     zip_code: str | None = None
+    top_k: int = Field(1, ge=1, le=MAX_TOP_K)
+    exclude_ids: list[UUID] = Field(default_factory=list, max_length=1000)
+
+
+class FacilityMatchCandidate(BaseModel):
+    facility: FacilityResponse
+    distance: int
 
 
 class FacilityMatchResponse(BaseModel):
     matched: bool
     facility: FacilityResponse | None = None
+    # ranked by distance, the first one is `facility`
+    candidates: list[FacilityMatchCandidate] = Field(default_factory=list)
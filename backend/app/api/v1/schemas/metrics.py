@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+
+
+class PoolMetricsResponse(BaseModel):
+    capacity: int | None
+    in_use: int
+    max_in_use: int
+    utilisation: float | None
+    checkouts: int
+    checkout_wait_avg_ms: float
+    checkout_wait_p95_ms: float
+    checkout_wait_max_ms: float
+
+
+class MetricsResponse(BaseModel):
+    db_pools: dict[str, PoolMetricsResponse]
+    match_cache: dict[str, int]
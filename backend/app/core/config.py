@@ -15,7 +15,37 @@ class Settings(BaseSettings):
     DB_NAME: str = os.getenv("DB_NAME", "postgres")
     DB_PORT: str = os.getenv("DB_PORT", "5432")
     DATABASE_URL: str | None = None
+    # optional read replica for GET endpoints and matching, same pool settings as the primary
+    DATABASE_READ_URL: str | None = None
+    # how long a client that wrote is kept reading from the primary, to see its own writes despite replica lag
+    READ_YOUR_WRITES_SECONDS: int = 5
     DB_ECHO_LOG: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    # ping each connection on checkout to replace dropped ones, opt-in: it costs a round trip per checkout
+    DB_POOL_PRE_PING: bool = False
+    # open a connection per session instead of pooling, for Lambda where pools do not outlive invocations
+    DB_NULL_POOL: bool = False
+    # asyncpg prepared statement cache per connection, 0 behind PgBouncer in transaction mode
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_STATEMENT_TIMEOUT_MS: int | None = None
+
+    # serve matches from the in-process zip range index instead of querying the database
+    MATCH_ZIP_INDEX_ENABLED: bool = False
+    # precompute the winning facility of every zip code on top of the zip range index (enables it too)
+    MATCH_TABLE_ENABLED: bool = False
+    # cache match results per (care type, zip code), invalidated by facility writes
+    MATCH_CACHE_ENABLED: bool = False
+    # cache the facilities of each care type, e.g. for loading the zip index after a cold start
+    FACILITY_CACHE_ENABLED: bool = False
+    # redis:// URL of a cache shared by all workers, otherwise each process caches on its own
+    CACHE_URL: str | None = None
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_TTL_SECONDS: float = 60.0
+    # sent with the ETags of facility reads, no-cache lets clients keep responses but revalidate them every time
+    FACILITY_HTTP_CACHE_CONTROL: str = "private, no-cache"
 
     @field_validator("DATABASE_URL", mode="before")
     def assemble_db_url(cls, v: str | None, info: ValidationInfo) -> Any:
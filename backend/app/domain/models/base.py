@@ -1,18 +1,31 @@
 from datetime import datetime, timezone
-from typing import Self
+from typing import Any, ClassVar, Self, get_args
 
 from pydantic import BaseModel, ConfigDict, model_validator
 
 
+def _is_datetime(annotation: Any) -> bool:
+    return annotation is datetime or datetime in get_args(annotation)
+
+
 class CustomBaseModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
-    # use utc timezone for all datetime fields to avoid timezone issues
+    # collected once per class, instantiation only looks at these fields
+    _datetime_fields: ClassVar[tuple[str, ...]] = ()
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        cls._datetime_fields = tuple(name for name, field in cls.model_fields.items() if _is_datetime(field.annotation))
+
+    # use utc timezone for all datetime fields to avoid timezone issues, naive datetimes are taken to be utc
     @model_validator(mode="after")
     def validate_model(self) -> Self:
-        for key, value in self.model_fields.items():
+        for key in self._datetime_fields:
+            value = getattr(self, key)
             if isinstance(value, datetime) and value.tzinfo is None:
-                setattr(self, key, value.astimezone(timezone.utc))
+                setattr(self, key, value.replace(tzinfo=timezone.utc))
         return self
 
     # to enforce json serialization for all models
@@ -23,12 +23,12 @@ class Facility(CustomBaseModel):
 
     @field_validator("capacity", mode="before")
     def validate_capacity(cls, value: str | None):
-        if value is not None:
+        if isinstance(value, str):
             return value.lower()
         return value
 
     @field_validator("care_types", mode="before")
     def validate_care_types(cls, value: list[str] | None):
-        if value is not None:
-            return [care_type.lower() for care_type in value]
+        if isinstance(value, list):
+            return [care_type.lower() if isinstance(care_type, str) else care_type for care_type in value]
         return value
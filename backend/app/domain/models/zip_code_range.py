@@ -1,15 +1,23 @@
-from pydantic import field_validator
+from typing import Self
+
+from pydantic import field_validator, model_validator
 
 from app.domain.models.base import CustomBaseModel
 from app.domain.models.utils import validate_uuid
 
 
 class ZipCodeRange(CustomBaseModel):
-    id: str
-    facility_id: str
+    id: str | None = None
+    facility_id: str | None = None
     min_zip_code: int
     max_zip_code: int
 
     @field_validator("id", "facility_id", mode="before")
     def validate_uuid(cls, value):
         return validate_uuid(value)
+
+    @model_validator(mode="after")
+    def validate_bounds(self) -> Self:
+        if self.min_zip_code > self.max_zip_code:
+            raise ValueError(f"min_zip_code {self.min_zip_code} is greater than max_zip_code {self.max_zip_code}")
+        return self
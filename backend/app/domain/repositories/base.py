@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
+from typing import AsyncIterator, Generic, TypeVar
 
 T = TypeVar("T")
 
@@ -17,6 +17,16 @@ class BaseRepository(Generic[T], ABC):
     async def get_all(self, skip: int = 0, limit: int = 100) -> list[T]:
         pass
 
+    @abstractmethod
+    async def get_page(self, limit: int = 100, cursor: str | None = None) -> tuple[list[T], str | None]:
+        """Keyset pagination, returns the page and the cursor of the next one (None on the last page)"""
+        pass
+
+    @abstractmethod
+    def stream_all(self, batch_size: int = 1000) -> AsyncIterator[T]:
+        """All rows in (created_at, id) order, read through a server-side cursor batch_size rows at a time"""
+        pass
+
     @abstractmethod
     async def update(self, id: str, obj_in: T) -> T | None:
         pass
@@ -1,5 +1,8 @@
 from abc import ABC
+from datetime import datetime
+from typing import Collection, Sequence
 
+from app.domain.models.capacity_type import CapacityType
 from app.domain.models.care_type import CareType
 from app.domain.models.facility import Facility
 from app.domain.repositories.base import BaseRepository
@@ -14,3 +17,39 @@ class FacilityRepository(BaseRepository[Facility], ABC):
 
     async def get_by_care_type(self, care_type: CareType) -> list[Facility]:
         pass
+
+    async def find_match_candidates(
+        self,
+        care_type: CareType,
+        zip_code: int,
+        max_distance: int,
+        limit: int = 1,
+        exclude_ids: Collection[str] = (),
+    ) -> list[Facility]:
+        pass
+
+    async def find_matches(
+        self, care_type: CareType, zip_codes: Collection[int], max_distance: int
+    ) -> dict[int, Facility]:
+        """The best match of every zip code in one query, zip codes without a match are left out"""
+        pass
+
+    async def get_by_ids(self, ids: Sequence[str]) -> list[Facility]:
+        pass
+
+    async def get_updated_at(self, id: str) -> datetime | None:
+        pass
+
+    async def get_table_version(self) -> int:
+        """Changes with every committed write to any facility"""
+        pass
+
+    async def update(self, id: str, obj_in: Facility, current: Facility | None = None) -> Facility | None:
+        pass
+
+    async def bulk_create(self, facilities: Sequence[Facility]) -> int:
+        pass
+
+    async def set_capacity(self, ids: Sequence[str], capacity: CapacityType) -> list[str]:
+        """Returns the ids that were updated, missing and deleted facilities are skipped"""
+        pass
@@ -1,4 +1,5 @@
 from abc import ABC
+from typing import Sequence
 
 from app.domain.models.patient import Patient
 from app.domain.repositories.base import BaseRepository
@@ -10,3 +11,11 @@ class PatientRepository(BaseRepository[Patient], ABC):
 
     async def get_by_zip_code(self, zip_code: str) -> list[Patient]:
         pass
+
+    async def get_chunk(self, limit: int, after_id: str | None = None) -> list[Patient]:
+        """Non-deleted patients ordered by id, the ones after after_id"""
+        pass
+
+    async def assign_facilities(self, assignments: Sequence[tuple[str, str | None]]) -> None:
+        """Store the matched facility (or None) per patient id"""
+        pass
@@ -0,0 +1,178 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, Iterable
+
+
+class CacheBackend(ABC):
+    """The subset of Redis the caches need: string values with a TTL, sorted indexes and pub/sub."""
+
+    @abstractmethod
+    async def get(self, key: str) -> str | None:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        pass
+
+    @abstractmethod
+    async def delete(self, keys: Iterable[str]) -> None:
+        """Delete values and indexes alike, missing keys are ignored"""
+        pass
+
+    @abstractmethod
+    async def index_add(self, index: str, member: str, score: float, ttl_seconds: float | None = None) -> None:
+        """Add or rescore a member. With ttl_seconds the whole index expires that long after its last add."""
+        pass
+
+    @abstractmethod
+    async def index_range(
+        self, index: str, min_score: float = float("-inf"), max_score: float = float("inf")
+    ) -> list[str]:
+        """Members scored within [min_score, max_score], by score"""
+        pass
+
+    @abstractmethod
+    async def index_remove(self, index: str, members: Iterable[str]) -> None:
+        pass
+
+    @abstractmethod
+    async def publish(self, channel: str, message: str) -> None:
+        pass
+
+    @abstractmethod
+    def subscribe(self, channel: str) -> AsyncIterator[str]:
+        """Messages published to the channel from now on, until the iterator is closed"""
+        pass
+
+    def stats(self) -> dict[str, int]:
+        return {}
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Process-local backend, LRU-bounded when max_entries is set. Pub/sub only reaches this process.
+
+    Index members that are value keys leave every index along with their value, whether it expires, is evicted
+    or deleted, so the indexes stay as bounded as the values.
+    """
+
+    def __init__(self, max_entries: int | None = None, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._values: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        # per index the (score, member) pairs in order, and the score of each member
+        self._indexes: dict[str, tuple[list[tuple[float, str]], dict[str, float]]] = {}
+        self._index_expiry: dict[str, float] = {}
+        # the indexes each member is in
+        self._memberships: dict[str, set[str]] = {}
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self.evictions = 0
+
+    async def get(self, key: str) -> str | None:
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= self._clock():
+            self._drop_value(key)
+            return None
+        self._values.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        self._values[key] = (self._clock() + ttl_seconds, value)
+        self._values.move_to_end(key)
+        while self.max_entries is not None and len(self._values) > self.max_entries:
+            self._drop_value(next(iter(self._values)))
+            self.evictions += 1
+
+    async def delete(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._drop_value(key)
+            self._drop_index(key)
+
+    async def index_add(self, index: str, member: str, score: float, ttl_seconds: float | None = None) -> None:
+        entries, scores = self._live_index(index) or self._indexes.setdefault(index, ([], {}))
+        if member in scores:
+            self._remove_entry(entries, scores, member)
+        scores[member] = score
+        insort(entries, (score, member))
+        self._memberships.setdefault(member, set()).add(index)
+        if ttl_seconds is not None:
+            self._index_expiry[index] = self._clock() + ttl_seconds
+
+    async def index_range(
+        self, index: str, min_score: float = float("-inf"), max_score: float = float("inf")
+    ) -> list[str]:
+        entries, _ = self._live_index(index) or ([], {})
+        start = bisect_left(entries, min_score, key=lambda entry: entry[0])
+        end = bisect_right(entries, max_score, key=lambda entry: entry[0])
+        return [member for _, member in entries[start:end]]
+
+    async def index_remove(self, index: str, members: Iterable[str]) -> None:
+        for member in members:
+            self._remove_member(index, member)
+
+    async def publish(self, channel: str, message: str) -> None:
+        for queue in self._subscribers.get(channel, ()):
+            queue.put_nowait(message)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[str]:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(channel, set()).add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers[channel].discard(queue)
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._values), "evictions": self.evictions}
+
+    def clear(self) -> None:
+        self._values.clear()
+        self._indexes.clear()
+        self._index_expiry.clear()
+        self._memberships.clear()
+
+    def _live_index(self, index: str) -> tuple[list[tuple[float, str]], dict[str, float]] | None:
+        expiry = self._index_expiry.get(index)
+        if expiry is not None and expiry <= self._clock():
+            self._drop_index(index)
+        return self._indexes.get(index)
+
+    def _drop_value(self, key: str) -> None:
+        self._values.pop(key, None)
+        for index in list(self._memberships.get(key, ())):
+            self._remove_member(index, key)
+
+    def _drop_index(self, index: str) -> None:
+        _, scores = self._indexes.pop(index, ([], {}))
+        self._index_expiry.pop(index, None)
+        for member in scores:
+            self._forget_membership(member, index)
+
+    def _remove_member(self, index: str, member: str) -> None:
+        if index not in self._indexes:
+            return
+        entries, scores = self._indexes[index]
+        if member in scores:
+            self._remove_entry(entries, scores, member)
+            self._forget_membership(member, index)
+        if not entries:
+            self._drop_index(index)
+
+    def _forget_membership(self, member: str, index: str) -> None:
+        indexes = self._memberships.get(member)
+        if indexes is not None:
+            indexes.discard(index)
+            if not indexes:
+                del self._memberships[member]
+
+    @staticmethod
+    def _remove_entry(entries: list[tuple[float, str]], scores: dict[str, float], member: str) -> None:
+        del entries[bisect_left(entries, (scores.pop(member), member))]
@@ -0,0 +1,16 @@
+from app.core.config import settings
+from app.infrastructure.cache.backend import CacheBackend, InMemoryCacheBackend
+from app.infrastructure.cache.redis_backend import RedisCacheBackend
+
+REDIS_URL_SCHEMES = ("redis://", "rediss://", "unix://")
+
+
+def create_cache_backend(url: str | None, max_entries: int | None = None) -> CacheBackend:
+    if not url:
+        return InMemoryCacheBackend(max_entries=max_entries)
+    if url.startswith(REDIS_URL_SCHEMES):
+        return RedisCacheBackend.from_url(url)
+    raise ValueError(f"Unsupported CACHE_URL: {url}")
+
+
+cache_backend = create_cache_backend(settings.CACHE_URL, max_entries=settings.CACHE_MAX_ENTRIES)
@@ -0,0 +1,76 @@
+from typing import AsyncIterator, Iterable
+
+from app.infrastructure.cache.backend import CacheBackend
+
+try:
+    from redis import asyncio as aioredis
+except ImportError:  # optional, installed with the "redis" extra
+    aioredis = None
+
+
+def _score_bound(score: float) -> str | float:
+    if score == float("-inf"):
+        return "-inf"
+    if score == float("inf"):
+        return "+inf"
+    return score
+
+
+class RedisCacheBackend(CacheBackend):
+    """Shared backend on any Redis-protocol server, so all workers and Lambda instances see the same entries."""
+
+    def __init__(self, client):
+        self._client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCacheBackend":
+        if aioredis is None:
+            raise RuntimeError("CACHE_URL points at Redis but the redis package is not installed")
+        return cls(aioredis.from_url(url, decode_responses=True))
+
+    async def get(self, key: str) -> str | None:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        await self._client.set(key, value, px=max(1, int(ttl_seconds * 1000)))
+
+    async def delete(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        if keys:
+            await self._client.delete(*keys)
+
+    async def index_add(self, index: str, member: str, score: float, ttl_seconds: float | None = None) -> None:
+        if ttl_seconds is None:
+            await self._client.zadd(index, {member: score})
+            return
+        async with self._client.pipeline(transaction=False) as pipeline:
+            pipeline.zadd(index, {member: score})
+            pipeline.pexpire(index, max(1, int(ttl_seconds * 1000)))
+            await pipeline.execute()
+
+    async def index_range(
+        self, index: str, min_score: float = float("-inf"), max_score: float = float("inf")
+    ) -> list[str]:
+        return await self._client.zrangebyscore(index, _score_bound(min_score), _score_bound(max_score))
+
+    async def index_remove(self, index: str, members: Iterable[str]) -> None:
+        members = list(members)
+        if members:
+            await self._client.zrem(index, *members)
+
+    async def publish(self, channel: str, message: str) -> None:
+        await self._client.publish(channel, message)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[str]:
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(channel)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    yield message["data"]
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        await self._client.aclose()
@@ -1,9 +1,23 @@
 # flake8: noqa: F401
+import uuid
+
 from sqlalchemy.dialects.postgresql import UUID as _UUID
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.types import TypeDecorator
 
 Base = declarative_base()
 
 
+class _StrCoercingUUID(TypeDecorator):
+    # repositories pass ids around as strings, not every driver accepts those for uuid columns
+    impl = _UUID(as_uuid=True)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, str):
+            return uuid.UUID(value)
+        return value
+
+
 def UUID():
-    return _UUID(as_uuid=True)
+    return _StrCoercingUUID()
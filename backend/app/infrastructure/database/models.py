@@ -1,8 +1,32 @@
+import json
 import uuid
+from typing import Sequence
 
 import sqlalchemy as sa
-from sqlalchemy import TIMESTAMP, CheckConstraint, Column, Enum, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import (
+    DDL,
+    TIMESTAMP,
+    BigInteger,
+    CheckConstraint,
+    Column,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    and_,
+    case,
+    cast,
+    event,
+    func,
+    literal,
+    literal_column,
+    select,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import ColumnElement, Subquery
 
 import app.infrastructure.database.base as base
 from app.domain.models.capacity_type import CapacityType
@@ -16,6 +40,14 @@ class Patient(base.Base):
     name = Column(String, nullable=False, index=True)
     zip_code = Column(String, nullable=True, index=True)
     care_type = Column(Enum(CareType), nullable=False)
+    # assigned by the re-matching job, see app.rematch
+    facility_id = Column(
+        base.UUID(),
+        ForeignKey("facilities.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+    matched_at = Column(TIMESTAMP(timezone=True), nullable=True)
     created_at = Column(
         TIMESTAMP(timezone=True),
         server_default=sa.sql.func.now(),
@@ -35,6 +67,9 @@ class Patient(base.Base):
         index=True,
     )
 
+    # keyset pagination order
+    __table_args__ = (Index("ix_patients_created_at_id", "created_at", "id"),)
+
 
 class Facility(base.Base):
     __tablename__ = "facilities"
@@ -65,6 +100,18 @@ class Facility(base.Base):
     care_types = relationship("FacilityCareType", back_populates="facility", cascade="all, delete-orphan")
     zip_code_ranges = relationship("ZipCodeRange", back_populates="facility", cascade="all, delete-orphan")
 
+    # keyset pagination order
+    __table_args__ = (Index("ix_facilities_created_at_id", "created_at", "id"),)
+
+
+class TableVersion(base.Base):
+    """Version per table, bumped after every committed write to it (see table_versions)."""
+
+    __tablename__ = "table_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
 
 class CareTypeModel(base.Base):
     __tablename__ = "care_types"
@@ -130,6 +177,7 @@ class ZipCodeRange(base.Base):
         base.UUID(),
         ForeignKey("facilities.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
     min_zip_code = Column(Integer, nullable=False, index=True)
     max_zip_code = Column(Integer, nullable=False, index=True)
@@ -150,3 +198,55 @@ class ZipCodeRange(base.Base):
     facility = relationship("Facility", back_populates="zip_code_ranges")
 
     __table_args__ = (CheckConstraint("min_zip_code <= max_zip_code", name="valid_range"),)
+
+
+# On PostgreSQL zip_code_ranges also carries a generated int4range of the two bounds with a GiST index,
+# which serves "range contains zip" lookups. The column is not mapped so the schema still builds on other
+# dialects, which query the bounds directly.
+ZIP_RANGE_COLUMN = "zip_range"
+ZIP_RANGE_INDEX = "ix_zip_code_ranges_zip_range"
+
+event.listen(
+    ZipCodeRange.__table__,
+    "after_create",
+    DDL(
+        f"ALTER TABLE zip_code_ranges ADD COLUMN {ZIP_RANGE_COLUMN} int4range NOT NULL "
+        "GENERATED ALWAYS AS (int4range(min_zip_code, max_zip_code, '[]')) STORED"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    ZipCodeRange.__table__,
+    "after_create",
+    DDL(f"CREATE INDEX {ZIP_RANGE_INDEX} ON zip_code_ranges USING gist ({ZIP_RANGE_COLUMN})").execute_if(
+        dialect="postgresql"
+    ),
+)
+
+
+def zip_range_covers(zip_code: int | ColumnElement[int], dialect_name: str):
+    """zip_code is a number or an integer column, e.g. of zip_code_values."""
+    if dialect_name == "postgresql":
+        if isinstance(zip_code, int):
+            zip_code = literal(zip_code, Integer)
+        return literal_column(f"{ZipCodeRange.__tablename__}.{ZIP_RANGE_COLUMN}").op("@>", is_comparison=True)(zip_code)
+    return and_(ZipCodeRange.min_zip_code <= zip_code, ZipCodeRange.max_zip_code >= zip_code)
+
+
+def facility_zip_number(dialect_name: str):
+    """facility_zip_code as an integer, NULL when it is not all digits like the in-memory matchers skip it."""
+    zip_code = Facility.facility_zip_code
+    if dialect_name == "postgresql":
+        # at most 9 digits so that the cast cannot overflow an integer
+        is_number = zip_code.regexp_match("^[0-9]{1,9}$")
+    else:
+        is_number = and_(zip_code != "", zip_code.op("NOT GLOB", is_comparison=True)("*[^0-9]*"))
+    # a CASE, unlike AND, guarantees the cast only sees numeric zip codes
+    return case((is_number, cast(zip_code, Integer)), else_=None)
+
+
+def zip_code_values(zip_codes: Sequence[int], dialect_name: str) -> Subquery:
+    """A one column (zip_code) table of the zip codes, sent as a single parameter whatever their number."""
+    if dialect_name == "postgresql":
+        return select(func.unnest(literal(list(zip_codes), ARRAY(Integer))).label("zip_code")).subquery()
+    values = func.json_each(json.dumps(list(zip_codes))).table_valued("value")
+    return select(cast(values.c.value, Integer).label("zip_code")).select_from(values).subquery()
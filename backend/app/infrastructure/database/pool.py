@@ -0,0 +1,100 @@
+import time
+from collections import deque
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool
+
+from app.core.config import settings
+
+# checkout waits kept for the percentiles
+RECENT_WAITS = 1024
+
+
+class PoolMetrics:
+    """Checkout wait times and connections in use for one engine's pool."""
+
+    def __init__(self, capacity: int | None):
+        # None for NullPool, which opens as many connections as are asked for
+        self.capacity = capacity
+        self.checkouts = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._recent_waits: deque[float] = deque(maxlen=RECENT_WAITS)
+
+    def record_checkout(self, wait: float) -> None:
+        self.checkouts += 1
+        self.in_use += 1
+        self.max_in_use = max(self.max_in_use, self.in_use)
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self._recent_waits.append(wait)
+
+    def record_checkin(self) -> None:
+        self.in_use = max(0, self.in_use - 1)
+
+    def snapshot(self) -> dict:
+        waits = sorted(self._recent_waits)
+        return {
+            "capacity": self.capacity,
+            "in_use": self.in_use,
+            "max_in_use": self.max_in_use,
+            "utilisation": self.in_use / self.capacity if self.capacity else None,
+            "checkouts": self.checkouts,
+            "checkout_wait_avg_ms": self.total_wait / self.checkouts * 1000 if self.checkouts else 0.0,
+            "checkout_wait_p95_ms": waits[int(len(waits) * 0.95)] * 1000 if waits else 0.0,
+            "checkout_wait_max_ms": self.max_wait * 1000,
+        }
+
+
+class _TimedCheckout:
+    metrics: PoolMetrics
+
+    def connect(self):
+        # includes waiting for a free slot, opening a new connection and the pre-ping
+        started = time.perf_counter()
+        connection = super().connect()
+        self.metrics.record_checkout(time.perf_counter() - started)
+        return connection
+
+
+def _timed_pool_class(pool_class: type[Pool], metrics: PoolMetrics) -> type[Pool]:
+    # a class per engine, the pool is rebuilt from its class on dispose() and keeps its metrics
+    return type(f"Timed{pool_class.__name__}", (_TimedCheckout, pool_class), {"metrics": metrics})
+
+
+def create_pooled_engine(url: str) -> AsyncEngine:
+    """Engine configured from the DB_* pool settings, with PoolMetrics available through pool_metrics()."""
+    options = {"echo": settings.DB_ECHO_LOG, "future": True}
+
+    if settings.DB_NULL_POOL:
+        options["poolclass"] = _timed_pool_class(NullPool, PoolMetrics(capacity=None))
+    else:
+        options.update(
+            poolclass=_timed_pool_class(
+                AsyncAdaptedQueuePool, PoolMetrics(capacity=settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+            ),
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+
+    if make_url(url).get_driver_name() == "asyncpg":
+        connect_args = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+        options["connect_args"] = connect_args
+
+    engine = create_async_engine(url, **options)
+    metrics = pool_metrics(engine)
+    event.listen(engine.sync_engine, "checkin", lambda dbapi_connection, connection_record: metrics.record_checkin())
+    return engine
+
+
+def pool_metrics(engine: AsyncEngine) -> PoolMetrics:
+    return engine.sync_engine.pool.metrics
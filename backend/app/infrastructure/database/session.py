@@ -1,24 +1,113 @@
-from typing import AsyncGenerator
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Awaitable, Callable
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.infrastructure.database.pool import create_pooled_engine
+
+# set on responses to requests that wrote while a read replica is configured, reads carrying it go to the primary
+READ_PRIMARY_COOKIE = "read_primary"
+# session.info key of the callbacks to run once the request's transaction has committed
+AFTER_COMMIT = "after_commit"
+
+logger = logging.getLogger(__name__)
+
+engine = create_pooled_engine(settings.DATABASE_URL)
+read_engine = create_pooled_engine(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else None
+
+
+def read_only_session_factory(engine: AsyncEngine) -> sessionmaker:
+    # autocommit: no BEGIN and COMMIT round trips, and the connection goes back to the pool after each statement
+    return sessionmaker(
+        engine.execution_options(isolation_level="AUTOCOMMIT"), class_=AsyncSession, expire_on_commit=False
+    )
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DB_ECHO_LOG,
-    future=True,
-)
 
 async_session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+primary_read_session_factory = read_only_session_factory(engine)
+read_session_factory = read_only_session_factory(read_engine) if read_engine else primary_read_session_factory
+# transactional, server-side cursors (session.stream) need a transaction and the read factories never open one
+stream_session_factory = (
+    sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False) if read_engine else async_session_factory
+)
 
 
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
+async def get_db_session(response: Response) -> AsyncGenerator[AsyncSession, None]:
     async with async_session_factory() as session:
-        try:
+        if read_session_factory is not primary_read_session_factory:
+            _pin_reads_to_primary_on_write(session, response)
+        async with transaction(session):
             yield session
-            await session.commit()
+
+
+@asynccontextmanager
+async def transaction(session: AsyncSession) -> AsyncIterator[None]:
+    """Commit when the block succeeds and run the `after_commit` callbacks, roll back and drop them when it raises."""
+    try:
+        yield
+        await session.commit()
+    except Exception:
+        session.info.pop(AFTER_COMMIT, None)
+        await session.rollback()
+        raise
+
+    for callback in session.info.pop(AFTER_COMMIT, []):
+        try:
+            await callback()
         except Exception:
-            await session.rollback()
-            raise
+            # the write is committed, a failed follow-up must not turn it into an error response
+            logger.exception("after commit callback %r failed", callback)
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """Run `callback` once the session's transaction has committed, e.g. to update process caches and notify
+    other workers of a write. Nothing runs if it rolls back."""
+    session.info.setdefault(AFTER_COMMIT, []).append(callback)
+
+
+async def get_read_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Autocommit session for handlers that only read, nothing to commit or roll back.
+
+    On the read replica, or on the primary without one or for clients that just wrote.
+    """
+    session_factory = primary_read_session_factory if READ_PRIMARY_COOKIE in request.cookies else read_session_factory
+
+    async with session_factory() as session:
+        yield session
+
+
+def get_stream_session_factory(request: Request) -> sessionmaker:
+    """Session factory for streaming response bodies, which run after the dependencies have exited and so
+    open their session themselves. Routed like get_read_db_session."""
+    return async_session_factory if READ_PRIMARY_COOKIE in request.cookies else stream_session_factory
+
+
+def _pin_reads_to_primary_on_write(session: AsyncSession, response: Response) -> None:
+    # the cookie has to be set while the handler runs, the response headers are final before the commit
+    pinned = False
+
+    def pin(*_) -> None:
+        nonlocal pinned
+        if not pinned:
+            # the frontend calls the API cross-site with credentials, only SameSite=None cookies come back with it
+            response.set_cookie(
+                READ_PRIMARY_COOKIE,
+                "1",
+                max_age=settings.READ_YOUR_WRITES_SECONDS,
+                httponly=True,
+                secure=True,
+                samesite="none",
+            )
+            pinned = True
+
+    def on_execute(orm_execute_state) -> None:
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            pin()
+
+    event.listen(session.sync_session, "do_orm_execute", on_execute)
+    event.listen(session.sync_session, "after_flush", pin)
@@ -1,10 +1,11 @@
 from datetime import datetime, timezone
-from typing import Generic, Type, TypeVar
+from typing import AsyncIterator, Generic, Sequence, Type, TypeVar
 
-from sqlalchemy import select, update
+from sqlalchemy import Select, literal, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.repositories.base import BaseRepository
+from app.infrastructure.repositories.pagination import decode_cursor, encode_cursor
 
 ModelType = TypeVar("ModelType")
 DomainModelType = TypeVar("DomainModelType")
@@ -19,20 +20,79 @@ class SQLAlchemyRepository(BaseRepository[DomainModelType], Generic[ModelType, D
         db_obj = self.model_class(**obj_in.model_dump(exclude={"id"} if obj_in.id is None else {}))
         self.session.add(db_obj)
         await self.session.flush()
-        return await self._to_domain(db_obj)
+        return self._to_domain(db_obj)
 
     async def get_by_id(self, id: str) -> DomainModelType | None:
-        stmt = select(self.model_class).where(self.model_class.id == id, self.model_class.deleted_at.is_(None))
-        result = await self.session.execute(stmt)
-        db_obj = result.scalars().first()
-        if db_obj is None:
+        result = await self.session.execute(self._select_rows().where(self.model_class.id == id))
+        row = result.first()
+        if row is None:
             return None
-        return await self._to_domain(db_obj)
+        return self._from_row(row)
 
     async def get_all(self, skip: int = 0, limit: int = 100) -> list[DomainModelType]:
-        stmt = select(self.model_class).where(self.model_class.deleted_at.is_(None)).offset(skip).limit(limit)
+        # the keyset order, so that offsets page through the same sequence of rows
+        stmt = self._select_rows().order_by(self.model_class.created_at, self.model_class.id).offset(skip).limit(limit)
         result = await self.session.execute(stmt)
-        return [await self._to_domain(obj) for obj in result.scalars().all()]
+        return self._rows_to_domain(result.all())
+
+    async def get_page(self, limit: int = 100, cursor: str | None = None) -> tuple[list[DomainModelType], str | None]:
+        result = await self.session.execute(self._keyset_page(self._select_rows(), limit, cursor))
+        items = self._rows_to_domain(result.all())
+        await self._check_cursor_anchor(items, cursor)
+        return self._split_page(items, limit)
+
+    async def stream_all(self, batch_size: int = 1000) -> AsyncIterator[DomainModelType]:
+        stmt = (
+            self._select_rows()
+            .order_by(self.model_class.created_at, self.model_class.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(stmt)
+        async for rows in result.partitions():
+            for domain_obj in self._rows_to_domain(rows):
+                yield domain_obj
+
+    def _select_rows(self) -> Select:
+        # plain column rows: no ORM instance, identity map entry or change tracking per row.
+        # the rows have the model's attribute names, so they map like model instances
+        return select(*self.model_class.__table__.columns).where(self.model_class.deleted_at.is_(None))
+
+    def _rows_to_domain(self, rows: Sequence) -> list[DomainModelType]:
+        from_row = self._from_row
+        return [from_row(row) for row in rows]
+
+    def _keyset_page(self, stmt, limit: int, cursor: str | None):
+        # ordered by (created_at, id); the cursor names the last row of the previous page and the
+        # comparison runs against that row's created_at, so no timestamp goes through the client.
+        # one extra row is fetched to tell whether another page follows, see _split_page
+        stmt = stmt.order_by(self.model_class.created_at, self.model_class.id).limit(limit + 1)
+        if cursor is not None:
+            anchor_id = decode_cursor(cursor)
+            anchor_created_at = (
+                select(self.model_class.created_at).where(self.model_class.id == anchor_id).scalar_subquery()
+            )
+            stmt = stmt.where(
+                tuple_(self.model_class.created_at, self.model_class.id)
+                > tuple_(anchor_created_at, literal(anchor_id, self.model_class.id.type))
+            )
+        return stmt
+
+    async def _check_cursor_anchor(self, items: list[DomainModelType], cursor: str | None) -> None:
+        # a cursor whose row was hard-deleted compares against NULL and matches nothing, tell that apart
+        # from the end of the listing. only empty pages need the lookup
+        if cursor is None or items:
+            return
+        anchor = await self.session.scalar(
+            select(self.model_class.id).where(self.model_class.id == decode_cursor(cursor))
+        )
+        if anchor is None:
+            raise ValueError(f"{cursor} points at a row that no longer exists")
+
+    @staticmethod
+    def _split_page(items: list[DomainModelType], limit: int) -> tuple[list[DomainModelType], str | None]:
+        if len(items) > limit:
+            return items[:limit], encode_cursor(items[limit - 1].id)
+        return items, None
 
     async def update(self, id: str, obj_in: DomainModelType) -> DomainModelType | None:
         stmt = select(self.model_class).where(self.model_class.id == id, self.model_class.deleted_at.is_(None))
@@ -49,7 +109,7 @@ class SQLAlchemyRepository(BaseRepository[DomainModelType], Generic[ModelType, D
 
         self.session.add(db_obj)
         await self.session.flush()
-        return await self._to_domain(db_obj)
+        return self._to_domain(db_obj)
 
     async def delete(self, id: str) -> bool:
         stmt = select(self.model_class).where(self.model_class.id == id, self.model_class.deleted_at.is_(None))
@@ -73,6 +133,14 @@ class SQLAlchemyRepository(BaseRepository[DomainModelType], Generic[ModelType, D
         await self.session.flush()
         return result.rowcount > 0
 
-    async def _to_domain(self, db_obj: ModelType) -> DomainModelType:
+    def _to_domain(self, db_obj: ModelType) -> DomainModelType:
         """Convert a database model to a domain model"""
         raise NotImplementedError("Subclasses must implement this method")
+
+    def _from_row(self, row) -> DomainModelType:
+        """Convert a row read from the database to a domain model.
+
+        Runs once per row on every read. Subclasses can skip validation here, the schema already constrains what the
+        database returns, unlike the model instances of create and update that still hold the values written to them.
+        """
+        return self._to_domain(row)
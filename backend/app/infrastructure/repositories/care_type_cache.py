@@ -0,0 +1,75 @@
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import event, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.models.care_type import CareType
+from app.infrastructure.database.models import CareTypeModel
+
+
+class CareTypeIdCache:
+    """Process-wide map of CareType to care_types.id.
+
+    Care type rows are created once and never change, so after `warm` facility writes resolve
+    their care types without a query. Misses fill the cache through an idempotent upsert, which
+    is safe when several workers create the same care type concurrently. The upsert runs in the
+    caller's transaction, so its ids only reach the cache once that transaction commits; until
+    then they are kept on the session.
+    """
+
+    def __init__(self):
+        self._ids: dict[CareType, UUID] = {}
+
+    async def warm(self, session: AsyncSession) -> None:
+        await self._upsert(session, list(CareType))
+
+    async def get_ids(self, session: AsyncSession, care_types: Iterable[CareType]) -> list[UUID]:
+        care_types = [CareType(care_type) for care_type in care_types]
+        pending = self._pending(session)
+        missing = [care_type for care_type in care_types if care_type not in self._ids and care_type not in pending]
+        if missing:
+            await self._upsert(session, missing)
+        return [self._ids.get(care_type) or pending[care_type] for care_type in care_types]
+
+    def clear(self) -> None:
+        self._ids.clear()
+
+    def _pending(self, session: AsyncSession) -> dict[CareType, UUID]:
+        """Ids upserted in the session's transaction, dropped unless it commits."""
+        if self not in session.info:
+            session.info[self] = {}
+
+            def committed(_) -> None:
+                self._ids.update(session.info.get(self, {}))
+
+            def transaction_ended(_, transaction) -> None:
+                if transaction.parent is None:
+                    session.info[self] = {}
+
+            event.listen(session.sync_session, "after_commit", committed)
+            event.listen(session.sync_session, "after_transaction_end", transaction_ended)
+        return session.info[self]
+
+    async def _upsert(self, session: AsyncSession, care_types: list[CareType]) -> None:
+        dialect_name = session.bind.dialect.name
+        rows = [{"name": care_type} for care_type in dict.fromkeys(care_types)]
+
+        if dialect_name == "postgresql":
+            stmt = postgresql.insert(CareTypeModel).values(rows).on_conflict_do_nothing(index_elements=["name"])
+            await session.execute(stmt)
+        elif dialect_name == "sqlite":
+            stmt = sqlite.insert(CareTypeModel).values(rows).on_conflict_do_nothing(index_elements=["name"])
+            await session.execute(stmt)
+        else:
+            existing = set((await session.execute(select(CareTypeModel.name))).scalars().all())
+            rows = [row for row in rows if row["name"] not in existing]
+            if rows:
+                await session.execute(insert(CareTypeModel), rows)
+
+        result = await session.execute(select(CareTypeModel.name, CareTypeModel.id))
+        self._pending(session).update({name: id for name, id in result.all()})
+
+
+care_type_id_cache = CareTypeIdCache()
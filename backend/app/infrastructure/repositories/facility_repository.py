@@ -1,59 +1,208 @@
-from sqlalchemy import select
+from collections import defaultdict
+from datetime import datetime
+from functools import partial
+from typing import AsyncIterator, Collection, Sequence
+from uuid import UUID, uuid4
+
+from pydantic import TypeAdapter
+from sqlalchemy import Row, Select, case, delete, exists, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
+from app.domain.models.capacity_type import CapacityType
 from app.domain.models.care_type import CareType
 from app.domain.models.facility import Facility
 from app.domain.models.zip_code_range import ZipCodeRange
 from app.domain.repositories.facility_repository import FacilityRepository as FacilityRepositoryBase
+from app.infrastructure.cache.backend import CacheBackend
 from app.infrastructure.database.models import CareTypeModel
 from app.infrastructure.database.models import Facility as FacilityModel
 from app.infrastructure.database.models import FacilityCareType
 from app.infrastructure.database.models import ZipCodeRange as ZipCodeRangeModel
+from app.infrastructure.database.models import facility_zip_number, zip_code_values, zip_range_covers
+from app.infrastructure.database.session import after_commit
+from app.infrastructure.repositories import table_versions
 from app.infrastructure.repositories.base import SQLAlchemyRepository
+from app.infrastructure.repositories.care_type_cache import CareTypeIdCache, care_type_id_cache
+
+# facility ids per IN (...) when loading care types and zip code ranges, well below driver bind limits
+ASSOCIATION_BATCH_SIZE = 500
+
+FACILITY_LIST = TypeAdapter(list[Facility])
+
+# care types are listed in declaration order, the order of the PostgreSQL enum, on every database
+CARE_TYPE_ORDER = {care_type: position for position, care_type in enumerate(CareType)}
 
 
 class FacilityRepository(SQLAlchemyRepository[FacilityModel, Facility], FacilityRepositoryBase):
-    def __init__(self, session: AsyncSession):
+    """Reads select plain facility columns and load care types and zip code ranges in separate batched
+    queries, so there is no care types x zip ranges row fan-out and no ORM identity map hydration.
+
+    With a cache, the facilities of each care type are kept there for cache_ttl_seconds and dropped once a
+    write made through a repository commits, see app.infrastructure.database.session.after_commit.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        care_type_ids: CareTypeIdCache = care_type_id_cache,
+        cache: CacheBackend | None = None,
+        cache_ttl_seconds: float = 60.0,
+    ):
         super().__init__(session, FacilityModel)
+        self.care_type_ids = care_type_ids
+        self.cache = cache
+        self.cache_ttl_seconds = cache_ttl_seconds
 
     async def get_by_capacity(self, capacity: str) -> list[Facility]:
-        stmt = (
-            select(self.model_class)
-            .where(self.model_class.capacity_status == capacity, self.model_class.deleted_at.is_(None))
-            .options(
-                joinedload(self.model_class.care_types).joinedload(FacilityCareType.care_type),
-                joinedload(self.model_class.zip_code_ranges),
-            )
-        )
-        result = await self.session.execute(stmt)
-        return [await self._to_domain(obj) for obj in result.unique().scalars().all()]
+        stmt = self._select_facilities().where(self.model_class.capacity_status == capacity)
+        return await self._fetch(stmt)
 
     async def get_by_zip_code(self, zip_code: str) -> list[Facility]:
+        stmt = self._select_facilities().where(self.model_class.facility_zip_code == zip_code)
+        return await self._fetch(stmt)
+
+    async def get_by_care_type(self, care_type: CareType) -> list[Facility]:
+        if self.cache is not None:
+            cached = await self.cache.get(self._care_type_cache_key(care_type))
+            if cached is not None:
+                return FACILITY_LIST.validate_json(cached)
+
         stmt = (
-            select(self.model_class)
-            .where(self.model_class.facility_zip_code == zip_code, self.model_class.deleted_at.is_(None))
-            .options(
-                joinedload(self.model_class.care_types).joinedload(FacilityCareType.care_type),
-                joinedload(self.model_class.zip_code_ranges),
-            )
+            self._select_facilities()
+            .join(FacilityCareType, FacilityCareType.facility_id == self.model_class.id)
+            .join(CareTypeModel, CareTypeModel.id == FacilityCareType.care_type_id)
+            .where(CareTypeModel.name == care_type)
         )
-        result = await self.session.execute(stmt)
-        return [await self._to_domain(obj) for obj in result.unique().scalars().all()]
+        facilities = await self._fetch(stmt)
 
-    async def get_by_care_type(self, care_type: CareType) -> list[Facility]:
+        if self.cache is not None:
+            await self.cache.set(
+                self._care_type_cache_key(care_type),
+                FACILITY_LIST.dump_json(facilities).decode(),
+                self.cache_ttl_seconds,
+            )
+        return facilities
+
+    async def find_match_candidates(
+        self,
+        care_type: CareType,
+        zip_code: int,
+        max_distance: int,
+        limit: int = 1,
+        exclude_ids: Collection[str] = (),
+    ) -> list[Facility]:
+        dialect_name = self.session.bind.dialect.name
+        # NULL for facilities with a non-numeric zip code, which fails the distance cutoff
+        distance = func.abs(facility_zip_number(dialect_name) - zip_code)
+        covers_zip_code = exists().where(
+            ZipCodeRangeModel.facility_id == self.model_class.id,
+            zip_range_covers(zip_code, dialect_name),
+        )
         stmt = (
-            select(self.model_class)
+            self._select_facilities()
             .join(FacilityCareType, FacilityCareType.facility_id == self.model_class.id)
             .join(CareTypeModel, CareTypeModel.id == FacilityCareType.care_type_id)
-            .where(CareTypeModel.name == care_type, self.model_class.deleted_at.is_(None))
-            .options(
-                joinedload(self.model_class.care_types).joinedload(FacilityCareType.care_type),
-                joinedload(self.model_class.zip_code_ranges),
+            .where(
+                CareTypeModel.name == care_type,
+                self.model_class.capacity_status == CapacityType.AVAILABLE,
+                covers_zip_code,
+                distance <= max_distance,
+            )
+            .order_by(distance, self.model_class.id)
+            .limit(limit)
+        )
+        if exclude_ids:
+            stmt = stmt.where(self.model_class.id.not_in(exclude_ids))
+        return await self._fetch(stmt)
+
+    async def find_matches(
+        self, care_type: CareType, zip_codes: Collection[int], max_distance: int
+    ) -> dict[int, Facility]:
+        dialect_name = self.session.bind.dialect.name
+        # the eligible facilities are read and their zip codes parsed once, then paired with every zip code
+        candidates = (
+            select(self.model_class.id, facility_zip_number(dialect_name).label("zip_number"))
+            .join(FacilityCareType, FacilityCareType.facility_id == self.model_class.id)
+            .join(CareTypeModel, CareTypeModel.id == FacilityCareType.care_type_id)
+            .where(
+                self.model_class.deleted_at.is_(None),
+                CareTypeModel.name == care_type,
+                self.model_class.capacity_status == CapacityType.AVAILABLE,
+            )
+            .cte("candidates")
+            .prefix_with("MATERIALIZED")
+        )
+        patient_zips = zip_code_values(list(zip_codes), dialect_name)
+        distance = func.abs(candidates.c.zip_number - patient_zips.c.zip_code)
+        covers_zip_code = exists().where(
+            ZipCodeRangeModel.facility_id == candidates.c.id,
+            zip_range_covers(patient_zips.c.zip_code, dialect_name),
+        )
+        ranked = (
+            select(
+                patient_zips.c.zip_code,
+                candidates.c.id.label("facility_id"),
+                func.row_number()
+                .over(partition_by=patient_zips.c.zip_code, order_by=(distance, candidates.c.id))
+                .label("position"),
             )
+            .select_from(candidates)
+            .join(patient_zips, distance <= max_distance)
+            .where(covers_zip_code)
+            .subquery()
+        )
+        winners = (
+            await self.session.execute(select(ranked.c.zip_code, ranked.c.facility_id).where(ranked.c.position == 1))
+        ).all()
+        if not winners:
+            return {}
+
+        facilities = {facility.id: facility for facility in await self.get_by_ids({id for _, id in winners})}
+        return {zip_code: facilities[str(facility_id)] for zip_code, facility_id in winners}
+
+    async def get_all(self, skip: int = 0, limit: int = 100) -> list[Facility]:
+        stmt = (
+            self._select_facilities()
+            .order_by(self.model_class.created_at, self.model_class.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return await self._fetch(stmt)
+
+    async def get_page(self, limit: int = 100, cursor: str | None = None) -> tuple[list[Facility], str | None]:
+        stmt = self._keyset_page(self._select_facilities(), limit, cursor)
+        facilities = await self._fetch(stmt)
+        await self._check_cursor_anchor(facilities, cursor)
+        return self._split_page(facilities, limit)
+
+    async def stream_all(self, batch_size: int = ASSOCIATION_BATCH_SIZE) -> AsyncIterator[Facility]:
+        stmt = (
+            self._select_facilities()
+            .order_by(self.model_class.created_at, self.model_class.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(stmt)
+        # the associations of each batch are loaded while the cursor waits
+        async for rows in result.partitions():
+            care_types, zip_code_ranges = await self._fetch_associations([row.id for row in rows])
+            for facility in self._rows_to_facilities(rows, care_types, zip_code_ranges):
+                yield facility
+
+    async def get_by_id(self, id: str) -> Facility | None:
+        facilities = await self._fetch(self._select_facilities().where(self.model_class.id == id))
+        return facilities[0] if facilities else None
+
+    async def get_updated_at(self, id: str) -> datetime | None:
+        stmt = select(self.model_class.updated_at).where(
+            self.model_class.id == id, self.model_class.deleted_at.is_(None)
         )
-        result = await self.session.execute(stmt)
-        return [await self._to_domain(obj) for obj in result.unique().scalars().all()]
+        return (await self.session.execute(stmt)).scalar()
+
+    async def get_table_version(self) -> int:
+        return await table_versions.get_table_version(self.session, self.model_class.__tablename__)
+
+    async def get_by_ids(self, ids: Sequence[str]) -> list[Facility]:
+        return await self._fetch(self._select_facilities().where(self.model_class.id.in_(ids)))
 
     async def create(self, obj_in: Facility) -> Facility:
         facility_data = obj_in.model_dump(exclude={"id", "care_types", "zip_code_ranges"})
@@ -63,18 +212,9 @@ class FacilityRepository(SQLAlchemyRepository[FacilityModel, Facility], Facility
 
         # add care types
         if obj_in.care_types:
-            for care_type in obj_in.care_types:
-                care_type_stmt = select(CareTypeModel).where(CareTypeModel.name == care_type)
-                care_type_result = await self.session.execute(care_type_stmt)
-                care_type_db = care_type_result.scalars().first()
-
-                if not care_type_db:
-                    care_type_db = CareTypeModel(name=care_type)
-                    self.session.add(care_type_db)
-                    await self.session.flush()
-
+            for care_type_id in await self.care_type_ids.get_ids(self.session, obj_in.care_types):
                 # create association
-                facility_care_type = FacilityCareType(facility_id=db_obj.id, care_type_id=care_type_db.id)
+                facility_care_type = FacilityCareType(facility_id=db_obj.id, care_type_id=care_type_id)
                 self.session.add(facility_care_type)
 
         # add zip code ranges
@@ -86,77 +226,165 @@ class FacilityRepository(SQLAlchemyRepository[FacilityModel, Facility], Facility
                 self.session.add(zip_range_db)
 
         await self.session.flush()
+        await self._facilities_changed()
         return await self.get_by_id(str(db_obj.id))
 
-    async def update(self, id: str, obj_in: Facility) -> Facility | None:
-        stmt = (
-            select(self.model_class)
-            .where(self.model_class.id == id)
-            .options(
-                joinedload(self.model_class.care_types).joinedload(FacilityCareType.care_type),
-                joinedload(self.model_class.zip_code_ranges),
+    async def bulk_create(self, facilities: Sequence[Facility]) -> int:
+        # ids are generated here so facilities, care type links and zip ranges go out as three
+        # multi-row inserts without reading anything back
+        facility_rows, care_type_rows, zip_code_range_rows = [], [], []
+        for facility in facilities:
+            facility_id = uuid4()
+            facility_rows.append(
+                {
+                    "id": facility_id,
+                    "name": facility.name,
+                    "facility_zip_code": facility.zip_code,
+                    "capacity_status": facility.capacity,
+                }
+            )
+            care_type_rows.extend(
+                {"id": uuid4(), "facility_id": facility_id, "care_type_id": care_type_id}
+                for care_type_id in await self.care_type_ids.get_ids(self.session, dict.fromkeys(facility.care_types))
+            )
+            zip_code_range_rows.extend(
+                {
+                    "id": uuid4(),
+                    "facility_id": facility_id,
+                    "min_zip_code": zip_range.min_zip_code,
+                    "max_zip_code": zip_range.max_zip_code,
+                }
+                for zip_range in facility.zip_code_ranges
             )
-        )
-        result = await self.session.execute(stmt)
-        db_obj = result.scalars().first()
-
-        if db_obj is None:
-            return None
-
-        # update basic facility attributes
-        facility_data = obj_in.model_dump(exclude={"id", "care_types", "zip_code_ranges"})
-        for field, value in facility_data.items():
-            if hasattr(db_obj, field):
-                setattr(db_obj, field, value)
-
-        # update care types if provided
-        if obj_in.care_types is not None:
-            # clear existing care types
-            care_types_stmt = select(FacilityCareType).where(FacilityCareType.facility_id == id)
-            care_types_result = await self.session.execute(care_types_stmt)
-            for care_type_assoc in care_types_result.scalars().all():
-                await self.session.delete(care_type_assoc)
-
-            # add new care types
-            for care_type in obj_in.care_types:
-                care_type_stmt = select(CareTypeModel).where(CareTypeModel.name == care_type)
-                care_type_result = await self.session.execute(care_type_stmt)
-                care_type_db = care_type_result.scalars().first()
-
-                if not care_type_db:
-                    care_type_db = CareTypeModel(name=care_type)
-                    self.session.add(care_type_db)
-                    await self.session.flush()
-
-                facility_care_type = FacilityCareType(facility_id=db_obj.id, care_type_id=care_type_db.id)
-                self.session.add(facility_care_type)
-
-        if obj_in.zip_code_ranges is not None:
-            zip_ranges_stmt = select(ZipCodeRangeModel).where(ZipCodeRangeModel.facility_id == id)
-            zip_ranges_result = await self.session.execute(zip_ranges_stmt)
-            for zip_range in zip_ranges_result.scalars().all():
-                await self.session.delete(zip_range)
 
-            for zip_range in obj_in.zip_code_ranges:
-                zip_range_db = ZipCodeRangeModel(
-                    facility_id=db_obj.id, min_zip_code=zip_range.min_zip_code, max_zip_code=zip_range.max_zip_code
+        for model, rows in (
+            (self.model_class, facility_rows),
+            (FacilityCareType, care_type_rows),
+            (ZipCodeRangeModel, zip_code_range_rows),
+        ):
+            if rows:
+                await self.session.execute(insert(model), rows)
+        await self._facilities_changed()
+        return len(facility_rows)
+
+    async def update(self, id: str, obj_in: Facility, current: Facility | None = None) -> Facility | None:
+        """Write only what differs from `current`, the stored facility as returned by get_by_id.
+
+        Callers that already hold it should pass it in to save a read; nothing is read back afterwards.
+        """
+        if current is None:
+            current = await self.get_by_id(id)
+            if current is None:
+                return None
+
+        values = {}
+        if obj_in.name != current.name:
+            values["name"] = obj_in.name
+        if obj_in.zip_code != current.zip_code:
+            values["facility_zip_code"] = obj_in.zip_code
+        if obj_in.capacity != current.capacity:
+            values["capacity_status"] = obj_in.capacity
+
+        care_types = list(dict.fromkeys(obj_in.care_types))
+        added_care_types = [care_type for care_type in care_types if care_type not in current.care_types]
+        removed_care_types = [care_type for care_type in current.care_types if care_type not in care_types]
+
+        # ranges have no identity of their own, keep a stored row for every (min, max) pair that is still wanted
+        stored_ranges: dict[tuple[int, int], list[ZipCodeRange]] = defaultdict(list)
+        for zip_range in current.zip_code_ranges:
+            stored_ranges[(zip_range.min_zip_code, zip_range.max_zip_code)].append(zip_range)
+        zip_code_ranges, added_ranges = [], []
+        for zip_range in obj_in.zip_code_ranges:
+            bounds = (zip_range.min_zip_code, zip_range.max_zip_code)
+            if stored_ranges[bounds]:
+                zip_code_ranges.append(stored_ranges[bounds].pop(0))
+            else:
+                zip_range = ZipCodeRange(
+                    id=str(uuid4()), facility_id=id, min_zip_code=bounds[0], max_zip_code=bounds[1]
                 )
-                self.session.add(zip_range_db)
-
-        await self.session.flush()
-
-        reload_stmt = (
-            select(self.model_class)
-            .where(self.model_class.id == id)
-            .options(
-                joinedload(self.model_class.care_types).joinedload(FacilityCareType.care_type),
-                joinedload(self.model_class.zip_code_ranges),
+                zip_code_ranges.append(zip_range)
+                added_ranges.append(zip_range)
+        removed_range_ids = [zip_range.id for ranges in stored_ranges.values() for zip_range in ranges]
+
+        associations_changed = added_care_types or removed_care_types or added_ranges or removed_range_ids
+        if values or associations_changed:
+            if not values:
+                values["updated_at"] = func.now()
+            stmt = (
+                update(self.model_class)
+                .where(self.model_class.id == id, self.model_class.deleted_at.is_(None))
+                .values(**values)
+            )
+            if (await self.session.execute(stmt)).rowcount == 0:
+                return None
+            await self._facilities_changed()
+
+        if removed_care_types:
+            await self.session.execute(
+                delete(FacilityCareType).where(
+                    FacilityCareType.facility_id == id,
+                    FacilityCareType.care_type_id.in_(
+                        await self.care_type_ids.get_ids(self.session, removed_care_types)
+                    ),
+                )
+            )
+        if added_care_types:
+            await self.session.execute(
+                insert(FacilityCareType),
+                [
+                    {"id": uuid4(), "facility_id": id, "care_type_id": care_type_id}
+                    for care_type_id in await self.care_type_ids.get_ids(self.session, added_care_types)
+                ],
             )
+        if removed_range_ids:
+            await self.session.execute(delete(ZipCodeRangeModel).where(ZipCodeRangeModel.id.in_(removed_range_ids)))
+        if added_ranges:
+            await self.session.execute(
+                insert(ZipCodeRangeModel),
+                [
+                    {
+                        "id": zip_range.id,
+                        "facility_id": id,
+                        "min_zip_code": zip_range.min_zip_code,
+                        "max_zip_code": zip_range.max_zip_code,
+                    }
+                    for zip_range in added_ranges
+                ],
+            )
+
+        return Facility(
+            id=id,
+            name=obj_in.name,
+            capacity=obj_in.capacity,
+            zip_code=obj_in.zip_code,
+            care_types=sorted(care_types, key=CARE_TYPE_ORDER.__getitem__),
+            zip_code_ranges=sorted(zip_code_ranges, key=lambda zr: (zr.min_zip_code, zr.max_zip_code)),
         )
-        reload_result = await self.session.execute(reload_stmt)
-        updated_db_obj = reload_result.scalars().first()
 
-        return await self._to_domain(updated_db_obj)
+    async def set_capacity(self, ids: Sequence[str], capacity: CapacityType) -> list[str]:
+        stmt = (
+            update(self.model_class)
+            .where(self.model_class.id.in_(ids), self.model_class.deleted_at.is_(None))
+            .values(capacity_status=capacity)
+            .returning(self.model_class.id)
+            .execution_options(synchronize_session=False)
+        )
+        updated = [str(facility_id) for facility_id in (await self.session.execute(stmt)).scalars()]
+        if updated:
+            await self._facilities_changed()
+        return updated
+
+    async def delete(self, id: str) -> bool:
+        deleted = await super().delete(id)
+        if deleted:
+            await self._facilities_changed()
+        return deleted
+
+    async def soft_delete(self, id: str) -> bool:
+        deleted = await super().soft_delete(id)
+        if deleted:
+            await self._facilities_changed()
+        return deleted
 
     async def create_with_zip_ranges(self, obj_in: Facility, zip_ranges_data: list[dict]) -> Facility:
         db_obj = self.model_class(
@@ -167,19 +395,10 @@ class FacilityRepository(SQLAlchemyRepository[FacilityModel, Facility], Facility
         self.session.add(db_obj)
         await self.session.flush()
 
-        for care_type in obj_in.care_types:
-            care_type_stmt = select(CareTypeModel).where(CareTypeModel.name == care_type)
-            care_type_result = await self.session.execute(care_type_stmt)
-            care_type_db = care_type_result.scalars().first()
-
-            if not care_type_db:
-                care_type_db = CareTypeModel(name=care_type)
-                self.session.add(care_type_db)
-                await self.session.flush()
-
+        for care_type_id in await self.care_type_ids.get_ids(self.session, obj_in.care_types):
             facility_care_type = FacilityCareType(
                 facility_id=db_obj.id,
-                care_type_id=care_type_db.id,
+                care_type_id=care_type_id,
             )
             self.session.add(facility_care_type)
 
@@ -192,20 +411,98 @@ class FacilityRepository(SQLAlchemyRepository[FacilityModel, Facility], Facility
             self.session.add(zip_range_db)
 
         await self.session.flush()
+        await self._facilities_changed()
+        return await self.get_by_id(str(db_obj.id))
 
-        stmt = (
-            select(self.model_class)
-            .where(self.model_class.id == db_obj.id)
-            .options(
-                joinedload(self.model_class.care_types).joinedload(FacilityCareType.care_type),
-                joinedload(self.model_class.zip_code_ranges),
+    @staticmethod
+    def _care_type_cache_key(care_type: CareType) -> str:
+        return f"facilities:care_type:{care_type.value}"
+
+    async def _facilities_changed(self) -> None:
+        table_versions.bump_after_commit(self.session, self.model_class.__tablename__)
+        if self.cache is not None:
+            # not before the commit, a read in between would cache the old state again
+            keys = [self._care_type_cache_key(care_type) for care_type in CareType]
+            after_commit(self.session, partial(self.cache.delete, keys))
+
+    def _select_facilities(self) -> Select:
+        return select(
+            self.model_class.id,
+            self.model_class.name,
+            self.model_class.capacity_status,
+            self.model_class.facility_zip_code,
+        ).where(self.model_class.deleted_at.is_(None))
+
+    async def _fetch(self, stmt: Select) -> list[Facility]:
+        rows = (await self.session.execute(stmt)).all()
+        if not rows:
+            return []
+
+        care_types, zip_code_ranges = await self._fetch_associations([row.id for row in rows])
+        return self._rows_to_facilities(rows, care_types, zip_code_ranges)
+
+    async def _fetch_associations(
+        self, facility_ids: Sequence[UUID]
+    ) -> tuple[dict[UUID, list[CareType]], dict[UUID, list[Row]]]:
+        care_types: dict[UUID, list[CareType]] = defaultdict(list)
+        zip_code_ranges: dict[UUID, list[Row]] = defaultdict(list)
+
+        for start in range(0, len(facility_ids), ASSOCIATION_BATCH_SIZE):
+            batch = facility_ids[start : start + ASSOCIATION_BATCH_SIZE]
+
+            care_types_stmt = (
+                select(FacilityCareType.facility_id, CareTypeModel.name)
+                .join(CareTypeModel, CareTypeModel.id == FacilityCareType.care_type_id)
+                .where(FacilityCareType.facility_id.in_(batch))
+                .order_by(case(CARE_TYPE_ORDER, value=CareTypeModel.name))
             )
+            for facility_id, care_type in await self.session.execute(care_types_stmt):
+                care_types[facility_id].append(care_type)
+
+            zip_code_ranges_stmt = (
+                select(
+                    ZipCodeRangeModel.id,
+                    ZipCodeRangeModel.facility_id,
+                    ZipCodeRangeModel.min_zip_code,
+                    ZipCodeRangeModel.max_zip_code,
+                )
+                .where(ZipCodeRangeModel.facility_id.in_(batch))
+                .order_by(ZipCodeRangeModel.min_zip_code, ZipCodeRangeModel.max_zip_code)
+            )
+            for zip_range in await self.session.execute(zip_code_ranges_stmt):
+                zip_code_ranges[zip_range.facility_id].append(zip_range)
+
+        return care_types, zip_code_ranges
+
+    def _rows_to_facilities(
+        self, rows: Sequence[Row], care_types: dict[UUID, list[CareType]], zip_code_ranges: dict[UUID, list[Row]]
+    ) -> list[Facility]:
+        row_to_domain = self._row_to_domain
+        return [row_to_domain(row, care_types.get(row.id, []), zip_code_ranges.get(row.id, [])) for row in rows]
+
+    @staticmethod
+    def _row_to_domain(row: Row, care_types: list[CareType], zip_code_ranges: list[Row]) -> Facility:
+        # rows read back from the database satisfy the schema's constraints already, they are not validated again
+        facility_id = str(row.id)
+        construct_range = ZipCodeRange.model_construct
+        return Facility.model_construct(
+            id=facility_id,
+            name=row.name,
+            capacity=row.capacity_status,
+            zip_code=row.facility_zip_code,
+            care_types=care_types,
+            zip_code_ranges=[
+                construct_range(
+                    id=str(zip_range.id),
+                    facility_id=facility_id,
+                    min_zip_code=zip_range.min_zip_code,
+                    max_zip_code=zip_range.max_zip_code,
+                )
+                for zip_range in zip_code_ranges
+            ],
         )
-        result = await self.session.execute(stmt)
-        loaded_obj = result.scalars().first()
-        return await self._to_domain(loaded_obj)
 
-    async def _to_domain(self, db_obj: FacilityModel) -> Facility:
+    def _to_domain(self, db_obj: FacilityModel) -> Facility:
         care_types = []
         zip_code_ranges = []
 
@@ -233,33 +530,3 @@ class FacilityRepository(SQLAlchemyRepository[FacilityModel, Facility], Facility
             care_types=care_types,
             zip_code_ranges=zip_code_ranges,
         )
-
-    async def get_all(self, skip: int = 0, limit: int = 100) -> list[Facility]:
-        stmt = (
-            select(self.model_class)
-            .where(self.model_class.deleted_at.is_(None))
-            .options(
-                joinedload(self.model_class.care_types).joinedload(FacilityCareType.care_type),
-                joinedload(self.model_class.zip_code_ranges),
-            )
-            .offset(skip)
-            .limit(limit)
-        )
-        result = await self.session.execute(stmt)
-        return [await self._to_domain(obj) for obj in result.unique().scalars().all()]
-
-    async def get_by_id(self, id: str) -> Facility | None:
-        # override - eager load care types and zip code ranges
-        stmt = (
-            select(self.model_class)
-            .where(self.model_class.id == id, self.model_class.deleted_at.is_(None))
-            .options(
-                joinedload(self.model_class.care_types).joinedload(FacilityCareType.care_type),
-                joinedload(self.model_class.zip_code_ranges),
-            )
-        )
-        result = await self.session.execute(stmt)
-        db_obj = result.scalars().first()
-        if db_obj is None:
-            return None
-        return await self._to_domain(db_obj)
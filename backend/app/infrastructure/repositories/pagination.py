@@ -0,0 +1,17 @@
+import base64
+import binascii
+import json
+from uuid import UUID
+
+
+def encode_cursor(id: str) -> str:
+    payload = json.dumps({"id": id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return str(UUID(payload["id"]))
+    except (binascii.Error, ValueError, TypeError, KeyError, AttributeError):
+        raise ValueError(f"{cursor} is not a valid cursor")
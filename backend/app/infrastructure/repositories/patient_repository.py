@@ -1,4 +1,7 @@
-from sqlalchemy import select
+from datetime import datetime, timezone
+from typing import Sequence
+
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.models.patient import Patient
@@ -12,24 +15,35 @@ class PatientRepository(SQLAlchemyRepository[PatientModel, Patient], PatientRepo
         super().__init__(session, PatientModel)
 
     async def get_by_care_type(self, care_type: str) -> list[Patient]:
-        stmt = select(self.model_class).where(
-            self.model_class.care_type == care_type, self.model_class.deleted_at.is_(None)
-        )
-        result = await self.session.execute(stmt)
-        return [await self._to_domain(obj) for obj in result.scalars().all()]
+        result = await self.session.execute(self._select_rows().where(self.model_class.care_type == care_type))
+        return self._rows_to_domain(result.all())
 
     async def get_by_zip_code(self, zip_code: str) -> list[Patient]:
-        stmt = select(self.model_class).where(
-            self.model_class.zip_code == zip_code, self.model_class.deleted_at.is_(None)
-        )
-        result = await self.session.execute(stmt)
-        return [await self._to_domain(obj) for obj in result.scalars().all()]
-
-    async def _to_domain(self, db_obj: PatientModel) -> Patient:
-        return Patient(
-            id=str(db_obj.id),
-            name=db_obj.name,
-            care_type=db_obj.care_type,
-            zip_code=db_obj.zip_code,
-            address=db_obj.address if hasattr(db_obj, "address") else "",
+        result = await self.session.execute(self._select_rows().where(self.model_class.zip_code == zip_code))
+        return self._rows_to_domain(result.all())
+
+    async def get_chunk(self, limit: int, after_id: str | None = None) -> list[Patient]:
+        stmt = self._select_rows().order_by(self.model_class.id)
+        if after_id is not None:
+            stmt = stmt.where(self.model_class.id > after_id)
+        result = await self.session.execute(stmt.limit(limit))
+        return self._rows_to_domain(result.all())
+
+    async def assign_facilities(self, assignments: Sequence[tuple[str, str | None]]) -> None:
+        if not assignments:
+            return
+        matched_at = datetime.now(timezone.utc)
+        # bulk UPDATE by primary key, one executemany
+        await self.session.execute(
+            update(self.model_class),
+            [
+                {"id": patient_id, "facility_id": facility_id, "matched_at": matched_at}
+                for patient_id, facility_id in assignments
+            ],
         )
+
+    def _to_domain(self, db_obj: PatientModel) -> Patient:
+        return Patient(id=str(db_obj.id), name=db_obj.name, care_type=db_obj.care_type, zip_code=db_obj.zip_code)
+
+    def _from_row(self, row) -> Patient:
+        return Patient.model_construct(id=str(row.id), name=row.name, care_type=row.care_type, zip_code=row.zip_code)
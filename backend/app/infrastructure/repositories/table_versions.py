@@ -0,0 +1,41 @@
+from functools import partial
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database.models import TableVersion
+from app.infrastructure.database.session import after_commit
+
+
+def bump_after_commit(session: AsyncSession, table: str) -> None:
+    """Call in every transaction that writes to the table.
+
+    The version is bumped once the transaction has committed, in a short transaction of its own: bumped inside
+    the write transactions, the version row would stay locked until each of them ends and serialize all writes
+    to the table. A reader can briefly get the new rows with the old version, never a new version before them.
+    """
+    after_commit(session, partial(bump_table_version, session, table))
+
+
+async def bump_table_version(session: AsyncSession, table: str) -> None:
+    """Bump and commit, see bump_after_commit."""
+    dialect_name = session.bind.dialect.name
+    if dialect_name in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+        stmt = (
+            insert(TableVersion)
+            .values(name=table, version=1)
+            .on_conflict_do_update(index_elements=["name"], set_={"version": TableVersion.version + 1})
+        )
+        await session.execute(stmt)
+    else:
+        stmt = update(TableVersion).where(TableVersion.name == table).values(version=TableVersion.version + 1)
+        if (await session.execute(stmt)).rowcount == 0:
+            session.add(TableVersion(name=table, version=1))
+    await session.commit()
+
+
+async def get_table_version(session: AsyncSession, table: str) -> int:
+    version = (await session.execute(select(TableVersion.version).where(TableVersion.name == table))).scalar()
+    return version or 0
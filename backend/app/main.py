@@ -1,4 +1,5 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 import uvicorn
 from fastapi import FastAPI
@@ -6,15 +7,42 @@ from fastapi.middleware.cors import CORSMiddleware
 from mangum import Mangum
 
 from app.api.v1.api import api_router
+from app.api.v1.pagination import NEXT_CURSOR_HEADER
 from app.core.config import settings
+from app.infrastructure.cache.cache_backend import cache_backend
+from app.infrastructure.database.session import async_session_factory
+from app.infrastructure.repositories.care_type_cache import care_type_id_cache
+from app.use_cases.facility_changes import facility_changes
 
 PORT = 8000
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    async with async_session_factory() as session:
+        await care_type_id_cache.warm(session)
+        await session.commit()
+
+    # the zip index is per process, follow the facility writes of the other workers
+    listener = (
+        asyncio.create_task(facility_changes.listen())
+        if settings.MATCH_ZIP_INDEX_ENABLED or settings.MATCH_TABLE_ENABLED
+        else None
+    )
+    yield
+    if listener is not None:
+        listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await listener
+    await cache_backend.close()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="Coding challenge",
     version="1.0.0",
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -23,16 +51,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
-
-@asynccontextmanager
-async def lifespan(_: FastAPI):
-    yield
-
-
-app.lifespan = lifespan
-
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 handler = Mangum(app)
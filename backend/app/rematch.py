@@ -0,0 +1,181 @@
+"""Re-match every patient against a snapshot of the facilities, on all cores, and store the assignments.
+
+python -m app.rematch --chunk-size 5000 --workers 8 --checkpoint rematch-checkpoint.json
+
+Patients are read in id order, chunk by chunk. Each chunk is sharded by care type and zip code across a
+process pool whose workers match against the facility snapshot they loaded once. The assignments are written
+back in bulk and the checkpoint then moves past the chunk, so an interrupted run resumes where it stopped.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.models.care_type import CareType
+from app.domain.models.facility import Facility
+from app.domain.models.patient import Patient
+from app.infrastructure.database.session import async_session_factory
+from app.infrastructure.repositories.facility_repository import FacilityRepository
+from app.infrastructure.repositories.patient_repository import PatientRepository
+from app.use_cases.vectorized_matching import FacilityArrays
+
+DEFAULT_CHUNK_SIZE = 5000
+FACILITY_PAGE_SIZE = 1000
+
+# the facility snapshot of a worker process, see _load_snapshot
+_snapshot: FacilityArrays | None = None
+
+
+def _load_snapshot(facilities: list[Facility]) -> None:
+    global _snapshot
+    _snapshot = FacilityArrays(facilities)
+
+
+def match_shard(care_type: CareType, zip_codes: list[str | None]) -> list[str | None]:
+    """Matched facility id per zip code, run in the workers."""
+    return [facility.id if facility else None for facility in _snapshot.match(care_type, zip_codes)]
+
+
+@dataclass
+class Checkpoint:
+    after_id: str | None = None
+    processed: int = 0
+    matched: int = 0
+
+    @classmethod
+    def load(cls, path: Path | None) -> "Checkpoint":
+        if path is None or not path.exists():
+            return cls()
+        return cls(**json.loads(path.read_text()))
+
+    def save(self, path: Path | None) -> None:
+        if path is None:
+            return
+        # write then rename, an interruption never leaves a torn checkpoint
+        temporary = path.with_suffix(path.suffix + ".tmp")
+        temporary.write_text(json.dumps(asdict(self)))
+        os.replace(temporary, path)
+
+
+def shard(patients: list[Patient], shards_per_care_type: int) -> list[tuple[CareType, list[Patient]]]:
+    """Split patients by care type, and each care type into runs of neighbouring zip codes."""
+    by_care_type: dict[CareType, list[Patient]] = {}
+    for patient in patients:
+        by_care_type.setdefault(patient.care_type, []).append(patient)
+
+    shards = []
+    for care_type, members in by_care_type.items():
+        members.sort(key=lambda patient: patient.zip_code or "")
+        size = -(-len(members) // shards_per_care_type)
+        shards.extend((care_type, members[start : start + size]) for start in range(0, len(members), size))
+    return shards
+
+
+async def load_facilities(session_factory: sessionmaker) -> list[Facility]:
+    facilities: list[Facility] = []
+    cursor = None
+    async with session_factory() as session:
+        repository = FacilityRepository(session)
+        while True:
+            page, cursor = await repository.get_page(limit=FACILITY_PAGE_SIZE, cursor=cursor)
+            facilities.extend(page)
+            if cursor is None:
+                return facilities
+
+
+async def rematch(
+    session_factory: sessionmaker = async_session_factory,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int | None = None,
+    checkpoint_path: Path | None = None,
+    report: Callable[[str], None] = print,
+) -> Checkpoint:
+    workers = workers or os.cpu_count() or 1
+    checkpoint = Checkpoint.load(checkpoint_path)
+    if checkpoint.after_id is not None:
+        report(f"resuming after patient {checkpoint.after_id}, {checkpoint.processed} already processed")
+
+    facilities = await load_facilities(session_factory)
+    report(f"{len(facilities)} facilities in the snapshot, matching on {workers} processes")
+
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    processed_this_run = 0
+    # spawn, this process runs an event loop and driver threads whose locks a fork would copy
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_load_snapshot,
+        initargs=(facilities,),
+    ) as pool:
+        while True:
+            async with session_factory() as session:
+                repository = PatientRepository(session)
+                patients = await repository.get_chunk(chunk_size, after_id=checkpoint.after_id)
+                if not patients:
+                    break
+
+                shards = shard(patients, workers)
+                results = await asyncio.gather(
+                    *(
+                        loop.run_in_executor(
+                            pool,
+                            match_shard,
+                            care_type,
+                            # a zip code that is not a number has no distance to any facility
+                            [p.zip_code if p.zip_code and p.zip_code.isdigit() else None for p in members],
+                        )
+                        for care_type, members in shards
+                    )
+                )
+                assignments = [
+                    (patient.id, facility_id)
+                    for (_, members), facility_ids in zip(shards, results)
+                    for patient, facility_id in zip(members, facility_ids)
+                ]
+                await repository.assign_facilities(assignments)
+                await session.commit()
+
+            checkpoint.after_id = patients[-1].id
+            checkpoint.processed += len(patients)
+            checkpoint.matched += sum(1 for _, facility_id in assignments if facility_id is not None)
+            checkpoint.save(checkpoint_path)
+
+            processed_this_run += len(patients)
+            elapsed = time.perf_counter() - started
+            report(
+                f"{checkpoint.processed} patients processed, {checkpoint.matched} matched, "
+                f"{processed_this_run / elapsed:.0f} patients/s"
+            )
+
+    # the run is complete, the next one starts from the beginning
+    if checkpoint_path is not None and checkpoint_path.exists():
+        checkpoint_path.unlink()
+    elapsed = time.perf_counter() - started
+    report(
+        f"done: {checkpoint.processed} patients, {checkpoint.matched} matched, "
+        f"{processed_this_run} in this run in {elapsed:.1f}s ({processed_this_run / max(elapsed, 1e-9):.0f} patients/s)"
+    )
+    return checkpoint
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None, help="processes, all cores by default")
+    parser.add_argument("--checkpoint", type=Path, default=None, help="progress file to resume from")
+    args = parser.parse_args()
+    asyncio.run(rematch(chunk_size=args.chunk_size, workers=args.workers, checkpoint_path=args.checkpoint))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import asyncio
+import json
+import logging
+from typing import Iterable, Sequence
+from uuid import uuid4
+
+from app.core.config import settings
+from app.domain.models.capacity_type import CapacityType
+from app.domain.models.care_type import CareType
+from app.domain.models.facility import Facility
+from app.domain.repositories.facility_repository import FacilityRepository
+from app.infrastructure.cache.backend import CacheBackend
+from app.infrastructure.cache.cache_backend import cache_backend
+from app.use_cases.match_cache import MatchCache, match_cache
+from app.use_cases.match_rules import coverage_spans
+from app.use_cases.match_table import FacilityMatchTables, facility_match_tables
+from app.use_cases.zip_range_index import FacilityZipIndex, facility_zip_index
+
+FACILITY_CHANGES_CHANNEL = "facility-changes"
+# seconds before resubscribing after the subscription failed, doubled up to the maximum while it keeps failing
+LISTEN_RETRY_SECONDS = 1.0
+LISTEN_MAX_RETRY_SECONDS = 30.0
+
+logger = logging.getLogger(__name__)
+
+
+class FacilityChanges:
+    """Keeps the zip index, the match tables built on it and the match cache in step with facility writes.
+
+    A write can only change the matches its facility won before, or the ones it can win now: zips its ranges
+    cover within MAX_MATCH_DISTANCE of its own zip code, for its care types, while it is available. The match
+    cache lives in the shared backend and is invalidated there once; the zip index is per process, so writes
+    are also published for the other workers to apply (see `listen`). The endpoints call it from `after_commit`,
+    so neither this process nor the other workers ever see a write that is rolled back.
+    """
+
+    def __init__(
+        self,
+        zip_index: FacilityZipIndex,
+        match_tables: FacilityMatchTables,
+        match_cache: MatchCache,
+        backend: CacheBackend,
+        channel: str = FACILITY_CHANGES_CHANNEL,
+    ):
+        self.zip_index = zip_index
+        self.match_tables = match_tables
+        self.match_cache = match_cache
+        self.backend = backend
+        self.channel = channel
+        # tells our own messages apart when they come back from the channel
+        self.origin = uuid4().hex
+
+    async def facility_saved(self, facility: Facility) -> None:
+        self._save(facility)
+        await self._publish("saved", facility=facility.model_dump(mode="json"))
+        await self.match_cache.invalidate_facility(facility.id)
+        await self._invalidate_coverage(facility)
+
+    async def facility_removed(self, facility_id: str) -> None:
+        self._remove(facility_id)
+        await self._publish("removed", id=facility_id)
+        await self.match_cache.invalidate_facility(facility_id)
+
+    async def capacity_changed(
+        self, facility_repository: FacilityRepository, facility_ids: Sequence[str], capacity: CapacityType
+    ) -> None:
+        if not facility_ids:
+            return
+
+        self._set_capacity(facility_ids, capacity)
+        await self._publish("capacity", ids=list(facility_ids), capacity=capacity.value)
+        for facility_id in facility_ids:
+            await self.match_cache.invalidate_facility(facility_id)
+
+        # only a facility becoming available can win new matches, and that needs its coverage
+        if capacity == CapacityType.AVAILABLE and settings.MATCH_CACHE_ENABLED:
+            for facility in await facility_repository.get_by_ids(facility_ids):
+                await self._invalidate_coverage(facility)
+
+    async def facilities_imported(self, care_types: Iterable[CareType]) -> None:
+        care_types = list(care_types)
+        for care_type in care_types:
+            self._invalidate(care_type)
+            await self.match_cache.invalidate_care_type(care_type)
+        if care_types:
+            await self._publish("imported", care_types=[care_type.value for care_type in care_types])
+
+    async def listen(
+        self, retry_seconds: float = LISTEN_RETRY_SECONDS, max_retry_seconds: float = LISTEN_MAX_RETRY_SECONDS
+    ) -> None:
+        """Apply the writes of other workers to this process' zip index, until cancelled.
+
+        A message that cannot be applied is logged and skipped. When the subscription fails it is renewed with
+        backoff, and as the writes published in between are lost, the zip index and match tables are dropped
+        to be reloaded from the database.
+        """
+        delay = retry_seconds
+        while True:
+            try:
+                async for message in self.backend.subscribe(self.channel):
+                    delay = retry_seconds
+                    try:
+                        self.apply(json.loads(message))
+                    except Exception:
+                        logger.exception("skipping facility change %r", message)
+                logger.error("facility change subscription ended, resubscribing in %.1f s", delay)
+            except Exception:
+                logger.exception("facility change subscription failed, resubscribing in %.1f s", delay)
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_retry_seconds)
+            self.zip_index.clear()
+            self.match_tables.clear()
+            self.match_cache.discard_pending()
+
+    def apply(self, change: dict) -> None:
+        if change["origin"] == self.origin:
+            return
+
+        # the writer invalidated the shared match cache, a match this worker is computing may predate it
+        self.match_cache.discard_pending()
+        event = change["event"]
+        if event == "saved":
+            self._save(Facility.model_validate(change["facility"]))
+        elif event == "removed":
+            self._remove(change["id"])
+        elif event == "capacity":
+            self._set_capacity(change["ids"], CapacityType(change["capacity"]))
+        elif event == "imported":
+            for care_type in change["care_types"]:
+                self._invalidate(CareType(care_type))
+
+    def _save(self, facility: Facility) -> None:
+        before = self.zip_index.find(facility.id)
+        self.zip_index.upsert(facility)
+        self.match_tables.facility_changed(before, facility)
+
+    def _remove(self, facility_id: str) -> None:
+        before = self.zip_index.find(facility_id)
+        self.zip_index.remove(facility_id)
+        self.match_tables.facility_changed(before, None)
+
+    def _set_capacity(self, facility_ids: Sequence[str], capacity: CapacityType) -> None:
+        before = {facility_id: self.zip_index.find(facility_id) for facility_id in facility_ids}
+        self.zip_index.set_capacity(facility_ids, capacity)
+        for facility_id, facility in before.items():
+            self.match_tables.facility_changed(facility, self.zip_index.find(facility_id))
+
+    def _invalidate(self, care_type: CareType) -> None:
+        self.zip_index.invalidate(care_type)
+        self.match_tables.invalidate(care_type)
+
+    async def _publish(self, event: str, **payload) -> None:
+        await self.backend.publish(self.channel, json.dumps({"origin": self.origin, "event": event, **payload}))
+
+    async def _invalidate_coverage(self, facility: Facility) -> None:
+        for care_type in facility.care_types:
+            for low, high in coverage_spans(facility):
+                await self.match_cache.invalidate_span(care_type, low, high)
+
+
+facility_changes = FacilityChanges(facility_zip_index, facility_match_tables, match_cache, cache_backend)
@@ -0,0 +1,138 @@
+import codecs
+import csv
+import json
+from dataclasses import dataclass, field
+from typing import AsyncIterable, AsyncIterator
+
+from pydantic import ValidationError
+
+from app.domain.models.care_type import CareType
+from app.domain.models.facility import Facility
+from app.domain.repositories.facility_repository import FacilityRepository
+
+CSV_COLUMNS = ("name", "zip_code", "capacity", "care_types", "zip_code_ranges")
+# separates list items inside a CSV cell, e.g. "ambulatory|stationary" and "10000-10999|12000-12999"
+CSV_LIST_SEPARATOR = "|"
+
+
+@dataclass
+class ImportRowError:
+    row: int
+    error: str
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    failed: int = 0
+    errors: list[ImportRowError] = field(default_factory=list)
+    care_types: set[CareType] = field(default_factory=set)
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_jsonl_records(lines: AsyncIterable[str]) -> AsyncIterator[tuple[int, dict | str]]:
+    """Yield (line number, record) per non-blank line, or (line number, error message)."""
+    row = 0
+    async for line in lines:
+        row += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row, f"invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield row, "expected a JSON object"
+            continue
+        yield row, record
+
+
+async def iter_csv_records(lines: AsyncIterable[str]) -> AsyncIterator[tuple[int, dict | str]]:
+    """Like iter_jsonl_records for CSV with a header row naming CSV_COLUMNS, one record per line."""
+    row = 0
+    header: list[str] | None = None
+    async for line in lines:
+        row += 1
+        if not line.strip():
+            continue
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [column.strip() for column in values]
+            missing = [column for column in CSV_COLUMNS if column not in header]
+            if missing:
+                raise ValueError(f"CSV header is missing columns: {', '.join(missing)}")
+            continue
+        if len(values) != len(header):
+            yield row, f"expected {len(header)} columns, got {len(values)}"
+            continue
+
+        record = dict(zip(header, values))
+        record["care_types"] = _split_list(record["care_types"])
+        record["zip_code_ranges"] = [
+            dict(zip(("min_zip_code", "max_zip_code"), (bound.strip() for bound in zip_range.split("-", 1))))
+            for zip_range in _split_list(record["zip_code_ranges"])
+        ]
+        yield row, record
+
+
+def _split_list(value: str) -> list[str]:
+    return [item.strip() for item in value.split(CSV_LIST_SEPARATOR) if item.strip()]
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'record'}: {detail['msg']}" for detail in error.errors()
+    )
+
+
+@dataclass
+class ImportFacilitiesUseCase:
+    facility_repository: FacilityRepository
+    batch_size: int = 1000
+    max_reported_errors: int = 1000
+
+    async def execute(self, records: AsyncIterable[tuple[int, dict | str]]) -> ImportResult:
+        """Validate records as they arrive and insert them in batches; invalid rows are reported, not fatal.
+
+        Only one batch is held in memory at a time, the caller owns the transaction.
+        """
+        result = ImportResult()
+        batch: list[Facility] = []
+
+        async for row, record in records:
+            if isinstance(record, str):
+                self._reject(result, row, record)
+                continue
+            try:
+                facility = Facility.model_validate({**record, "id": None})
+            except ValidationError as e:
+                self._reject(result, row, _format_validation_error(e))
+                continue
+
+            batch.append(facility)
+            result.care_types.update(facility.care_types)
+            if len(batch) >= self.batch_size:
+                result.imported += await self.facility_repository.bulk_create(batch)
+                batch = []
+
+        if batch:
+            result.imported += await self.facility_repository.bulk_create(batch)
+        return result
+
+    def _reject(self, result: ImportResult, row: int, error: str) -> None:
+        result.failed += 1
+        if len(result.errors) < self.max_reported_errors:
+            result.errors.append(ImportRowError(row=row, error=error))
@@ -0,0 +1,95 @@
+from app.core.config import settings
+from app.domain.models.care_type import CareType
+from app.domain.models.facility import Facility
+from app.infrastructure.cache.backend import CacheBackend
+from app.infrastructure.cache.cache_backend import cache_backend
+
+# returned by MatchCache.get when there is no entry, None is a cached "no match"
+MISS = object()
+
+NO_MATCH = "null"
+
+
+class MatchCache:
+    """Match results per (care type, zip code), "no match" included, kept in a CacheBackend with a TTL.
+
+    Entries are indexed by zip code per care type and by the facility they matched, so writes can drop
+    exactly the matches a facility could change, see app.use_cases.facility_changes. The generation that
+    keeps `put` from storing a match computed across an invalidation, and the hit and miss counters, are per
+    process.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl_seconds: float = 60.0, namespace: str = "match"):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.namespace = namespace
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    async def get(self, care_type: CareType, zip_code: int) -> Facility | None | object:
+        value = await self.backend.get(self._key(care_type, zip_code))
+        if value is None:
+            self.misses += 1
+            return MISS
+
+        self.hits += 1
+        return None if value == NO_MATCH else Facility.model_validate_json(value)
+
+    async def put(
+        self, care_type: CareType, zip_code: int, match: Facility | None, generation: int | None = None
+    ) -> None:
+        # an invalidation that landed while the match was computed makes it stale, do not keep it
+        if generation is not None and generation != self._generation:
+            return
+
+        key = self._key(care_type, zip_code)
+        await self.backend.set(key, match.model_dump_json() if match else NO_MATCH, self.ttl_seconds)
+        # an index outlives its newest entry by no more than the entry itself, so indexes left behind by
+        # expired entries expire too
+        await self.backend.index_add(self._zip_index(care_type), key, zip_code, self.ttl_seconds)
+        if match is not None:
+            await self.backend.index_add(self._facility_index(match.id), key, 0, self.ttl_seconds)
+
+    async def invalidate_facility(self, facility_id: str) -> None:
+        """Drop the matches won by a facility."""
+        self._generation += 1
+        index = self._facility_index(facility_id)
+        await self.backend.delete([*await self.backend.index_range(index), index])
+
+    async def invalidate_span(self, care_type: CareType, min_zip_code: int, max_zip_code: int) -> None:
+        """Drop the matches of a care type for zips in [min_zip_code, max_zip_code]."""
+        self._generation += 1
+        index = self._zip_index(care_type)
+        keys = await self.backend.index_range(index, min_zip_code, max_zip_code)
+        if keys:
+            await self.backend.delete(keys)
+            await self.backend.index_remove(index, keys)
+
+    async def invalidate_care_type(self, care_type: CareType) -> None:
+        self._generation += 1
+        index = self._zip_index(care_type)
+        await self.backend.delete([*await self.backend.index_range(index), index])
+
+    def discard_pending(self) -> None:
+        """Keep the matches being computed from being stored, for invalidations made by other workers."""
+        self._generation += 1
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, **self.backend.stats()}
+
+    def _key(self, care_type: CareType, zip_code: int) -> str:
+        return f"{self.namespace}:{care_type.value}:{zip_code}"
+
+    def _zip_index(self, care_type: CareType) -> str:
+        return f"{self.namespace}:zips:{care_type.value}"
+
+    def _facility_index(self, facility_id: str) -> str:
+        return f"{self.namespace}:facility:{facility_id}"
+
+
+match_cache = MatchCache(cache_backend, ttl_seconds=settings.CACHE_TTL_SECONDS)
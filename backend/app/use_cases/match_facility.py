@@ -1,14 +1,31 @@
+import heapq
 from dataclasses import dataclass
+from functools import partial
+from typing import Collection, Sequence
 
 from app.domain.models.capacity_type import CapacityType
 from app.domain.models.care_type import CareType
 from app.domain.models.facility import Facility
 from app.domain.repositories.facility_repository import FacilityRepository
+from app.use_cases.match_cache import MISS, MatchCache
+from app.use_cases.match_rules import MAX_MATCH_DISTANCE
+from app.use_cases.match_table import FacilityMatchTables
+from app.use_cases.zip_range_index import FacilityZipIndex, ZipRangeIndex
+
+
+@dataclass(frozen=True)
+class MatchCandidate:
+    facility: Facility
+    distance: int
 
 
 @dataclass
 class MatchFacilityUseCase:
     facility_repository: FacilityRepository
+    zip_index: FacilityZipIndex | None = None
+    match_cache: MatchCache | None = None
+    # precomputed winners on top of zip_index, which must be set too
+    match_tables: FacilityMatchTables | None = None
 
     async def execute(self, care_type: CareType, zip_code: str | None = None) -> Facility | None:
         if care_type == CareType.day_care:
@@ -17,41 +34,142 @@ class MatchFacilityUseCase:
         if not zip_code:
             return None
 
-        facilities = await self.facility_repository.get_by_care_type(care_type)
+        patient_zip = int(zip_code)
 
-        if not facilities:
-            return None
+        if self.match_cache is None:
+            return await self._match(care_type, patient_zip)
 
-        patient_zip = int(zip_code)
-        eligible_facilities: list[Facility] = []
+        cached = await self.match_cache.get(care_type, patient_zip)
+        if cached is not MISS:
+            return cached
+        generation = self.match_cache.generation
+        match = await self._match(care_type, patient_zip)
+        await self.match_cache.put(care_type, patient_zip, match, generation=generation)
+        return match
 
-        for facility in facilities:
-            for zip_range in facility.zip_code_ranges:
-                if zip_range.min_zip_code <= patient_zip <= zip_range.max_zip_code:
-                    eligible_facilities.append(facility)
-                    break
+    async def find_candidates(
+        self, care_type: CareType, zip_code: str | None, top_k: int = 1, exclude_ids: Collection[str] = ()
+    ) -> list[MatchCandidate]:
+        """The top_k best matches, nearest first, skipping the facilities in exclude_ids."""
+        if care_type == CareType.day_care or not zip_code:
+            return []
 
+        patient_zip = int(zip_code)
+        if top_k == 1 and not exclude_ids:
+            # the single best match can come from the cache or the match table
+            match = await self.execute(care_type, zip_code)
+            return [self.to_candidate(match, patient_zip)] if match else []
+
+        if self.zip_index is None:
+            facilities = await self.facility_repository.find_match_candidates(
+                care_type, patient_zip, max_distance=MAX_MATCH_DISTANCE, limit=top_k, exclude_ids=exclude_ids
+            )
+        else:
+            index = await self._get_index(care_type)
+            facilities = heapq.nsmallest(
+                top_k,
+                (
+                    facility
+                    for facility in index.covering(patient_zip)
+                    if facility.capacity == CapacityType.AVAILABLE
+                    and facility.zip_code.isdigit()
+                    and facility.id not in exclude_ids
+                    and abs(int(facility.zip_code) - patient_zip) <= MAX_MATCH_DISTANCE
+                ),
+                key=lambda facility: (abs(int(facility.zip_code) - patient_zip), facility.id),
+            )
+        return [self.to_candidate(facility, patient_zip) for facility in facilities]
+
+    @staticmethod
+    def to_candidate(facility: Facility, patient_zip: int) -> MatchCandidate:
+        return MatchCandidate(facility=facility, distance=abs(int(facility.zip_code) - patient_zip))
+
+    async def _match(self, care_type: CareType, patient_zip: int) -> Facility | None:
+        if self.zip_index is None:
+            # eligibility, ordering and the distance cutoff all run in the database
+            candidates = await self.facility_repository.find_match_candidates(
+                care_type, patient_zip, max_distance=MAX_MATCH_DISTANCE
+            )
+            return candidates[0] if candidates else None
+
+        index = await self._get_index(care_type)
+        if self.match_tables is not None:
+            return self.match_tables.get(care_type, index).lookup(patient_zip)
+        return self._covering_match(index, patient_zip)
+
+    async def execute_many(self, requests: Sequence[tuple[CareType, str | None]]) -> list[Facility | None]:
+        """Match many (care type, zip code) pairs with one query, or one index load, per care type."""
+        results: list[Facility | None] = [None] * len(requests)
+
+        generation = self.match_cache.generation if self.match_cache is not None else None
+
+        zips_by_care_type: dict[CareType, dict[int, list[int]]] = {}
+        for position, (care_type, zip_code) in enumerate(requests):
+            if care_type == CareType.day_care or not zip_code:
+                continue
+            patient_zip = int(zip_code)
+            if self.match_cache is not None and patient_zip not in zips_by_care_type.get(care_type, {}):
+                cached = await self.match_cache.get(care_type, patient_zip)
+                if cached is not MISS:
+                    results[position] = cached
+                    continue
+            zips_by_care_type.setdefault(care_type, {}).setdefault(patient_zip, []).append(position)
+
+        for care_type, positions_by_zip in zips_by_care_type.items():
+            if self.zip_index is None:
+                # one set-based query matches every zip code of the care type
+                matches = await self.facility_repository.find_matches(
+                    care_type, list(positions_by_zip), max_distance=MAX_MATCH_DISTANCE
+                )
+                lookup = matches.get
+            elif self.match_tables is not None:
+                lookup = self.match_tables.get(care_type, await self._get_index(care_type)).lookup
+            else:
+                index = await self._get_index(care_type)
+                lookup = partial(self._covering_match, index)
+
+            for patient_zip, positions in positions_by_zip.items():
+                match = lookup(patient_zip)
+                if self.match_cache is not None:
+                    await self.match_cache.put(care_type, patient_zip, match, generation=generation)
+                for position in positions:
+                    results[position] = match
+
+        return results
+
+    @classmethod
+    def _covering_match(cls, index: ZipRangeIndex, patient_zip: int) -> Facility | None:
+        return cls._best_match(index.covering(patient_zip), patient_zip)
+
+    @staticmethod
+    def _best_match(eligible_facilities: list[Facility], patient_zip: int) -> Facility | None:
+        # facilities without a numeric zip code have no distance and never match
+        eligible_facilities = [f for f in eligible_facilities if f.zip_code.isdigit()]
         if not eligible_facilities:
             return None
 
-        def facility_priority(facility: Facility) -> tuple[int, int]:
+        def facility_priority(facility: Facility) -> tuple[int, int, str]:
             availability_score = 0 if facility.capacity == CapacityType.AVAILABLE else 1
             distance = abs(int(facility.zip_code) - patient_zip)
-            return (availability_score, distance)
+            return (availability_score, distance, facility.id)
 
-        eligible_facilities.sort(key=facility_priority)
+        eligible_facilities = sorted(eligible_facilities, key=facility_priority)
 
         best_available_facility = next((f for f in eligible_facilities if f.capacity == CapacityType.AVAILABLE), None)
 
         if best_available_facility:
             distance = abs(int(best_available_facility.zip_code) - patient_zip)
-            if distance > 3000:
+            if distance > MAX_MATCH_DISTANCE:
                 return None
 
-            best_available_facility.zip_code_ranges = [
-                {"min_zip_code": zr.min_zip_code, "max_zip_code": zr.max_zip_code}
-                for zr in best_available_facility.zip_code_ranges
-            ]
             return best_available_facility
 
         return None
+
+    async def _get_index(self, care_type: CareType) -> ZipRangeIndex:
+        index = self.zip_index.get(care_type)
+        if index is None:
+            generation = self.zip_index.generation
+            facilities = await self.facility_repository.get_by_care_type(care_type)
+            index = self.zip_index.load(care_type, facilities, generation=generation)
+        return index
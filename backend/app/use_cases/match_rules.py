@@ -0,0 +1,19 @@
+from app.domain.models.capacity_type import CapacityType
+from app.domain.models.facility import Facility
+
+MAX_MATCH_DISTANCE = 3000
+
+
+def coverage_spans(facility: Facility) -> list[tuple[int, int]]:
+    """Zip spans a facility can win: its ranges, within MAX_MATCH_DISTANCE of its own zip code, while available."""
+    if facility.capacity != CapacityType.AVAILABLE or not facility.zip_code.isdigit():
+        return []
+
+    zip_code = int(facility.zip_code)
+    spans = []
+    for zip_range in facility.zip_code_ranges:
+        low = max(zip_range.min_zip_code, zip_code - MAX_MATCH_DISTANCE)
+        high = min(zip_range.max_zip_code, zip_code + MAX_MATCH_DISTANCE)
+        if low <= high:
+            spans.append((low, high))
+    return spans
@@ -0,0 +1,149 @@
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+
+from app.domain.models.care_type import CareType
+from app.domain.models.facility import Facility
+from app.use_cases.match_rules import MAX_MATCH_DISTANCE, coverage_spans
+from app.use_cases.zip_range_index import ZipRangeIndex
+
+NO_WINNER = -1
+
+
+class MatchTable:
+    """The winning facility of every zip code in the covered span of one care type, for O(1) matching.
+
+    Winners are slots into a facility list, kept in an int array indexed by zip code - base. The table is
+    derived from a ZipRangeIndex and recomputed span by span with `refresh` after the index changes.
+    """
+
+    def __init__(self, index: ZipRangeIndex):
+        self.index = index
+        self._base = 0
+        self._winners = array("i")
+        self._slots: list[Facility] = []
+        self._slot_by_id: dict[str, int] = {}
+
+        spans = [span for facility in index.facilities() for span in coverage_spans(facility)]
+        if spans:
+            self.refresh(min(low for low, _ in spans), max(high for _, high in spans))
+
+    def __len__(self) -> int:
+        return len(self._winners)
+
+    def lookup(self, zip_code: int) -> Facility | None:
+        position = zip_code - self._base
+        if position < 0 or position >= len(self._winners):
+            return None
+        slot = self._winners[position]
+        return self._slots[slot] if slot != NO_WINNER else None
+
+    def refresh(self, min_zip_code: int, max_zip_code: int) -> None:
+        """Recompute the winners of [min_zip_code, max_zip_code] from the index."""
+        self._extend(min_zip_code, max_zip_code)
+        base, winners = self._base, self._winners
+        for position in range(min_zip_code - base, max_zip_code - base + 1):
+            winners[position] = NO_WINNER
+
+        # sweep the span, keeping the (zip code, id) of the facilities that can win the current zip sorted
+        events: dict[int, list[tuple[Facility, int]]] = defaultdict(list)
+        for facility in self.index.facilities():
+            for low, high in coverage_spans(facility):
+                if low <= max_zip_code and high >= min_zip_code:
+                    events[max(low, min_zip_code)].append((facility, 1))
+                    events[min(high, max_zip_code) + 1].append((facility, -1))
+
+        active: Counter[str] = Counter()
+        candidates: list[tuple[int, str, Facility]] = []
+        positions = sorted(events)
+        for start, end in zip(positions, positions[1:]):
+            for facility, delta in events[start]:
+                key = (int(facility.zip_code), facility.id, facility)
+                active[facility.id] += delta
+                if delta == 1 and active[facility.id] == 1:
+                    insort(candidates, key, key=lambda candidate: candidate[:2])
+                elif active[facility.id] == 0:
+                    del active[facility.id]
+                    del candidates[bisect_left(candidates, key[:2], key=lambda candidate: candidate[:2])]
+
+            if candidates:
+                for zip_code in range(start, end):
+                    winner = self._nearest(candidates, zip_code)
+                    if winner is not None:
+                        winners[zip_code - base] = self._slot(winner)
+
+    @staticmethod
+    def _nearest(candidates: list[tuple[int, str, Facility]], zip_code: int) -> Facility | None:
+        # (distance, id) decides, so on each side only the lowest id at the nearest zip code can win
+        position = bisect_left(candidates, zip_code, key=lambda candidate: candidate[0])
+        best = None
+        if position < len(candidates):
+            best = candidates[position]
+        if position > 0:
+            left_zip = candidates[position - 1][0]
+            left = candidates[bisect_left(candidates, left_zip, key=lambda candidate: candidate[0])]
+            if best is None or (zip_code - left_zip, left[1]) < (best[0] - zip_code, best[1]):
+                best = left
+        if best is None or abs(best[0] - zip_code) > MAX_MATCH_DISTANCE:
+            return None
+        return best[2]
+
+    def _slot(self, facility: Facility) -> int:
+        slot = self._slot_by_id.get(facility.id)
+        if slot is None:
+            slot = len(self._slots)
+            self._slot_by_id[facility.id] = slot
+            self._slots.append(facility)
+        else:
+            # the index holds the latest version of the facility
+            self._slots[slot] = facility
+        return slot
+
+    def _extend(self, min_zip_code: int, max_zip_code: int) -> None:
+        if not self._winners:
+            self._base = min_zip_code
+            self._winners = array("i", [NO_WINNER]) * (max_zip_code - min_zip_code + 1)
+            return
+
+        end = self._base + len(self._winners) - 1
+        if min_zip_code < self._base:
+            self._winners = array("i", [NO_WINNER]) * (self._base - min_zip_code) + self._winners
+            self._base = min_zip_code
+        if max_zip_code > end:
+            self._winners.extend(array("i", [NO_WINNER]) * (max_zip_code - end))
+
+
+class FacilityMatchTables:
+    """Process-wide MatchTable per care type, built on the ZipRangeIndex of the care type.
+
+    Facility changes refresh only the spans the facility could win before or after the change, see
+    app.use_cases.facility_changes. A table whose index was replaced is rebuilt on next use.
+    """
+
+    def __init__(self):
+        self._tables: dict[CareType, MatchTable] = {}
+
+    def get(self, care_type: CareType, index: ZipRangeIndex) -> MatchTable:
+        table = self._tables.get(care_type)
+        if table is None or table.index is not index:
+            table = self._tables[care_type] = MatchTable(index)
+        return table
+
+    def facility_changed(self, before: Facility | None, after: Facility | None) -> None:
+        """Call after the zip index was updated."""
+        for care_type, table in self._tables.items():
+            spans = []
+            for facility in (before, after):
+                if facility is not None and care_type in facility.care_types:
+                    spans.extend(coverage_spans(facility))
+            for low, high in spans:
+                table.refresh(low, high)
+
+    def invalidate(self, care_type: CareType) -> None:
+        self._tables.pop(care_type, None)
+
+    def clear(self) -> None:
+        self._tables.clear()
+
+
+facility_match_tables = FacilityMatchTables()
@@ -0,0 +1,101 @@
+from typing import Iterable, Sequence
+
+from app.domain.models.capacity_type import CapacityType
+from app.domain.models.care_type import CareType
+from app.domain.models.facility import Facility
+from app.use_cases.match_rules import MAX_MATCH_DISTANCE
+
+try:
+    import numpy as np
+except ImportError:  # optional, installed with the "numpy" extra
+    np = None
+
+CARE_TYPE_BITS = {care_type: 1 << bit for bit, care_type in enumerate(CareType)}
+
+NO_MATCH = -1
+
+# patient zips compared with the candidate ranges at once, bounds the (zips x ranges) intermediates
+ZIP_CHUNK_SIZE = 128
+
+
+class FacilityArrays:
+    """Facilities as columnar arrays, to match whole arrays of patient zip codes with vectorized operations.
+
+    Facilities are ordered by id, so the lowest position wins distance ties like in MatchFacilityUseCase.
+    Ranges are flattened: the ranges of facility i are range_start/range_end[range_offsets[i]:range_offsets[i + 1]].
+    """
+
+    def __init__(self, facilities: Iterable[Facility]):
+        if np is None:
+            raise RuntimeError("Vectorized matching needs the numpy package")
+
+        # a non-numeric zip code has no distance and never matches
+        self.facilities = sorted((f for f in facilities if f.zip_code.isdigit()), key=lambda f: f.id)
+        count = len(self.facilities)
+        self.zip_codes = np.fromiter((int(f.zip_code) for f in self.facilities), dtype=np.int64, count=count)
+        self.available = np.fromiter(
+            (f.capacity == CapacityType.AVAILABLE for f in self.facilities), dtype=bool, count=count
+        )
+        self.care_types = np.fromiter(
+            (sum(CARE_TYPE_BITS[care_type] for care_type in set(f.care_types)) for f in self.facilities),
+            dtype=np.int64,
+            count=count,
+        )
+
+        range_counts = np.fromiter((len(f.zip_code_ranges) for f in self.facilities), dtype=np.int64, count=count)
+        self.range_offsets = np.concatenate(([0], np.cumsum(range_counts)))
+        ranges = [zr for f in self.facilities for zr in f.zip_code_ranges]
+        self.range_start = np.fromiter((zr.min_zip_code for zr in ranges), dtype=np.int64, count=len(ranges))
+        self.range_end = np.fromiter((zr.max_zip_code for zr in ranges), dtype=np.int64, count=len(ranges))
+        self.range_facility = np.repeat(np.arange(count, dtype=np.int64), range_counts)
+
+    def __len__(self) -> int:
+        return len(self.facilities)
+
+    def match(self, care_type: CareType, zip_codes: Sequence[str | None]) -> list[Facility | None]:
+        """Best facility per patient zip code, None where MatchFacilityUseCase finds no match."""
+        matched = [position for position, zip_code in enumerate(zip_codes) if zip_code]
+        results: list[Facility | None] = [None] * len(zip_codes)
+        patient_zips = np.array([int(zip_codes[position]) for position in matched], dtype=np.int64)
+        winners = self.match_positions(care_type, patient_zips)
+        for position, winner in zip(matched, winners.tolist()):
+            if winner != NO_MATCH:
+                results[position] = self.facilities[winner]
+        return results
+
+    def match_positions(self, care_type: CareType, zip_codes: "np.ndarray") -> "np.ndarray":
+        """Position in `facilities` of the best facility per zip code, NO_MATCH where there is none."""
+        if care_type == CareType.day_care or not len(zip_codes):
+            return np.full(len(zip_codes), NO_MATCH, dtype=np.int64)
+
+        # the spans each range can win: available facilities of the care type, within the distance cutoff
+        owner = self.range_facility
+        eligible = self.available[owner] & (self.care_types[owner] & CARE_TYPE_BITS[care_type] != 0)
+        owner = owner[eligible]
+        owner_zip = self.zip_codes[owner]
+        start = np.maximum(self.range_start[eligible], owner_zip - MAX_MATCH_DISTANCE)
+        end = np.minimum(self.range_end[eligible], owner_zip + MAX_MATCH_DISTANCE)
+        keep = start <= end
+        order = np.argsort(start[keep], kind="stable")
+        owner, owner_zip, start, end = (column[keep][order] for column in (owner, owner_zip, start, end))
+
+        # rank by (distance, position) in one int64 key
+        no_key = np.iinfo(np.int64).max
+        count = len(self.facilities)
+        unique_zips, inverse = np.unique(zip_codes, return_inverse=True)
+        winners = np.full(len(unique_zips), NO_MATCH, dtype=np.int64)
+        for chunk_start in range(0, len(unique_zips), ZIP_CHUNK_SIZE):
+            chunk = unique_zips[chunk_start : chunk_start + ZIP_CHUNK_SIZE]
+            # ranges are sorted by start, the ones starting after the chunk cannot cover it
+            candidates = np.flatnonzero(end[: np.searchsorted(start, chunk[-1], side="right")] >= chunk[0])
+            if not len(candidates):
+                continue
+
+            zips = chunk[:, None]
+            covers = (zips >= start[candidates]) & (zips <= end[candidates])
+            keys = np.where(covers, np.abs(zips - owner_zip[candidates]) * count + owner[candidates], no_key)
+            best = keys.min(axis=1)
+            found = best != no_key
+            winners[chunk_start : chunk_start + len(chunk)][found] = best[found] % count
+
+        return winners[inverse.reshape(-1)]
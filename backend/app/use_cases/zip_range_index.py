@@ -0,0 +1,209 @@
+import random
+from typing import Iterable
+
+from app.domain.models.capacity_type import CapacityType
+from app.domain.models.care_type import CareType
+from app.domain.models.facility import Facility
+
+# (min_zip_code, max_zip_code, facility id)
+RangeKey = tuple[int, int, str]
+
+
+class _Node:
+    __slots__ = ("key", "priority", "max_zip_code", "left", "right")
+
+    def __init__(self, key: RangeKey):
+        self.key = key
+        self.priority = random.random()
+        self.max_zip_code = key[1]
+        self.left: _Node | None = None
+        self.right: _Node | None = None
+
+    def update(self) -> "_Node":
+        max_zip_code = self.key[1]
+        if self.left is not None and self.left.max_zip_code > max_zip_code:
+            max_zip_code = self.left.max_zip_code
+        if self.right is not None and self.right.max_zip_code > max_zip_code:
+            max_zip_code = self.right.max_zip_code
+        self.max_zip_code = max_zip_code
+        return self
+
+
+def _split(node: _Node | None, key: RangeKey) -> tuple[_Node | None, _Node | None]:
+    """The nodes below key and the nodes from key on."""
+    if node is None:
+        return None, None
+    if node.key < key:
+        node.right, right = _split(node.right, key)
+        return node.update(), right
+    left, node.left = _split(node.left, key)
+    return left, node.update()
+
+
+def _merge(left: _Node | None, right: _Node | None) -> _Node | None:
+    """Join two treaps where every key of left is below every key of right."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        return left.update()
+    right.left = _merge(left, right.left)
+    return right.update()
+
+
+def _delete(node: _Node | None, key: RangeKey) -> _Node | None:
+    if node is None:
+        return None
+    if node.key == key:
+        return _merge(node.left, node.right)
+    if key < node.key:
+        node.left = _delete(node.left, key)
+    else:
+        node.right = _delete(node.right, key)
+    return node.update()
+
+
+def _stab(node: _Node, zip_code: int, found: dict[str, None]) -> None:
+    # callers skip the subtrees that end before zip_code
+    left = node.left
+    if left is not None and left.max_zip_code >= zip_code:
+        _stab(left, zip_code, found)
+    min_zip_code, max_zip_code, facility_id = node.key
+    if min_zip_code > zip_code:
+        # the right subtree starts even later
+        return
+    if max_zip_code >= zip_code:
+        found[facility_id] = None
+    right = node.right
+    if right is not None and right.max_zip_code >= zip_code:
+        _stab(right, zip_code, found)
+
+
+class ZipRangeIndex:
+    """Answers "which facilities cover zip X" for a changing set of facilities.
+
+    The ranges live in an interval tree: a treap ordered by range start where every node knows the
+    highest range end below it, so a lookup skips the subtrees that end before the zip code. Each
+    range is stored once, `upsert` and `remove` cost O(log n) per range and there is no rebuild.
+    """
+
+    def __init__(self, facilities: Iterable[Facility] = ()):
+        self._facilities: dict[str, Facility] = {}
+        self._root: _Node | None = None
+        for facility in facilities:
+            self.upsert(facility)
+
+    def __len__(self) -> int:
+        return len(self._facilities)
+
+    def __contains__(self, facility_id: str) -> bool:
+        return facility_id in self._facilities
+
+    def get(self, facility_id: str) -> Facility | None:
+        return self._facilities.get(facility_id)
+
+    def facilities(self) -> list[Facility]:
+        return list(self._facilities.values())
+
+    def upsert(self, facility: Facility) -> None:
+        before = self._facilities.get(facility.id)
+        self._facilities[facility.id] = facility
+        old_keys = self._keys(before) if before is not None else set()
+        new_keys = self._keys(facility)
+        for key in old_keys - new_keys:
+            self._root = _delete(self._root, key)
+        for key in new_keys - old_keys:
+            left, right = _split(self._root, key)
+            self._root = _merge(_merge(left, _Node(key)), right)
+
+    def remove(self, facility_id: str) -> bool:
+        facility = self._facilities.pop(facility_id, None)
+        if facility is None:
+            return False
+        for key in self._keys(facility):
+            self._root = _delete(self._root, key)
+        return True
+
+    def set_capacity(self, facility_id: str, capacity: CapacityType) -> None:
+        # capacity is not part of the tree, swap the facility in place
+        facility = self._facilities.get(facility_id)
+        if facility is not None:
+            self._facilities[facility_id] = facility.model_copy(update={"capacity": capacity})
+
+    def covering(self, zip_code: int) -> list[Facility]:
+        # a dict keeps facilities with overlapping ranges once, in tree order
+        found: dict[str, None] = {}
+        if self._root is not None and self._root.max_zip_code >= zip_code:
+            _stab(self._root, zip_code, found)
+        return [self._facilities[facility_id] for facility_id in found]
+
+    @staticmethod
+    def _keys(facility: Facility) -> set[RangeKey]:
+        return {(zip_range.min_zip_code, zip_range.max_zip_code, facility.id) for zip_range in facility.zip_code_ranges}
+
+
+class FacilityZipIndex:
+    """Process-wide ZipRangeIndex per care type.
+
+    Care types are loaded lazily from the repository on first use and kept current by the
+    facility endpoints through `upsert` and `remove`.
+    """
+
+    def __init__(self):
+        self._indexes: dict[CareType, ZipRangeIndex] = {}
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, care_type: CareType) -> ZipRangeIndex | None:
+        return self._indexes.get(care_type)
+
+    def find(self, facility_id: str) -> Facility | None:
+        """The facility as indexed under any loaded care type."""
+        for index in self._indexes.values():
+            facility = index.get(facility_id)
+            if facility is not None:
+                return facility
+        return None
+
+    def load(self, care_type: CareType, facilities: Iterable[Facility], generation: int | None = None) -> ZipRangeIndex:
+        index = ZipRangeIndex(facilities)
+        # a write that landed while the facilities were being read makes them stale, use them once only
+        if generation is None or generation == self._generation:
+            self._indexes[care_type] = index
+        return index
+
+    def upsert(self, facility: Facility) -> None:
+        self._generation += 1
+        for care_type, index in self._indexes.items():
+            if care_type in facility.care_types:
+                index.upsert(facility)
+            else:
+                index.remove(facility.id)
+
+    def remove(self, facility_id: str) -> None:
+        self._generation += 1
+        for index in self._indexes.values():
+            index.remove(facility_id)
+
+    def set_capacity(self, facility_ids: Iterable[str], capacity: CapacityType) -> None:
+        self._generation += 1
+        for facility_id in facility_ids:
+            for index in self._indexes.values():
+                index.set_capacity(facility_id, capacity)
+
+    def invalidate(self, care_type: CareType) -> None:
+        """Drop a care type so it is reloaded on next use, for writes too large to apply one by one."""
+        self._generation += 1
+        self._indexes.pop(care_type, None)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._indexes.clear()
+
+
+facility_zip_index = FacilityZipIndex()
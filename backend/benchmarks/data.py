@@ -0,0 +1,119 @@
+"""Synthetic, reproducible facilities, zip code ranges and patients for the benchmarks."""
+
+import argparse
+import random
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import insert, make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.models.capacity_type import CapacityType
+from app.domain.models.care_type import CareType
+from app.infrastructure.database.models import CareTypeModel
+from app.infrastructure.database.models import Facility as FacilityModel
+from app.infrastructure.database.models import FacilityCareType
+from app.infrastructure.database.models import Patient as PatientModel
+from app.infrastructure.database.models import ZipCodeRange as ZipCodeRangeModel
+
+SCALES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+MIN_ZIP_CODE = 10000
+MAX_ZIP_CODE = 99999
+# rows per INSERT executemany, keeps the parameter lists of the drivers small
+INSERT_BATCH_SIZE = 5000
+
+
+def add_database_url_arguments(parser: argparse.ArgumentParser, **kwargs) -> None:
+    """--database-url for scripts that drop and recreate all tables, and the flag that allows it beyond SQLite."""
+    parser.add_argument("--database-url", **kwargs)
+    parser.add_argument(
+        "--yes-drop-tables", action="store_true", help="allow dropping all tables of a --database-url other than SQLite"
+    )
+
+
+def check_database_url(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if make_url(args.database_url).get_backend_name() != "sqlite" and not args.yes_drop_tables:
+        parser.error(f"all tables of {args.database_url} would be dropped, pass --yes-drop-tables to go ahead")
+
+
+@dataclass(frozen=True)
+class Dataset:
+    facility_ids: list[str]
+    # (care type, zip code) of every patient, in insertion order
+    patients: list[tuple[CareType, str]]
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def facility_rows(count: int, ranges: int, rng: random.Random, care_type_ids: dict[CareType, uuid.UUID]):
+    """Facilities spread over the zip code space, 80% available, each with 1-3 care types and `ranges` zip code
+    ranges around its own zip code."""
+    facilities, care_types, zip_code_ranges = [], [], []
+    for i in range(count):
+        facility_id = _uuid(rng)
+        zip_code = rng.randint(MIN_ZIP_CODE, MAX_ZIP_CODE)
+        facilities.append(
+            {
+                "id": facility_id,
+                "name": f"Facility {i}",
+                "facility_zip_code": str(zip_code),
+                "capacity_status": CapacityType.AVAILABLE if rng.random() < 0.8 else CapacityType.FULL,
+            }
+        )
+        care_types.extend(
+            {"id": _uuid(rng), "facility_id": facility_id, "care_type_id": care_type_ids[care_type]}
+            for care_type in rng.sample(list(CareType), rng.randint(1, len(CareType)))
+        )
+        for _ in range(ranges):
+            min_zip_code = max(MIN_ZIP_CODE, zip_code - rng.randint(0, 2000))
+            zip_code_ranges.append(
+                {
+                    "id": _uuid(rng),
+                    "facility_id": facility_id,
+                    "min_zip_code": min_zip_code,
+                    "max_zip_code": min(MAX_ZIP_CODE, min_zip_code + rng.randint(100, 4000)),
+                }
+            )
+    return facilities, care_types, zip_code_ranges
+
+
+def patient_rows(count: int, rng: random.Random) -> list[dict]:
+    care_types = list(CareType)
+    return [
+        {
+            "id": _uuid(rng),
+            "name": f"Patient {i}",
+            "care_type": rng.choice(care_types),
+            "zip_code": str(rng.randint(MIN_ZIP_CODE, MAX_ZIP_CODE)),
+        }
+        for i in range(count)
+    ]
+
+
+async def _insert(session: AsyncSession, model, rows: list[dict]) -> None:
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        await session.execute(insert(model), rows[start : start + INSERT_BATCH_SIZE])
+
+
+async def seed(session: AsyncSession, facilities: int, patients: int, ranges: int = 3, seed: int = 0) -> Dataset:
+    """Insert the dataset into empty tables and commit. The same arguments always produce the same rows."""
+    rng = random.Random(seed)
+    care_type_ids = {care_type: _uuid(rng) for care_type in CareType}
+    await _insert(session, CareTypeModel, [{"id": id, "name": care_type} for care_type, id in care_type_ids.items()])
+
+    facility_data, care_type_data, zip_code_range_data = facility_rows(facilities, ranges, rng, care_type_ids)
+    await _insert(session, FacilityModel, facility_data)
+    await _insert(session, FacilityCareType, care_type_data)
+    await _insert(session, ZipCodeRangeModel, zip_code_range_data)
+
+    patient_data = patient_rows(patients, rng)
+    await _insert(session, PatientModel, patient_data)
+    await session.commit()
+
+    return Dataset(
+        facility_ids=[str(row["id"]) for row in facility_data],
+        patients=[(row["care_type"], row["zip_code"]) for row in patient_data],
+    )
@@ -0,0 +1,155 @@
+"""Compare the async, validating row-to-domain mapping with the synchronous trusted one on large lists.
+
+python -m benchmarks.domain_mapping --rows 10000 --ranges 10 --repeat 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from types import SimpleNamespace
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.models.capacity_type import CapacityType
+from app.domain.models.care_type import CareType
+from app.domain.models.facility import Facility
+from app.domain.models.patient import Patient
+from app.domain.models.zip_code_range import ZipCodeRange
+from app.infrastructure.database.base import Base
+from app.infrastructure.database.models import Patient as PatientModel
+from app.infrastructure.repositories.facility_repository import FacilityRepository
+from app.infrastructure.repositories.patient_repository import PatientRepository
+from benchmarks.data import add_database_url_arguments, check_database_url
+
+
+async def seed_patients(session: AsyncSession, rows: int) -> None:
+    care_types = list(CareType)
+    await session.execute(
+        insert(PatientModel),
+        [
+            {
+                "id": uuid.uuid4(),
+                "name": f"Patient {i}",
+                "care_type": care_types[i % len(care_types)],
+                "zip_code": str(10000 + (i * 37) % 80000),
+            }
+            for i in range(rows)
+        ],
+    )
+    await session.commit()
+
+
+def make_facility_rows(rows: int, ranges: int) -> list[tuple]:
+    # (facility row, care types, zip code range rows) as FacilityRepository._fetch has them
+    result = []
+    for i in range(rows):
+        facility_id = uuid.uuid4()
+        zip_code = 10000 + (i * 37) % 80000
+        row = SimpleNamespace(
+            id=facility_id,
+            name=f"Facility {i}",
+            capacity_status=CapacityType.AVAILABLE,
+            facility_zip_code=str(zip_code),
+        )
+        zip_code_ranges = [
+            SimpleNamespace(
+                id=uuid.uuid4(),
+                facility_id=facility_id,
+                min_zip_code=zip_code + r * 100,
+                max_zip_code=zip_code + r * 100 + 99,
+            )
+            for r in range(ranges)
+        ]
+        result.append((row, list(CareType), zip_code_ranges))
+    return result
+
+
+async def validated_patient(db_obj) -> Patient:
+    # the mapping before: a coroutine per row and full validation
+    return Patient(id=str(db_obj.id), name=db_obj.name, care_type=db_obj.care_type, zip_code=db_obj.zip_code)
+
+
+async def async_validated_patients(session: AsyncSession, rows: int) -> list:
+    result = await session.execute(select(PatientModel).where(PatientModel.deleted_at.is_(None)).limit(rows))
+    patients = [await validated_patient(obj) for obj in result.scalars().all()]
+    session.expunge_all()
+    return patients
+
+
+async def trusted_patients(session: AsyncSession, rows: int) -> list:
+    return await PatientRepository(session).get_all(limit=rows)
+
+
+async def validated_facility(row, care_types, zip_code_ranges) -> Facility:
+    facility_id = str(row.id)
+    return Facility(
+        id=facility_id,
+        name=row.name,
+        capacity=row.capacity_status,
+        zip_code=row.facility_zip_code,
+        care_types=care_types,
+        zip_code_ranges=[
+            ZipCodeRange(
+                id=str(zip_range.id),
+                facility_id=facility_id,
+                min_zip_code=zip_range.min_zip_code,
+                max_zip_code=zip_range.max_zip_code,
+            )
+            for zip_range in zip_code_ranges
+        ],
+    )
+
+
+async def async_validated_facilities(rows: list[tuple]) -> list:
+    return [await validated_facility(*row) for row in rows]
+
+
+async def trusted_facilities(rows: list[tuple]) -> list:
+    return [FacilityRepository._row_to_domain(*row) for row in rows]
+
+
+async def measure(read, repeat: int) -> tuple[float, int]:
+    timings, count = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        count = len(await read())
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000, count
+
+
+async def main(database_url: str, rows: int, ranges: int, repeat: int) -> None:
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        await seed_patients(session, rows)
+
+    print(f"{rows} patients read from {engine.dialect.name}, median of {repeat}")
+    async with session_factory() as session:
+        for name, read in (("async, validated", async_validated_patients), ("sync, trusted", trusted_patients)):
+            elapsed_ms, count = await measure(lambda: read(session, rows), repeat)
+            print(f"  {name:<20} {elapsed_ms:9.2f} ms  ({count} patients)")
+    await engine.dispose()
+
+    facility_rows = make_facility_rows(rows, ranges)
+    print(f"{rows} facility rows x {len(CareType)} care types x {ranges} zip ranges mapped, median of {repeat}")
+    for name, read in (("async, validated", async_validated_facilities), ("sync, trusted", trusted_facilities)):
+        elapsed_ms, count = await measure(lambda: read(facility_rows), repeat)
+        print(f"  {name:<20} {elapsed_ms:9.2f} ms  ({count} facilities)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_database_url_arguments(parser, default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--ranges", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    check_database_url(parser, args)
+    asyncio.run(main(args.database_url, args.rows, args.ranges, args.repeat))
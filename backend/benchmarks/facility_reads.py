@@ -0,0 +1,122 @@
+"""Compare the joined-eager ORM facility read path with the batched row mapper.
+
+python -m benchmarks.facility_reads --facilities 2000 --ranges 10 --repeat 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from app.domain.models.care_type import CareType
+from app.infrastructure.database.base import Base
+from app.infrastructure.database.models import CareTypeModel
+from app.infrastructure.database.models import Facility as FacilityModel
+from app.infrastructure.database.models import FacilityCareType
+from app.infrastructure.database.models import ZipCodeRange as ZipCodeRangeModel
+from app.infrastructure.repositories.facility_repository import FacilityRepository
+from benchmarks.data import add_database_url_arguments, check_database_url
+
+
+async def seed(session: AsyncSession, facilities: int, ranges: int) -> None:
+    care_type_ids = {care_type: uuid.uuid4() for care_type in CareType}
+    await session.execute(
+        insert(CareTypeModel), [{"id": id, "name": care_type} for care_type, id in care_type_ids.items()]
+    )
+
+    facility_rows, care_type_rows, range_rows = [], [], []
+    for i in range(facilities):
+        facility_id = uuid.uuid4()
+        zip_code = 10000 + (i * 37) % 80000
+        facility_rows.append(
+            {
+                "id": facility_id,
+                "name": f"Facility {i}",
+                "facility_zip_code": str(zip_code),
+                "capacity_status": "AVAILABLE",
+            }
+        )
+        care_type_rows.extend(
+            {"id": uuid.uuid4(), "facility_id": facility_id, "care_type_id": care_type_id}
+            for care_type_id in care_type_ids.values()
+        )
+        range_rows.extend(
+            {
+                "id": uuid.uuid4(),
+                "facility_id": facility_id,
+                "min_zip_code": zip_code + r * 100,
+                "max_zip_code": zip_code + r * 100 + 99,
+            }
+            for r in range(ranges)
+        )
+
+    await session.execute(insert(FacilityModel), facility_rows)
+    await session.execute(insert(FacilityCareType), care_type_rows)
+    await session.execute(insert(ZipCodeRangeModel), range_rows)
+    await session.commit()
+
+
+async def joined_eager_get_all(session: AsyncSession, limit: int) -> list:
+    # the read path before the batched row mapper
+    repository = FacilityRepository(session)
+    stmt = (
+        select(FacilityModel)
+        .where(FacilityModel.deleted_at.is_(None))
+        .options(
+            joinedload(FacilityModel.care_types).joinedload(FacilityCareType.care_type),
+            joinedload(FacilityModel.zip_code_ranges),
+        )
+        .limit(limit)
+    )
+    result = await session.execute(stmt)
+    return [repository._to_domain(obj) for obj in result.unique().scalars().all()]
+
+
+async def batched_get_all(session: AsyncSession, limit: int) -> list:
+    return await FacilityRepository(session).get_all(limit=limit)
+
+
+async def measure(session_factory, read, limit: int, repeat: int) -> tuple[float, int]:
+    timings, count = [], 0
+    for _ in range(repeat):
+        # fresh session per run, nothing may come from the identity map
+        async with session_factory() as session:
+            started = time.perf_counter()
+            facilities = await read(session, limit)
+            timings.append(time.perf_counter() - started)
+            count = len(facilities)
+    return statistics.median(timings) * 1000, count
+
+
+async def main(database_url: str, facilities: int, ranges: int, repeat: int) -> None:
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        await seed(session, facilities, ranges)
+
+    print(f"{facilities} facilities x {len(CareType)} care types x {ranges} zip ranges, median of {repeat}")
+    for name, read in (("joinedload + ORM", joined_eager_get_all), ("batched rows", batched_get_all)):
+        elapsed_ms, count = await measure(session_factory, read, facilities, repeat)
+        print(f"  {name:<20} {elapsed_ms:9.1f} ms  ({count} facilities)")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_database_url_arguments(parser, default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--facilities", type=int, default=2000)
+    parser.add_argument("--ranges", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    check_database_url(parser, args)
+    asyncio.run(main(args.database_url, args.facilities, args.ranges, args.repeat))
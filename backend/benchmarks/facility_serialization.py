@@ -0,0 +1,85 @@
+"""Compare FastAPI's response_model serialization of facility lists with the direct JSON bytes path.
+
+python -m benchmarks.facility_serialization --facilities 1000 --ranges 10 --repeat 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.api.v1.responses import facilities_json
+from app.api.v1.schemas.facility import FacilityResponse
+from app.domain.models.capacity_type import CapacityType
+from app.domain.models.care_type import CareType
+from app.domain.models.facility import Facility
+from app.domain.models.zip_code_range import ZipCodeRange
+
+
+def make_facilities(facilities: int, ranges: int) -> list[Facility]:
+    result = []
+    for i in range(facilities):
+        facility_id = str(uuid.uuid4())
+        zip_code = 10000 + (i * 37) % 80000
+        result.append(
+            Facility(
+                id=facility_id,
+                name=f"Facility {i}",
+                capacity=CapacityType.AVAILABLE,
+                zip_code=str(zip_code),
+                care_types=list(CareType),
+                zip_code_ranges=[
+                    ZipCodeRange(
+                        id=str(uuid.uuid4()),
+                        facility_id=facility_id,
+                        min_zip_code=zip_code + r * 100,
+                        max_zip_code=zip_code + r * 100 + 99,
+                    )
+                    for r in range(ranges)
+                ],
+            )
+        )
+    return result
+
+
+async def response_model_body(facilities: list[Facility]) -> bytes:
+    # what FastAPI does with `response_model=list[FacilityResponse]`: validate, dump to python, json.dumps
+    field = create_model_field("Response", list[FacilityResponse], mode="serialization")
+    content = await serialize_response(field=field, response_content=facilities)
+    return JSONResponse(content).body
+
+
+async def direct_body(facilities: list[Facility]) -> bytes:
+    return facilities_json(facilities)
+
+
+async def measure(serialize, facilities: list[Facility], repeat: int) -> tuple[float, int]:
+    timings, size = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = await serialize(facilities)
+        timings.append(time.perf_counter() - started)
+        size = len(body)
+    return statistics.median(timings) * 1000, size
+
+
+async def main(facilities: int, ranges: int, repeat: int) -> None:
+    items = make_facilities(facilities, ranges)
+    print(f"{facilities} facilities x {len(CareType)} care types x {ranges} zip ranges, median of {repeat}")
+    for name, serialize in (("response_model", response_model_body), ("direct JSON bytes", direct_body)):
+        elapsed_ms, size = await measure(serialize, items, repeat)
+        print(f"  {name:<20} {elapsed_ms:9.2f} ms  ({size} bytes)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--facilities", type=int, default=1000)
+    parser.add_argument("--ranges", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.facilities, args.ranges, args.repeat))
@@ -0,0 +1,350 @@
+"""Load-test a running server and report latency percentiles and the highest sustainable request rate.
+
+python -m benchmarks.load seed --database-url sqlite+aiosqlite:///./load.db --scale 10k
+DATABASE_URL=sqlite+aiosqlite:///./load.db uvicorn app.main:app --workers 4
+python -m benchmarks.load run --concurrency 64 --duration 30
+python -m benchmarks.load run --rps 200 --rps-step 200 --p99-ms 100
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.domain.models.care_type import CareType
+from app.infrastructure.database.base import Base
+from benchmarks.data import MAX_ZIP_CODE, MIN_ZIP_CODE, SCALES, add_database_url_arguments, check_database_url, seed
+
+PERCENTILES = (50, 90, 95, 99, 99.9)
+
+
+class LatencyHistogram:
+    """Latencies in microseconds, bucketed like an HDR histogram: every value keeps `significant_digits`
+    digits, so the relative error stays below 10^(1 - significant_digits) at any magnitude and the memory
+    grows with the number of magnitudes, not with the number of requests."""
+
+    def __init__(self, significant_digits: int = 3):
+        self.exact_below = 10**significant_digits
+        self.counts: Counter[int] = Counter()
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def _magnitude(self, value: int) -> int:
+        magnitude = 1
+        while value >= self.exact_below * magnitude:
+            magnitude *= 10
+        return magnitude
+
+    def record(self, value: int) -> None:
+        value = max(int(value), 0)
+        self.counts[value - value % self._magnitude(value)] += 1
+        self.min = value if self.count == 0 else min(self.min, value)
+        self.max = max(self.max, value)
+        self.count += 1
+        self.total += value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        if other.count:
+            self.min = other.min if self.count == 0 else min(self.min, other.min)
+        self.counts.update(other.counts)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def value_at(self, percentile: float) -> int:
+        """The highest value equivalent to the one at the percentile."""
+        if not self.count:
+            return 0
+        rank = max(1, math.ceil(percentile / 100 * self.count))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(bucket + self._magnitude(bucket) - 1, self.max)
+        return self.max
+
+    def distribution(self) -> list[tuple[float, int, int]]:
+        """(percentile, value, count at or below it) at halving steps towards 100, as HDR histograms print them."""
+        rows, percentile = [], 0.0
+        while percentile < 100 * (1 - 1 / max(self.count, 1)):
+            value = self.value_at(percentile)
+            rows.append((percentile, value, sum(count for bucket, count in self.counts.items() if bucket <= value)))
+            percentile = 100 - (100 - percentile) / 2
+        rows.append((100.0, self.max, self.count))
+        return rows
+
+
+@dataclass
+class StepResult:
+    target_rps: float | None
+    concurrency: int
+    duration_s: float
+    requests: int
+    errors: int
+    achieved_rps: float
+    mean_ms: float
+    max_ms: float
+    percentiles_ms: dict[str, float]
+    statuses: dict[str, int]
+
+
+def weights(value: str) -> dict[str, float]:
+    """Parse "match=9,facilities=1" into {"match": 9.0, "facilities": 1.0}."""
+    result = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        result[name.strip()] = float(weight or 1)
+    return result
+
+
+class Workload:
+    """Requests with patients' zip codes drawn from a Zipf distribution over `hot_zips` zip codes: the zip code
+    of rank r comes up in proportion to 1 / r^s, so a few zips get most of the traffic like in a real city."""
+
+    def __init__(
+        self,
+        endpoints: dict[str, float],
+        care_types: dict[str, float],
+        hot_zips: int,
+        zipf_s: float,
+        facilities_limit: int,
+        seed: int,
+    ):
+        unknown = set(endpoints) - {"match", "facilities"}
+        if unknown:
+            raise ValueError(f"unknown endpoints {', '.join(sorted(unknown))}, choose from match, facilities")
+        self.rng = random.Random(seed)
+        self.endpoints, self.endpoint_weights = list(endpoints), list(itertools.accumulate(endpoints.values()))
+        self.care_types = [CareType(care_type) for care_type in care_types]
+        self.care_type_weights = list(itertools.accumulate(care_types.values()))
+        self.zip_codes = [
+            str(zip_code) for zip_code in self.rng.sample(range(MIN_ZIP_CODE, MAX_ZIP_CODE + 1), hot_zips)
+        ]
+        self.zip_weights = list(itertools.accumulate(1 / rank**zipf_s for rank in range(1, hot_zips + 1)))
+        self.facilities_limit = facilities_limit
+
+    def next(self) -> tuple[str, str, str, dict | None]:
+        """(endpoint, method, path, JSON body)"""
+        endpoint = self.rng.choices(self.endpoints, cum_weights=self.endpoint_weights)[0]
+        if endpoint == "facilities":
+            return endpoint, "GET", f"{settings.API_V1_STR}/facilities?limit={self.facilities_limit}", None
+        body = {
+            "patient_name": "Load test",
+            "care_type": self.rng.choices(self.care_types, cum_weights=self.care_type_weights)[0],
+            "zip_code": self.rng.choices(self.zip_codes, cum_weights=self.zip_weights)[0],
+        }
+        return endpoint, "POST", f"{settings.API_V1_STR}/facility-matching/match-facility", body
+
+
+class Recorder:
+    def __init__(self):
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self.statuses: Counter[str] = Counter()
+        self.errors = 0
+        self.last_completed = 0.0
+
+    async def send(self, client: httpx.AsyncClient, workload: Workload, started: float) -> None:
+        """`started` is when the request was due, so time spent waiting for a free connection counts too and a
+        slow server cannot hide its latency by slowing the load down (coordinated omission)."""
+        endpoint, method, path, body = workload.next()
+        try:
+            response = await client.request(method, path, json=body)
+            status = str(response.status_code)
+        except httpx.HTTPError as error:
+            status = type(error).__name__
+        completed = time.perf_counter()
+        self.last_completed = max(self.last_completed, completed)
+        self.statuses[status] += 1
+        if not status.startswith("2"):
+            self.errors += 1
+            return
+        self.histograms.setdefault(endpoint, LatencyHistogram()).record((completed - started) * 1_000_000)
+
+    def result(self, target_rps: float | None, concurrency: int, started: float) -> StepResult:
+        histogram = LatencyHistogram()
+        for endpoint_histogram in self.histograms.values():
+            histogram.merge(endpoint_histogram)
+        duration = max(self.last_completed - started, 1e-9)
+        requests = histogram.count + self.errors
+        return StepResult(
+            target_rps=target_rps,
+            concurrency=concurrency,
+            duration_s=round(duration, 3),
+            requests=requests,
+            errors=self.errors,
+            achieved_rps=round(requests / duration, 1),
+            mean_ms=round(histogram.mean / 1000, 3),
+            max_ms=round(histogram.max / 1000, 3),
+            percentiles_ms={f"p{percentile:g}": histogram.value_at(percentile) / 1000 for percentile in PERCENTILES},
+            statuses=dict(self.statuses),
+        )
+
+
+async def closed_loop(client: httpx.AsyncClient, workload: Workload, concurrency: int, duration: float) -> Recorder:
+    """`concurrency` clients, each sending its next request as soon as the previous one is answered."""
+    recorder = Recorder()
+    deadline = time.perf_counter() + duration
+
+    async def client_loop():
+        while (started := time.perf_counter()) < deadline:
+            await recorder.send(client, workload, started)
+
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    return recorder
+
+
+async def open_loop(
+    client: httpx.AsyncClient, workload: Workload, rps: float, concurrency: int, duration: float
+) -> Recorder:
+    """Requests at a fixed rate whatever the latency, at most `concurrency` in flight."""
+    recorder = Recorder()
+    in_flight = asyncio.Semaphore(concurrency)
+    start = time.perf_counter()
+
+    async def send(due: float):
+        async with in_flight:
+            await recorder.send(client, workload, due)
+
+    tasks = []
+    for i in range(int(rps * duration)):
+        due = start + i / rps
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(due)))
+    await asyncio.gather(*tasks)
+    return recorder
+
+
+def print_step(result: StepResult, sustainable: bool | None = None) -> None:
+    target = f"{result.target_rps:8.0f} rps target, " if result.target_rps is not None else ""
+    percentiles = "  ".join(f"{name} {value:8.2f} ms" for name, value in result.percentiles_ms.items())
+    verdict = "" if sustainable is None else ("  ok" if sustainable else "  not sustained")
+    print(
+        f"{target}{result.achieved_rps:8.1f} rps achieved, {result.requests} requests, {result.errors} errors  "
+        f"{percentiles}{verdict}"
+    )
+
+
+def print_histogram(name: str, histogram: LatencyHistogram) -> None:
+    print(
+        f"\n{name}: {histogram.count} requests, mean {histogram.mean / 1000:.3f} ms, max {histogram.max / 1000:.3f} ms"
+    )
+    print(f"{'Value (ms)':>12} {'Percentile':>12} {'TotalCount':>11} {'1/(1-Percentile)':>17}")
+    for percentile, value, count in histogram.distribution():
+        inverse = f"{1 / (1 - percentile / 100):17.2f}" if percentile < 100 else f"{'inf':>17}"
+        print(f"{value / 1000:12.3f} {percentile / 100:12.6f} {count:11d} {inverse}")
+
+
+async def run(args: argparse.Namespace) -> None:
+    workload = Workload(
+        weights(args.endpoints), weights(args.care_types), args.hot_zips, args.zipf_s, args.facilities_limit, args.seed
+    )
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results = []
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        if args.warmup:
+            await closed_loop(client, workload, args.concurrency, args.warmup)
+
+        if args.rps is None:
+            started = time.perf_counter()
+            recorder = await closed_loop(client, workload, args.concurrency, args.duration)
+            results.append(recorder.result(None, args.concurrency, started))
+            print_step(results[-1])
+        else:
+            # raise the rate step by step until the server falls behind, errors or misses the p99 target
+            rps, sustained = args.rps, None
+            while args.max_rps is None or rps <= args.max_rps:
+                started = time.perf_counter()
+                recorder = await open_loop(client, workload, rps, args.concurrency, args.duration)
+                result = recorder.result(rps, args.concurrency, started)
+                sustainable = (
+                    result.achieved_rps >= 0.95 * rps
+                    and result.errors <= args.max_error_rate * result.requests
+                    and (args.p99_ms is None or result.percentiles_ms["p99"] <= args.p99_ms)
+                )
+                results.append(result)
+                print_step(result, sustainable)
+                if not sustainable or not args.rps_step:
+                    break
+                sustained = result
+                rps += args.rps_step
+            if args.rps_step:
+                print(f"\nmax sustainable rate: {f'{sustained.target_rps:.0f} rps' if sustained else 'none'}")
+
+    for endpoint, histogram in recorder.histograms.items():
+        print_histogram(f"{endpoint} (last step)" if len(results) > 1 else endpoint, histogram)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({"args": vars(args), "steps": [asdict(r) for r in results]}, indent=2))
+        print(f"\nresults written to {args.output}")
+
+
+async def seed_database(args: argparse.Namespace) -> None:
+    engine = create_async_engine(args.database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    async with sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        await seed(session, SCALES[args.scale], args.patients, ranges=args.ranges, seed=args.seed)
+    await engine.dispose()
+    print(f"seeded {SCALES[args.scale]} facilities into {engine.dialect.name}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="drop all tables of the database and fill it with synthetic data")
+    add_database_url_arguments(seed_parser, required=True)
+    seed_parser.add_argument("--scale", choices=SCALES, default="10k", help="number of facilities")
+    seed_parser.add_argument("--patients", type=int, default=0)
+    seed_parser.add_argument("--ranges", type=int, default=3, help="zip code ranges per facility")
+    seed_parser.add_argument("--seed", type=int, default=0)
+
+    run_parser = commands.add_parser("run", help="send requests to a running server")
+    run_parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    run_parser.add_argument("--endpoints", default="match=1", help='weighted mix, e.g. "match=9,facilities=1"')
+    run_parser.add_argument("--care-types", default="ambulatory=5,stationary=4,day_care=1")
+    run_parser.add_argument("--hot-zips", type=int, default=1000, help="distinct patient zip codes")
+    run_parser.add_argument("--zipf-s", type=float, default=1.1, help="skew of the zip codes, 0 is uniform")
+    run_parser.add_argument("--facilities-limit", type=int, default=100)
+    run_parser.add_argument("--concurrency", type=int, default=32, help="connections, and requests in flight")
+    run_parser.add_argument("--duration", type=float, default=30, help="seconds per run or rate step")
+    run_parser.add_argument("--warmup", type=float, default=5, help="seconds of closed-loop load first")
+    run_parser.add_argument("--rps", type=float, help="send at this fixed rate instead of as fast as answered")
+    run_parser.add_argument("--rps-step", type=float, help="raise --rps by this after every sustained step")
+    run_parser.add_argument("--max-rps", type=float)
+    run_parser.add_argument("--p99-ms", type=float, help="a step with a higher p99 is not sustained")
+    run_parser.add_argument("--max-error-rate", type=float, default=0.01)
+    run_parser.add_argument("--timeout", type=float, default=10)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--output", help="write the steps as JSON")
+
+    args = parser.parse_args()
+    if args.command == "seed":
+        check_database_url(seed_parser, args)
+    elif args.rps is not None and args.max_rps is not None and args.rps > args.max_rps:
+        run_parser.error(f"--rps {args.rps:g} is above --max-rps {args.max_rps:g}, no step would run")
+    asyncio.run(seed_database(args) if args.command == "seed" else run(args))
+
+
+if __name__ == "__main__":
+    main()
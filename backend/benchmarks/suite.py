@@ -0,0 +1,466 @@
+"""Benchmark the repository, use case, mapping and HTTP layers on synthetic data and store the results as JSON.
+
+python -m benchmarks.suite run --scale 10k --output benchmark-results/before.json
+python -m benchmarks.suite compare benchmark-results/before.json benchmark-results/after.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import AsyncExitStack
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.responses import facilities_json
+from app.core.config import settings
+from app.domain.models.capacity_type import CapacityType
+from app.domain.models.care_type import CareType
+from app.domain.models.facility import Facility
+from app.infrastructure.database.base import Base
+from app.infrastructure.database.session import (
+    get_db_session,
+    get_read_db_session,
+    get_stream_session_factory,
+    transaction,
+)
+from app.infrastructure.repositories.facility_repository import FacilityRepository
+from app.infrastructure.repositories.patient_repository import PatientRepository
+from app.use_cases.match_facility import MatchFacilityUseCase
+from app.use_cases.match_rules import MAX_MATCH_DISTANCE
+from app.use_cases.match_table import FacilityMatchTables
+from app.use_cases.zip_range_index import FacilityZipIndex
+from benchmarks.data import SCALES, Dataset, add_database_url_arguments, check_database_url, seed
+
+GROUPS = ("repository", "use_case", "mapping", "http")
+# requests per timed run of the use case and batch cases
+BATCH = 100
+MATCH_MODES = ("sql", "zip_index", "match_table")
+
+
+@dataclass
+class Case:
+    group: str
+    name: str
+    run: Callable[[], Awaitable]
+    # awaited after every run, outside the timing, e.g. to roll back what the run wrote
+    reset: Callable[[], Awaitable] | None = None
+
+
+@dataclass
+class Result:
+    group: str
+    name: str
+    runs: int
+    min_ms: float
+    median_ms: float
+    mean_ms: float
+    p95_ms: float
+    max_ms: float
+    stdev_ms: float
+
+
+async def measure(case: Case, repeat: int, warmup: int) -> Result:
+    timings = []
+    for run in range(warmup + repeat):
+        started = time.perf_counter()
+        await case.run()
+        elapsed = time.perf_counter() - started
+        if case.reset is not None:
+            await case.reset()
+        if run >= warmup:
+            timings.append(elapsed * 1000)
+
+    timings.sort()
+    return Result(
+        group=case.group,
+        name=case.name,
+        runs=repeat,
+        min_ms=timings[0],
+        median_ms=statistics.median(timings),
+        mean_ms=statistics.fmean(timings),
+        p95_ms=timings[min(len(timings) - 1, round(0.95 * (len(timings) - 1)))],
+        max_ms=timings[-1],
+        stdev_ms=statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    )
+
+
+def cycling(items):
+    """The next item on every call, so repeated runs do not all hit the same row."""
+    return itertools.cycle(items).__next__
+
+
+def batches(items, size: int = BATCH):
+    return cycling([items[start : start + size] for start in range(0, max(len(items) - size, 0) + 1, size)])
+
+
+async def drain(rows) -> int:
+    count = 0
+    async for _ in rows:
+        count += 1
+    return count
+
+
+def repository_cases(session: AsyncSession, dataset: Dataset) -> list[Case]:
+    facilities = FacilityRepository(session)
+    patients = PatientRepository(session)
+    facility_id = cycling(dataset.facility_ids)
+    facility_ids = batches(dataset.facility_ids)
+    patient = cycling(
+        [(care_type, zip_code) for care_type, zip_code in dataset.patients if care_type != CareType.day_care]
+    )
+
+    async def find_match_candidates():
+        care_type, zip_code = patient()
+        return await facilities.find_match_candidates(care_type, int(zip_code), max_distance=MAX_MATCH_DISTANCE)
+
+    async def update():
+        current = await facilities.get_by_id(dataset.facility_ids[0])
+        return await facilities.update(current.id, current.model_copy(update={"name": "Renamed"}), current=current)
+
+    async def create():
+        facility = Facility(name="New", zip_code="50000", capacity=CapacityType.AVAILABLE, care_types=list(CareType))
+        return await facilities.create_with_zip_ranges(facility, [{"min_zip_code": 49000, "max_zip_code": 51000}])
+
+    def case(name: str, run, reset=None) -> Case:
+        return Case("repository", name, run, reset)
+
+    return [
+        case("facilities.get_by_id", lambda: facilities.get_by_id(facility_id())),
+        case(f"facilities.get_by_ids x{BATCH}", lambda: facilities.get_by_ids(facility_ids())),
+        case("facilities.get_updated_at", lambda: facilities.get_updated_at(facility_id())),
+        case("facilities.get_table_version", facilities.get_table_version),
+        case(f"facilities.get_all limit={BATCH}", lambda: facilities.get_all(limit=BATCH)),
+        case(f"facilities.get_page limit={BATCH}", lambda: facilities.get_page(limit=BATCH)),
+        case("facilities.get_by_zip_code", lambda: facilities.get_by_zip_code(patient()[1])),
+        case("facilities.get_by_capacity full", lambda: facilities.get_by_capacity(CapacityType.FULL)),
+        case("facilities.get_by_care_type", lambda: facilities.get_by_care_type(CareType.ambulatory)),
+        case("facilities.find_match_candidates", find_match_candidates),
+        case("facilities.stream_all", lambda: drain(facilities.stream_all())),
+        case(
+            f"facilities.set_capacity x{BATCH}",
+            lambda: facilities.set_capacity(facility_ids(), CapacityType.FULL),
+            session.rollback,
+        ),
+        case("facilities.update", update, session.rollback),
+        case("facilities.create_with_zip_ranges", create, session.rollback),
+        case(f"patients.get_all limit={BATCH}", lambda: patients.get_all(limit=BATCH)),
+        case("patients.get_chunk limit=1000", lambda: patients.get_chunk(1000)),
+    ]
+
+
+def use_case_cases(session: AsyncSession, dataset: Dataset) -> list[Case]:
+    requests = batches(dataset.patients)
+    cases = []
+    for mode in MATCH_MODES:
+        # warmup runs load the zip indexes and build the match tables, the timed runs only match
+        use_case = MatchFacilityUseCase(
+            FacilityRepository(session),
+            zip_index=FacilityZipIndex() if mode != "sql" else None,
+            match_tables=FacilityMatchTables() if mode == "match_table" else None,
+        )
+
+        async def execute(use_case=use_case):
+            return [await use_case.execute(care_type, zip_code) for care_type, zip_code in requests()]
+
+        async def execute_many(use_case=use_case):
+            return await use_case.execute_many(requests())
+
+        async def find_candidates(use_case=use_case):
+            return [await use_case.find_candidates(care_type, zip_code, top_k=5) for care_type, zip_code in requests()]
+
+        cases += [
+            Case("use_case", f"execute[{mode}] x{BATCH}", execute),
+            Case("use_case", f"execute_many[{mode}] x{BATCH}", execute_many),
+            Case("use_case", f"find_candidates[{mode}] top_k=5 x{BATCH}", find_candidates),
+        ]
+
+    async def load_zip_index():
+        return await MatchFacilityUseCase(FacilityRepository(session), zip_index=FacilityZipIndex())._get_index(
+            CareType.ambulatory
+        )
+
+    index = None
+
+    async def build_match_table():
+        nonlocal index
+        if index is None:
+            index = await load_zip_index()
+        return FacilityMatchTables().get(CareType.ambulatory, index)
+
+    cases += [
+        Case("use_case", "load zip index", load_zip_index),
+        Case("use_case", "build match table", build_match_table),
+    ]
+    return cases
+
+
+async def mapping_cases(session: AsyncSession) -> list[Case]:
+    # rows are fetched once, the runs only map them
+    facilities = FacilityRepository(session)
+    rows = (await session.execute(facilities._select_facilities())).all()
+    care_types, zip_code_ranges = await facilities._fetch_associations([row.id for row in rows])
+    domain_facilities = facilities._rows_to_facilities(rows, care_types, zip_code_ranges)
+
+    patients = PatientRepository(session)
+    patient_rows = (await session.execute(patients._select_rows())).all()
+
+    async def map_facilities():
+        return facilities._rows_to_facilities(rows, care_types, zip_code_ranges)
+
+    async def map_patients():
+        return patients._rows_to_domain(patient_rows)
+
+    async def serialize_facilities():
+        return facilities_json(domain_facilities)
+
+    return [
+        Case("mapping", f"facility rows x{len(rows)}", map_facilities),
+        Case("mapping", f"patient rows x{len(patient_rows)}", map_patients),
+        Case("mapping", f"facilities_json x{len(rows)}", serialize_facilities),
+    ]
+
+
+async def http_cases(client: httpx.AsyncClient, dataset: Dataset) -> list[Case]:
+    api = settings.API_V1_STR
+    facility_id = cycling(dataset.facility_ids)
+    patient = cycling(dataset.patients)
+    requests = batches(dataset.patients)
+
+    async def send(method: str, url: str, **kwargs) -> httpx.Response:
+        response = await client.request(method, url, **kwargs)
+        if response.status_code >= 400:
+            response.raise_for_status()
+        return response
+
+    # revalidations of facilities the client has seen before
+    tagged = cycling(
+        [(id, (await send("GET", f"{api}/facilities/{id}")).headers["etag"]) for id in dataset.facility_ids[:BATCH]]
+    )
+
+    async def get_facility_not_modified():
+        id, tag = tagged()
+        return await send("GET", f"{api}/facilities/{id}", headers={"If-None-Match": tag})
+
+    def match_request(care_type, zip_code) -> dict:
+        return {"patient_name": "Patient", "care_type": care_type, "zip_code": zip_code}
+
+    def case(name: str, run) -> Case:
+        return Case("http", name, run)
+
+    return [
+        case(f"GET /facilities limit={BATCH}", lambda: send("GET", f"{api}/facilities", params={"limit": BATCH})),
+        case("GET /facilities/{id}", lambda: send("GET", f"{api}/facilities/{facility_id()}")),
+        case("GET /facilities/{id} 304", get_facility_not_modified),
+        case(
+            "POST /facility-matching/match-facility",
+            lambda: send("POST", f"{api}/facility-matching/match-facility", json=match_request(*patient())),
+        ),
+        case(
+            f"POST /facility-matching/match-facilities x{BATCH}",
+            lambda: send(
+                "POST",
+                f"{api}/facility-matching/match-facilities",
+                json=[match_request(*request) for request in requests()],
+            ),
+        ),
+        case(f"GET /patients limit={BATCH}", lambda: send("GET", f"{api}/patients", params={"limit": BATCH})),
+    ]
+
+
+def http_client(session_factory: sessionmaker) -> httpx.AsyncClient:
+    """The application with all its middleware, in process, on the benchmark database."""
+    from app.main import app
+
+    async def db_session():
+        # committed like get_db_session, with the after_commit callbacks
+        async with session_factory() as session:
+            async with transaction(session):
+                yield session
+
+    async def read_db_session():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db_session] = db_session
+    app.dependency_overrides[get_read_db_session] = read_db_session
+    app.dependency_overrides[get_stream_session_factory] = lambda: session_factory
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark")
+
+
+def check_batches(results: list[Result]) -> list[str]:
+    """execute_many must take less than the same BATCH matches made one by one with execute."""
+    medians = {result.name: result.median_ms for result in results if result.group == "use_case"}
+    failures = []
+    for mode in MATCH_MODES:
+        single = medians.get(f"execute[{mode}] x{BATCH}")
+        batch = medians.get(f"execute_many[{mode}] x{BATCH}")
+        if single is not None and batch is not None and batch >= single:
+            failures.append(f"execute_many[{mode}] x{BATCH} took {batch:.2f} ms, {BATCH} x execute {single:.2f} ms")
+    return failures
+
+
+def git_commit() -> str | None:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        status = subprocess.run(["git", "status", "--porcelain"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit.stdout.strip() + ("-dirty" if status.stdout.strip() else "")
+
+
+async def run(args: argparse.Namespace) -> int:
+    """Exits 1 when a batch case is not faster than its single case, see check_batches."""
+    facilities = SCALES[args.scale]
+    patients = args.patients if args.patients is not None else facilities
+    engine = create_async_engine(args.database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    started = time.perf_counter()
+    async with session_factory() as session:
+        dataset = await seed(session, facilities, patients, ranges=args.ranges, seed=args.seed)
+    print(
+        f"seeded {facilities} facilities x {args.ranges} zip ranges and {patients} patients into "
+        f"{engine.dialect.name} in {time.perf_counter() - started:.1f} s"
+    )
+
+    results = []
+    async with AsyncExitStack() as stack:
+        session = await stack.enter_async_context(session_factory())
+        client = await stack.enter_async_context(http_client(session_factory))
+        cases = {
+            "repository": lambda: repository_cases(session, dataset),
+            "use_case": lambda: use_case_cases(session, dataset),
+            "mapping": lambda: mapping_cases(session),
+            "http": lambda: http_cases(client, dataset),
+        }
+        for group in args.groups:
+            group_cases = cases[group]()
+            if asyncio.iscoroutine(group_cases):
+                group_cases = await group_cases
+            for case in group_cases:
+                if args.filter and args.filter not in case.name:
+                    continue
+                result = await measure(case, args.repeat, args.warmup)
+                results.append(result)
+                print(f"  {group:<11} {case.name:<48} {result.median_ms:10.2f} ms  (p95 {result.p95_ms:.2f} ms)")
+            await session.rollback()
+    await engine.dispose()
+
+    commit = git_commit()
+    output = Path(args.output or f"benchmark-results/{commit or 'unknown'}-{args.scale}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps(
+            {
+                "meta": {
+                    "commit": commit,
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "scale": args.scale,
+                    "facilities": facilities,
+                    "zip_code_ranges_per_facility": args.ranges,
+                    "patients": patients,
+                    "seed": args.seed,
+                    "database": f"{engine.dialect.name}+{engine.dialect.driver}",
+                    "repeat": args.repeat,
+                    "warmup": args.warmup,
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                },
+                "results": [asdict(result) for result in results],
+            },
+            indent=2,
+        )
+        + "\n"
+    )
+    print(f"results written to {output}")
+
+    failures = check_batches(results)
+    for failure in failures:
+        print(f"batch slower than single calls: {failure}")
+    return 1 if failures else 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    """Median of every case in both files, slower than `threshold` counts as a regression."""
+    base, head = (json.loads(Path(path).read_text()) for path in (args.base, args.head))
+    for key in ("scale", "database", "patients", "zip_code_ranges_per_facility"):
+        if base["meta"].get(key) != head["meta"].get(key):
+            print(f"warning: {key} differs, {base['meta'].get(key)} vs {head['meta'].get(key)}")
+
+    head_results = {(result["group"], result["name"]): result for result in head["results"]}
+    print(f"{'case':<62} {base['meta']['commit'] or 'base':>12} {head['meta']['commit'] or 'head':>12}   change")
+    regressions = 0
+    for result in base["results"]:
+        key = (result["group"], result["name"])
+        if key not in head_results:
+            continue
+        before, after = result["median_ms"], head_results.pop(key)["median_ms"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > args.threshold:
+            flag = "  regression"
+            regressions += 1
+        elif change < -args.threshold:
+            flag = "  improvement"
+        print(f"{key[0] + ' ' + key[1]:<62} {before:9.2f} ms {after:9.2f} ms  {change:+7.1%}{flag}")
+    for group, name in head_results:
+        print(f"{group + ' ' + name:<62} {'-':>12} {head_results[group, name]['median_ms']:9.2f} ms  new")
+
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser(
+        "run", help="seed a fresh database, run the benchmarks and write the results, exits 1 on slow batches"
+    )
+    run_parser.add_argument("--scale", choices=SCALES, default="1k", help="number of facilities")
+    run_parser.add_argument("--patients", type=int, help="number of patients, the scale by default")
+    run_parser.add_argument("--ranges", type=int, default=3, help="zip code ranges per facility")
+    run_parser.add_argument("--seed", type=int, default=0)
+    add_database_url_arguments(
+        run_parser,
+        default="sqlite+aiosqlite:///:memory:",
+        help="all tables of this database are dropped first, e.g. postgresql+asyncpg://localhost/benchmark",
+    )
+    run_parser.add_argument("--groups", type=lambda value: value.split(","), default=list(GROUPS))
+    run_parser.add_argument("--filter", help="only the cases whose name contains this")
+    run_parser.add_argument("--repeat", type=int, default=10)
+    run_parser.add_argument("--warmup", type=int, default=1)
+    run_parser.add_argument("--output", help="benchmark-results/<commit>-<scale>.json by default")
+
+    compare_parser = commands.add_parser("compare", help="compare two result files, exits 1 on regressions")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("head")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="relative median change, 0.1 = 10%%")
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        sys.exit(compare(args))
+    check_database_url(run_parser, args)
+    unknown = set(args.groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"unknown groups {', '.join(sorted(unknown))}, choose from {', '.join(GROUPS)}")
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+import csv
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1 import export
+from app.core.config import settings
+from app.infrastructure.cache.cache_backend import cache_backend
+from app.infrastructure.repositories.pagination import encode_cursor
+
+
+def create_test_facility(client: TestClient, name: str, zip_code_ranges: list[tuple[int, int]]) -> str:
+    response = client.post(
+        "/api/v1/facilities",
+        json={
+            "name": name,
+            "zip_code": "10000",
+            "capacity": "available",
+            "care_types": ["ambulatory", "stationary"],
+            "zip_code_ranges": [{"min_zip_code": low, "max_zip_code": high} for low, high in zip_code_ranges],
+        },
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_get_facilities_pages_by_facility_not_by_joined_row(client: TestClient):
+    created = {
+        create_test_facility(client, f"Facility {i}", [(10000 + i, 10100 + i), (20000 + i, 20100 + i), (30000, 30001)])
+        for i in range(5)
+    }
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+        response = client.get("/api/v1/facilities", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert all(len(facility["zip_code_ranges"]) == 3 for facility in page)
+        assert all(len(facility["care_types"]) == 2 for facility in page)
+        seen.extend(facility["id"] for facility in page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            assert len(page) <= 2
+            break
+        assert len(page) == 2
+
+    assert len(seen) == len(set(seen))
+    assert set(seen) == created
+
+
+@pytest.mark.asyncio
+async def test_get_facilities_pages_with_skip_in_cursor_order(client: TestClient):
+    for i in range(5):
+        create_test_facility(client, f"Facility {i}", [(10000 + i, 10100 + i)])
+
+    ordered = [facility["id"] for facility in client.get("/api/v1/facilities").json()]
+    seen = []
+    for skip in range(0, 6, 2):
+        response = client.get("/api/v1/facilities", params={"skip": skip, "limit": 2})
+        assert response.status_code == 200
+        seen.extend(facility["id"] for facility in response.json())
+
+    assert seen == ordered
+    assert len(seen) == 5
+
+
+@pytest.mark.asyncio
+async def test_get_facilities_rejects_cursor_without_a_uuid(client: TestClient):
+    response = client.get("/api/v1/facilities", params={"cursor": encode_cursor("abc")})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_facilities_skips_deleted(client: TestClient):
+    kept = create_test_facility(client, "Kept", [(10000, 10100)])
+    deleted = create_test_facility(client, "Deleted", [(10000, 10100)])
+    assert client.delete(f"/api/v1/facilities/{deleted}").status_code == 200
+
+    response = client.get("/api/v1/facilities")
+    assert [facility["id"] for facility in response.json()] == [kept]
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_export_facilities_streams_ndjson_and_csv(client: TestClient, monkeypatch):
+    monkeypatch.setattr(export, "EXPORT_CHUNK_ROWS", 2)
+    created = {
+        create_test_facility(client, f"Facility {i}", [(10000 + i, 10100 + i), (30000, 30001)]) for i in range(5)
+    }
+    deleted = create_test_facility(client, "Deleted", [(10000, 10100)])
+    assert client.delete(f"/api/v1/facilities/{deleted}").status_code == 200
+
+    response = client.get("/api/v1/facilities/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == len(created)
+    assert {row["id"] for row in rows} == created
+    assert all(row == client.get(f"/api/v1/facilities/{row['id']}").json() for row in rows)
+
+    response = client.get("/api/v1/facilities/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="facilities.csv"'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert {row["id"] for row in rows} == created
+    assert all(row["care_types"] == "ambulatory|stationary" for row in rows)
+    assert {row["zip_code_ranges"] for row in rows} == {f"{10000 + i}-{10100 + i}|30000-30001" for i in range(5)}
+
+
+@pytest.mark.asyncio
+async def test_csv_export_imports_back(client: TestClient):
+    for i in range(3):
+        create_test_facility(client, f"Facility, {i}", [(10000 + i, 10100 + i), (30000, 30001)])
+    exported = client.get("/api/v1/facilities/export", params={"format": "csv"}).text
+
+    response = client.post("/api/v1/facilities/import", content=exported, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200
+    assert response.json() == {"imported": 3, "failed": 0, "errors": []}
+
+    def without_id(facility: dict) -> dict:
+        return {key: value for key, value in facility.items() if key != "id"}
+
+    facilities = [without_id(facility) for facility in client.get("/api/v1/facilities").json()]
+    assert len(facilities) == 6
+    assert all(facilities.count(facility) == 2 for facility in facilities)
+
+
+@pytest.mark.asyncio
+async def test_facility_reads_answer_conditional_requests(client: TestClient):
+    facility_id = create_test_facility(client, "Facility", [(10000, 10100)])
+
+    for url, capacity in [("/api/v1/facilities", "full"), (f"/api/v1/facilities/{facility_id}", "available")]:
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.headers["Cache-Control"] == settings.FACILITY_HTTP_CACHE_CONTROL
+        tag = response.headers["ETag"]
+
+        response = client.get(url, headers={"If-None-Match": tag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == tag
+        assert client.get(url, headers={"If-None-Match": f'"other", W/{tag}'}).status_code == 304
+
+        assert client.put(f"/api/v1/facilities/{facility_id}", json={"capacity": capacity}).status_code == 200
+        response = client.get(url, headers={"If-None-Match": tag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != tag
+
+    list_tag = client.get("/api/v1/facilities").headers["ETag"]
+    assert client.get("/api/v1/facilities", params={"limit": 1}).headers["ETag"] != list_tag
+
+
+@pytest.mark.asyncio
+async def test_update_facility_writes_only_the_diff(client: TestClient):
+    facility_id = create_test_facility(client, "Updated", [(10000, 10100), (20000, 20100)])
+
+    response = client.put(
+        f"/api/v1/facilities/{facility_id}",
+        json={
+            "capacity": "full",
+            "zip_code": "10050",
+            "care_types": ["ambulatory", "day_care"],
+            "zip_code_ranges": [
+                {"min_zip_code": 10000, "max_zip_code": 10100},
+                {"min_zip_code": 30000, "max_zip_code": 30100},
+            ],
+        },
+    )
+    assert response.status_code == 200
+    updated = response.json()
+
+    stored = client.get(f"/api/v1/facilities/{facility_id}").json()
+    assert stored == updated
+    assert stored["capacity"] == "full"
+    assert stored["zip_code"] == "10050"
+    assert stored["care_types"] == ["ambulatory", "day_care"]
+    assert [(zr["min_zip_code"], zr["max_zip_code"]) for zr in stored["zip_code_ranges"]] == [
+        (10000, 10100),
+        (30000, 30100),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_update_facility_lists_care_types_in_declaration_order(client: TestClient):
+    facility_id = create_test_facility(client, "Ordered", [(10000, 10100)])
+
+    response = client.put(f"/api/v1/facilities/{facility_id}", json={"care_types": ["day_care", "stationary"]})
+    assert response.json()["care_types"] == ["stationary", "day_care"]
+    assert client.get(f"/api/v1/facilities/{facility_id}").json()["care_types"] == ["stationary", "day_care"]
+
+
+@pytest.mark.asyncio
+async def test_cached_care_type_listing_follows_writes(client: TestClient, monkeypatch):
+    monkeypatch.setattr(settings, "FACILITY_CACHE_ENABLED", True)
+    facility_id = create_test_facility(client, "Cached", [(10000, 10100)])
+
+    assert [f["capacity"] for f in client.get("/api/v1/facilities", params={"care_type": "ambulatory"}).json()] == [
+        "available"
+    ]
+    assert await cache_backend.get("facilities:care_type:ambulatory") is not None
+
+    client.patch(f"/api/v1/facilities/{facility_id}/capacity", json={"capacity": "full"})
+    assert await cache_backend.get("facilities:care_type:ambulatory") is None
+    assert [f["capacity"] for f in client.get("/api/v1/facilities", params={"care_type": "ambulatory"}).json()] == [
+        "full"
+    ]
+
+    assert client.delete(f"/api/v1/facilities/{facility_id}").status_code == 200
+    assert client.get("/api/v1/facilities", params={"care_type": "ambulatory"}).json() == []
+
+
+@pytest.mark.asyncio
+async def test_import_facilities_from_json_lines(client: TestClient):
+    body = "\n".join(
+        [
+            '{"name": "North", "zip_code": "10000", "capacity": "available", "care_types": ["ambulatory"], '
+            '"zip_code_ranges": [{"min_zip_code": 9000, "max_zip_code": 11000}]}',
+            "",
+            "not json",
+            '{"name": "Broken range", "zip_code": "10000", "capacity": "available", '
+            '"zip_code_ranges": [{"min_zip_code": 11000, "max_zip_code": 9000}]}',
+            '{"name": "South", "zip_code": "20000", "capacity": "FULL", "care_types": ["stationary", "day_care"]}',
+            '{"zip_code": "20000", "capacity": "unknown"}',
+        ]
+    )
+    response = client.post("/api/v1/facilities/import", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 200
+
+    result = response.json()
+    assert result["imported"] == 2
+    assert result["failed"] == 3
+    assert [error["row"] for error in result["errors"]] == [3, 4, 6]
+
+    facilities = {facility["name"]: facility for facility in client.get("/api/v1/facilities").json()}
+    assert set(facilities) == {"North", "South"}
+    assert facilities["North"]["zip_code_ranges"] == [{"min_zip_code": 9000, "max_zip_code": 11000}]
+    assert sorted(facilities["South"]["care_types"]) == ["day_care", "stationary"]
+    assert facilities["South"]["capacity"] == "full"
+
+
+@pytest.mark.asyncio
+async def test_import_facilities_from_csv(client: TestClient):
+    body = (
+        "name,zip_code,capacity,care_types,zip_code_ranges\r\n"
+        '"Center, East",10000,available,ambulatory|stationary,9000-9999|10000-11000\r\n'
+        "Too few,10000\r\n"
+    )
+    response = client.post("/api/v1/facilities/import", content=body, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200
+    assert response.json() == {"imported": 1, "failed": 1, "errors": [{"row": 3, "error": "expected 5 columns, got 2"}]}
+
+    match = client.post(
+        "/api/v1/facility-matching/match-facility",
+        json={"patient_name": "Test Patient", "care_type": "stationary", "zip_code": "9500"},
+    ).json()
+    assert match["matched"] is True
+    assert match["facility"]["name"] == "Center, East"
+
+
+@pytest.mark.asyncio
+async def test_import_facilities_rejects_csv_without_required_columns(client: TestClient):
+    response = client.post(
+        "/api/v1/facilities/import", content="name,zip_code\nA,10000\n", headers={"Content-Type": "text/csv"}
+    )
+    assert response.status_code == 400
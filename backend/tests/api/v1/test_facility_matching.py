@@ -0,0 +1,239 @@
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.domain.models.capacity_type import CapacityType
+from app.domain.models.care_type import CareType
+from app.use_cases.match_cache import match_cache
+from tests.factories import random_facility
+
+
+@pytest.fixture(
+    autouse=True,
+    params=[
+        (False, False, False),
+        (True, False, False),
+        (False, False, True),
+        (False, True, False),
+        (True, True, False),
+    ],
+    ids=["sql", "zip_index", "match_table", "sql_cached", "zip_index_cached"],
+)
+def match_settings(request, monkeypatch):
+    zip_index_enabled, cache_enabled, match_table_enabled = request.param
+    monkeypatch.setattr(settings, "MATCH_ZIP_INDEX_ENABLED", zip_index_enabled)
+    monkeypatch.setattr(settings, "MATCH_CACHE_ENABLED", cache_enabled)
+    monkeypatch.setattr(settings, "MATCH_TABLE_ENABLED", match_table_enabled)
+    return request.param
+
+
+def create_test_facility(
+    client: TestClient,
+    zip_code: str,
+    zip_code_ranges: list[tuple[int, int]],
+    capacity: CapacityType = CapacityType.AVAILABLE,
+    care_types: list[CareType] | None = None,
+) -> dict:
+    response = client.post(
+        "/api/v1/facilities",
+        json={
+            "name": f"Facility {zip_code}",
+            "zip_code": zip_code,
+            "capacity": capacity.value,
+            "care_types": [care_type.value for care_type in care_types or [CareType.ambulatory]],
+            "zip_code_ranges": [{"min_zip_code": low, "max_zip_code": high} for low, high in zip_code_ranges],
+        },
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def match(client: TestClient, zip_code: str | None, care_type: CareType = CareType.ambulatory, **options) -> dict:
+    response = client.post(
+        "/api/v1/facility-matching/match-facility",
+        json={"patient_name": "Test Patient", "care_type": care_type.value, "zip_code": zip_code, **options},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_match_prefers_nearest_available_facility(client: TestClient):
+    create_test_facility(client, "10000", [(9000, 12000)])
+    nearest = create_test_facility(client, "10900", [(10000, 11000)])
+    create_test_facility(client, "10600", [(10000, 11000)], capacity=CapacityType.FULL)
+
+    result = match(client, "10500")
+    assert result["matched"] is True
+    assert result["facility"]["id"] == nearest["id"]
+
+
+@pytest.mark.asyncio
+async def test_match_ranks_top_k_candidates(client: TestClient):
+    far = create_test_facility(client, "10000", [(9000, 12000)])
+    nearest = create_test_facility(client, "10900", [(10000, 11000)])
+    create_test_facility(client, "10600", [(10000, 11000)], capacity=CapacityType.FULL)
+    middle = create_test_facility(client, "10050", [(10000, 11000)])
+
+    result = match(client, "10500", top_k=2)
+    assert result["facility"]["id"] == nearest["id"]
+    assert [(candidate["facility"]["id"], candidate["distance"]) for candidate in result["candidates"]] == [
+        (nearest["id"], 400),
+        (middle["id"], 450),
+    ]
+
+    result = match(client, "10500", top_k=5, exclude_ids=[nearest["id"]])
+    assert result["facility"]["id"] == middle["id"]
+    assert [candidate["facility"]["id"] for candidate in result["candidates"]] == [middle["id"], far["id"]]
+
+    result = match(client, "10500", exclude_ids=[nearest["id"], middle["id"], far["id"]])
+    assert result == {"matched": False, "facility": None, "candidates": []}
+
+    response = client.post(
+        "/api/v1/facility-matching/match-facilities",
+        json=[
+            {"patient_name": "A", "care_type": "ambulatory", "zip_code": "10500", "top_k": 2},
+            {"patient_name": "B", "care_type": "ambulatory", "zip_code": "10500"},
+        ],
+    )
+    assert response.status_code == 200
+    assert [len(result["candidates"]) for result in response.json()] == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_match_rejects_distant_and_uncovered_zips(client: TestClient):
+    create_test_facility(client, "10000", [(10000, 20000)])
+
+    assert match(client, "15000")["matched"] is False
+    assert match(client, "30000")["matched"] is False
+    assert match(client, None)["matched"] is False
+    assert match(client, "10000", care_type=CareType.day_care)["matched"] is False
+
+
+@pytest.mark.asyncio
+async def test_match_skips_facilities_with_non_numeric_zip_codes(client: TestClient):
+    create_test_facility(client, "10500X", [(10000, 11000)])
+    numeric = create_test_facility(client, "10800", [(10000, 11000)])
+
+    assert match(client, "10500")["facility"]["id"] == numeric["id"]
+    result = match(client, "10500", top_k=2)
+    assert [candidate["facility"]["id"] for candidate in result["candidates"]] == [numeric["id"]]
+
+
+@pytest.mark.asyncio
+async def test_match_follows_facility_writes(client: TestClient):
+    facility = create_test_facility(client, "10000", [(10000, 11000)])
+    assert match(client, "10500")["facility"]["id"] == facility["id"]
+
+    response = client.put(
+        f"/api/v1/facilities/{facility['id']}",
+        json={"zip_code_ranges": [{"min_zip_code": 20000, "max_zip_code": 21000}]},
+    )
+    assert response.status_code == 200
+    assert match(client, "10500")["matched"] is False
+
+    other = create_test_facility(client, "10200", [(10000, 11000)])
+    assert match(client, "10500")["facility"]["id"] == other["id"]
+
+    assert client.delete(f"/api/v1/facilities/{other['id']}").status_code == 200
+    assert match(client, "10500")["matched"] is False
+
+
+@pytest.mark.asyncio
+async def test_match_facilities_returns_results_in_request_order(client: TestClient):
+    ambulatory = create_test_facility(client, "10000", [(9000, 11000)])
+    stationary = create_test_facility(client, "20000", [(19000, 21000)], care_types=[CareType.stationary])
+
+    requests = [
+        {"patient_name": "A", "care_type": "stationary", "zip_code": "20500"},
+        {"patient_name": "B", "care_type": "ambulatory", "zip_code": "10500"},
+        {"patient_name": "C", "care_type": "ambulatory", "zip_code": "50000"},
+        {"patient_name": "D", "care_type": "day_care", "zip_code": "10500"},
+        {"patient_name": "E", "care_type": "ambulatory", "zip_code": None},
+        {"patient_name": "F", "care_type": "ambulatory", "zip_code": "10500"},
+    ]
+    response = client.post("/api/v1/facility-matching/match-facilities", json=requests)
+    assert response.status_code == 200
+
+    results = response.json()
+    assert [result["matched"] for result in results] == [True, True, False, False, False, True]
+    assert results[0]["facility"]["id"] == stationary["id"]
+    assert results[1]["facility"]["id"] == ambulatory["id"]
+    assert results[5]["facility"]["id"] == ambulatory["id"]
+    for request in requests:
+        single = match(client, request["zip_code"], care_type=CareType(request["care_type"]))
+        assert single in results
+
+
+@pytest.mark.asyncio
+async def test_match_facilities_equal_single_matches(client: TestClient):
+    rng = random.Random(5)
+    created = []
+    for _ in range(40):
+        facility = random_facility(rng, care_types=rng.sample(list(CareType), rng.randint(1, 2)))
+        created.append(
+            create_test_facility(
+                client,
+                facility.zip_code,
+                [(zip_range.min_zip_code, zip_range.max_zip_code) for zip_range in facility.zip_code_ranges],
+                capacity=facility.capacity,
+                care_types=facility.care_types,
+            )
+        )
+    # deleted facilities must not match either way
+    for facility in created[:5]:
+        assert client.delete(f"/api/v1/facilities/{facility['id']}").status_code == 200
+
+    requests = [
+        {"patient_name": "P", "care_type": rng.choice(list(CareType)).value, "zip_code": str(rng.randint(9000, 35000))}
+        for _ in range(60)
+    ]
+    response = client.post("/api/v1/facility-matching/match-facilities", json=requests)
+    assert response.status_code == 200
+    assert response.json() == [
+        match(client, request["zip_code"], care_type=CareType(request["care_type"])) for request in requests
+    ]
+
+
+@pytest.mark.asyncio
+async def test_match_follows_capacity_updates(client: TestClient):
+    nearest = create_test_facility(client, "10400", [(10000, 11000)])
+    other = create_test_facility(client, "10000", [(10000, 11000)])
+    assert match(client, "10500")["facility"]["id"] == nearest["id"]
+
+    response = client.patch(f"/api/v1/facilities/{nearest['id']}/capacity", json={"capacity": "full"})
+    assert response.status_code == 200
+    assert response.json() == {"id": nearest["id"], "capacity": "full"}
+    assert match(client, "10500")["facility"]["id"] == other["id"]
+
+    missing = "00000000-0000-0000-0000-000000000000"
+    response = client.patch(
+        "/api/v1/facilities/capacity", json={"ids": [nearest["id"], other["id"], missing], "capacity": "full"}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"capacity": "full", "updated": [nearest["id"], other["id"]], "not_found": [missing]}
+    assert match(client, "10500")["matched"] is False
+
+    response = client.patch("/api/v1/facilities/capacity", json={"ids": [nearest["id"]], "capacity": "available"})
+    assert response.json()["updated"] == [nearest["id"]]
+    assert match(client, "10500")["facility"]["id"] == nearest["id"]
+    assert client.get(f"/api/v1/facilities/{nearest['id']}").json()["capacity"] == "available"
+
+    assert client.patch(f"/api/v1/facilities/{missing}/capacity", json={"capacity": "full"}).status_code == 404
+    assert client.patch("/api/v1/facilities/not-a-uuid/capacity", json={"capacity": "full"}).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_repeated_matches_are_served_from_the_cache(client: TestClient, match_settings):
+    facility = create_test_facility(client, "10000", [(10000, 11000)])
+    hits = match_cache.hits
+
+    assert match(client, "10500")["facility"]["id"] == facility["id"]
+    assert match(client, "10500")["facility"]["id"] == facility["id"]
+    assert match(client, "20000")["matched"] is False
+    assert match(client, "20000")["matched"] is False
+
+    _, cache_enabled, _ = match_settings
+    assert match_cache.hits - hits == (2 if cache_enabled else 0)
@@ -0,0 +1,11 @@
+from fastapi.testclient import TestClient
+
+
+def test_get_metrics(client: TestClient):
+    response = client.get("/api/v1/metrics")
+    assert response.status_code == 200
+
+    metrics = response.json()
+    assert set(metrics["db_pools"]) == {"primary"}
+    assert metrics["db_pools"]["primary"]["capacity"] == 15
+    assert {"hits", "misses"} <= set(metrics["match_cache"])
@@ -1,8 +1,12 @@
+import json
+from uuid import uuid4
+
 import pytest
 from fastapi.testclient import TestClient
 
 from app.domain.models.care_type import CareType
 from app.domain.models.patient import Patient
+from app.infrastructure.repositories.pagination import encode_cursor
 
 
 async def create_test_patient(client: TestClient) -> str:
@@ -27,3 +31,70 @@ async def test_get_patients(client: TestClient):
     assert response.status_code == 200
     assert isinstance(response.json(), list)
     assert len(response.json()) > 0
+
+
+@pytest.mark.asyncio
+async def test_get_patients_cursor_pagination(client: TestClient):
+    created = {await create_test_patient(client) for _ in range(5)}
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+        response = client.get("/api/v1/patients", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 2
+        seen.extend(patient["id"] for patient in page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen))
+    assert set(seen) == created
+
+
+@pytest.mark.asyncio
+async def test_get_patients_pages_with_skip_in_cursor_order(client: TestClient):
+    for _ in range(5):
+        await create_test_patient(client)
+
+    ordered = [patient["id"] for patient in client.get("/api/v1/patients").json()]
+    seen = []
+    for skip in range(0, 6, 2):
+        response = client.get("/api/v1/patients", params={"skip": skip, "limit": 2})
+        assert response.status_code == 200
+        seen.extend(patient["id"] for patient in response.json())
+
+    assert seen == ordered
+    assert len(seen) == 5
+
+
+@pytest.mark.asyncio
+async def test_export_patients(client: TestClient):
+    created = sorted([await create_test_patient(client) for _ in range(3)])
+    assert client.delete(f"/api/v1/patients/{created.pop()}").status_code == 200
+
+    response = client.get("/api/v1/patients/export")
+    assert response.status_code == 200
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == created
+
+    response = client.get("/api/v1/patients/export", params={"format": "csv"})
+    assert response.text.splitlines() == ["name,care_type,zip_code,id"] + [
+        f"Test Patient,ambulatory,12345,{patient_id}" for patient_id in created
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_patients_rejects_invalid_cursor(client: TestClient):
+    response = client.get("/api/v1/patients", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+    response = client.get("/api/v1/patients", params={"cursor": encode_cursor("abc")})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_patients_rejects_cursor_of_missing_row(client: TestClient):
+    response = client.get("/api/v1/patients", params={"cursor": encode_cursor(str(uuid4()))})
+    assert response.status_code == 400
@@ -0,0 +1,33 @@
+import json
+
+from pydantic import TypeAdapter
+
+from app.api.v1.responses import facilities_json, facility_json
+from app.api.v1.schemas.facility import FacilityResponse
+from app.domain.models.capacity_type import CapacityType
+from app.domain.models.care_type import CareType
+from app.domain.models.facility import Facility
+from app.domain.models.zip_code_range import ZipCodeRange
+
+FACILITY_ID = "3fa85f64-5717-4562-b3fc-2c963f66afa6"
+
+
+def test_facility_json_matches_the_response_model():
+    facility = Facility(
+        id=FACILITY_ID,
+        name="Facility",
+        capacity=CapacityType.FULL,
+        zip_code="10000",
+        care_types=[CareType.ambulatory, CareType.day_care],
+        zip_code_ranges=[
+            ZipCodeRange(
+                id="3fa85f64-5717-4562-b3fc-2c963f66afa7", facility_id=FACILITY_ID, min_zip_code=1, max_zip_code=2
+            )
+        ],
+    )
+    expected = TypeAdapter(list[FacilityResponse]).dump_python(
+        TypeAdapter(list[FacilityResponse]).validate_python([facility], from_attributes=True), mode="json"
+    )
+
+    assert json.loads(facilities_json([facility])) == expected
+    assert json.loads(facility_json(facility)) == expected[0]
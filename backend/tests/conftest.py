@@ -1,4 +1,5 @@
 import asyncio
+from contextlib import nullcontext
 from typing import AsyncGenerator
 
 import pytest
@@ -9,8 +10,17 @@ from sqlalchemy.orm import sessionmaker
 
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.infrastructure.cache.cache_backend import cache_backend
 from app.infrastructure.database.base import Base
-from app.infrastructure.database.session import get_db_session
+from app.infrastructure.database.session import (
+    get_db_session,
+    get_read_db_session,
+    get_stream_session_factory,
+    transaction,
+)
+from app.infrastructure.repositories.care_type_cache import care_type_id_cache
+from app.use_cases.match_table import facility_match_tables
+from app.use_cases.zip_range_index import facility_zip_index
 
 # Use SQLite for simplicity
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -24,6 +34,20 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def reset_process_caches():
+    """Every test gets a fresh database, so process-wide caches must not outlive it."""
+    facility_zip_index.clear()
+    facility_match_tables.clear()
+    care_type_id_cache.clear()
+    cache_backend.clear()
+    yield
+    facility_zip_index.clear()
+    facility_match_tables.clear()
+    care_type_id_cache.clear()
+    cache_backend.clear()
+
+
 @pytest.fixture(scope="function")
 async def db_engine():
     """Create a test database engine."""
@@ -67,11 +91,17 @@ def test_app(db_session):
     app = FastAPI()
     app.include_router(api_router, prefix=settings.API_V1_STR)
 
-    # Override the dependency
+    # Override the dependency, writes commit like they do with get_db_session
     async def get_test_db():
+        async with transaction(db_session):
+            yield db_session
+
+    async def get_test_read_db():
         yield db_session
 
     app.dependency_overrides[get_db_session] = get_test_db
+    app.dependency_overrides[get_read_db_session] = get_test_read_db
+    app.dependency_overrides[get_stream_session_factory] = lambda: lambda: nullcontext(db_session)
 
     return app
 
@@ -0,0 +1,52 @@
+import random
+import uuid
+from typing import Sequence
+
+from app.domain.models.capacity_type import CapacityType
+from app.domain.models.care_type import CareType
+from app.domain.models.facility import Facility
+from app.domain.models.zip_code_range import ZipCodeRange
+
+
+def make_facility(
+    ranges: Sequence[tuple[int, int]] = (),
+    care_types: Sequence[CareType] = (CareType.ambulatory,),
+    zip_code: str | None = None,
+    capacity: CapacityType = CapacityType.AVAILABLE,
+    facility_id: str | None = None,
+) -> Facility:
+    """A facility with an id, located at the start of its first range unless zip_code is given."""
+    facility_id = facility_id or str(uuid.uuid4())
+    return Facility(
+        id=facility_id,
+        name="Facility",
+        capacity=capacity,
+        zip_code=zip_code or (str(ranges[0][0]) if ranges else "10000"),
+        care_types=list(care_types),
+        zip_code_ranges=[
+            ZipCodeRange(id=str(uuid.uuid4()), facility_id=facility_id, min_zip_code=low, max_zip_code=high)
+            for low, high in ranges
+        ],
+    )
+
+
+def random_facility(
+    rng: random.Random,
+    facility_id: str | None = None,
+    care_types: Sequence[CareType] = (CareType.ambulatory,),
+    min_ranges: int = 1,
+) -> Facility:
+    """Up to 3 ranges in 10000-34000, a third of the facilities full and few distinct zip codes, so that
+    distance ties happen."""
+    facility_id = facility_id or str(uuid.UUID(int=rng.getrandbits(128)))
+    ranges = []
+    for _ in range(rng.randint(min_ranges, 3)):
+        low = rng.randint(10000, 30000)
+        ranges.append((low, low + rng.randint(0, 4000)))
+    return make_facility(
+        ranges,
+        care_types=care_types,
+        zip_code=str(rng.randrange(10000, 32000, 500)),
+        capacity=rng.choice([CapacityType.AVAILABLE, CapacityType.AVAILABLE, CapacityType.FULL]),
+        facility_id=facility_id,
+    )
@@ -0,0 +1,90 @@
+import asyncio
+
+from app.infrastructure.cache.backend import InMemoryCacheBackend
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def test_values_expire_and_least_recently_used_is_evicted():
+    clock = FakeClock()
+    backend = InMemoryCacheBackend(max_entries=2, clock=clock)
+    await backend.set("a", "1", ttl_seconds=10)
+    await backend.set("b", "2", ttl_seconds=20)
+    assert await backend.get("a") == "1"
+    await backend.set("c", "3", ttl_seconds=20)
+
+    assert await backend.get("b") is None
+    assert backend.evictions == 1
+
+    clock.now = 10
+    assert await backend.get("a") is None
+    assert await backend.get("c") == "3"
+
+
+async def test_index_range_is_inclusive_and_ordered_by_score():
+    backend = InMemoryCacheBackend()
+    for member, score in [("c", 30), ("a", 10), ("b", 20), ("b2", 20)]:
+        await backend.index_add("index", member, score)
+    await backend.index_add("index", "a", 25)
+
+    assert await backend.index_range("index", 20, 30) == ["b", "b2", "a", "c"]
+    assert await backend.index_range("index", 21, 29) == ["a"]
+
+    await backend.index_remove("index", ["b", "missing"])
+    assert await backend.index_range("index") == ["b2", "a", "c"]
+    await backend.delete(["index"])
+    assert await backend.index_range("index") == []
+
+
+async def test_values_leave_their_indexes_when_evicted_or_expired():
+    clock = FakeClock()
+    backend = InMemoryCacheBackend(max_entries=2, clock=clock)
+    for key, ttl in [("a", 10), ("b", 20), ("c", 20)]:
+        await backend.set(key, "1", ttl_seconds=ttl)
+        await backend.index_add("index", key, 0)
+        await backend.index_add(f"index:{key}", key, 0)
+    assert await backend.index_range("index") == ["b", "c"]
+    assert await backend.index_range("index:a") == []
+
+    clock.now = 20
+    assert await backend.get("b") is None
+    assert await backend.index_range("index") == ["c"]
+    assert backend._indexes.keys() == {"index", "index:c"}
+    assert backend._memberships.keys() == {"c"}
+
+
+async def test_indexes_expire_after_their_last_add():
+    clock = FakeClock()
+    backend = InMemoryCacheBackend(clock=clock)
+    await backend.index_add("index", "a", 0, ttl_seconds=10)
+    clock.now = 5
+    await backend.index_add("index", "b", 0, ttl_seconds=10)
+
+    clock.now = 10
+    assert await backend.index_range("index") == ["a", "b"]
+    clock.now = 15
+    assert await backend.index_range("index") == []
+    assert not backend._memberships
+
+
+async def test_published_messages_reach_subscribers():
+    backend = InMemoryCacheBackend()
+    received = []
+
+    async def listen():
+        async for message in backend.subscribe("channel"):
+            received.append(message)
+
+    listener = asyncio.create_task(listen())
+    await asyncio.sleep(0)
+    await backend.publish("channel", "hello")
+    await asyncio.sleep(0)
+    listener.cancel()
+
+    assert received == ["hello"]
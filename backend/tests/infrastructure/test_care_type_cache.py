@@ -0,0 +1,75 @@
+from sqlalchemy import event, func, select
+
+from app.domain.models.capacity_type import CapacityType
+from app.domain.models.care_type import CareType
+from app.domain.models.facility import Facility
+from app.infrastructure.cache.backend import InMemoryCacheBackend
+from app.infrastructure.database.models import CareTypeModel
+from app.infrastructure.database.session import transaction
+from app.infrastructure.repositories.care_type_cache import CareTypeIdCache
+from app.infrastructure.repositories.facility_repository import FacilityRepository
+
+
+def new_facility(name: str) -> Facility:
+    return Facility(
+        name=name,
+        capacity=CapacityType.AVAILABLE,
+        zip_code="10000",
+        care_types=[CareType.ambulatory, CareType.stationary],
+    )
+
+
+async def test_warm_creates_every_care_type_once(db_session):
+    cache = CareTypeIdCache()
+    await cache.warm(db_session)
+    await cache.warm(db_session)
+
+    count = await db_session.scalar(select(func.count()).select_from(CareTypeModel))
+    assert count == len(CareType)
+
+
+async def test_facility_writes_skip_care_type_lookups_once_warm(db_session, db_engine):
+    cache = CareTypeIdCache()
+    repository = FacilityRepository(db_session, care_type_ids=cache)
+    await repository.create_with_zip_ranges(new_facility("First"), [])
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        created = await repository.create_with_zip_ranges(new_facility("Second"), [])
+    finally:
+        event.remove(db_engine.sync_engine, "before_cursor_execute", record)
+
+    assert sorted(created.care_types) == [CareType.ambulatory, CareType.stationary]
+    care_type_lookups = [
+        statement for statement in statements if "FROM care_types" in statement or "INTO care_types" in statement
+    ]
+    assert not care_type_lookups
+
+
+async def test_care_type_ids_of_a_rolled_back_upsert_are_not_cached(db_session):
+    cache = CareTypeIdCache()
+    await cache.get_ids(db_session, [CareType.ambulatory])
+    await db_session.rollback()
+
+    [care_type_id] = await cache.get_ids(db_session, [CareType.ambulatory])
+    await db_session.commit()
+
+    stored = await db_session.scalar(select(CareTypeModel.id).where(CareTypeModel.name == CareType.ambulatory))
+    assert care_type_id == stored
+    assert await cache.get_ids(db_session, [CareType.ambulatory]) == [stored]
+
+
+async def test_care_type_listings_are_dropped_once_the_write_commits(db_session):
+    cache = InMemoryCacheBackend()
+    repository = FacilityRepository(db_session, cache=cache)
+    await repository.get_by_care_type(CareType.ambulatory)
+
+    async with transaction(db_session):
+        await repository.create_with_zip_ranges(new_facility("New"), [])
+        assert await cache.get("facilities:care_type:ambulatory") is not None
+    assert await cache.get("facilities:care_type:ambulatory") is None
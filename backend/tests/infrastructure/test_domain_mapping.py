@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+
+from app.domain.models.base import CustomBaseModel
+from app.domain.models.capacity_type import CapacityType
+from app.domain.models.care_type import CareType
+from app.domain.models.facility import Facility
+from app.domain.models.patient import Patient
+from app.infrastructure.repositories.facility_repository import FacilityRepository
+from app.infrastructure.repositories.patient_repository import PatientRepository
+
+
+class Event(CustomBaseModel):
+    name: str
+    at: datetime | None = None
+
+
+def test_datetime_fields_are_collected_once_per_class():
+    assert Event._datetime_fields == ("at",)
+    assert Patient._datetime_fields == ()
+
+
+def test_naive_datetimes_become_utc():
+    assert Event(name="event", at=datetime(2024, 1, 1)).at == datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert Event(name="event").at is None
+
+
+async def test_patient_rows_map_like_validated_patients(db_session):
+    repository = PatientRepository(db_session)
+    created = await repository.create(Patient(name="Patient", care_type="Stationary", zip_code="10001"))
+
+    read = await repository.get_by_id(created.id)
+    assert read == Patient.model_validate(read.model_dump()) == created
+    assert read.care_type is CareType.stationary
+    assert await repository.get_all() == [created]
+    assert await repository.get_by_care_type(CareType.stationary) == [created]
+
+
+async def test_facility_rows_map_like_validated_facilities(db_session):
+    repository = FacilityRepository(db_session)
+    created = await repository.create_with_zip_ranges(
+        Facility(name="Facility", zip_code="10000", capacity=CapacityType.AVAILABLE, care_types=[CareType.ambulatory]),
+        [{"min_zip_code": 9000, "max_zip_code": 12000}],
+    )
+
+    read = await repository.get_by_id(created.id)
+    assert read == Facility.model_validate(read.model_dump())
+    assert read.capacity is CapacityType.AVAILABLE
+    assert read.care_types == [CareType.ambulatory]
+    assert read.zip_code_ranges[0].facility_id == created.id
@@ -0,0 +1,45 @@
+import asyncio
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.infrastructure.database.pool import create_pooled_engine, pool_metrics
+
+
+async def test_pool_metrics_track_checkouts_and_waits(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    engine = create_pooled_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}")
+    metrics = pool_metrics(engine)
+
+    async def hold_connection():
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            await asyncio.sleep(0.05)
+
+    await asyncio.gather(hold_connection(), hold_connection())
+    snapshot = metrics.snapshot()
+    await engine.dispose()
+
+    assert snapshot["capacity"] == 1
+    assert snapshot["checkouts"] == 2
+    assert snapshot["in_use"] == 0
+    assert snapshot["max_in_use"] == 1
+    # the second checkout waited for the first connection to come back
+    assert snapshot["checkout_wait_max_ms"] >= 40
+
+
+async def test_null_pool_mode(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_NULL_POOL", True)
+    engine = create_pooled_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}")
+
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+        assert pool_metrics(engine).snapshot()["in_use"] == 1
+    await engine.dispose()
+
+    snapshot = pool_metrics(engine).snapshot()
+    assert snapshot["capacity"] is None
+    assert snapshot["utilisation"] is None
+    assert snapshot["checkouts"] == 1
+    assert snapshot["in_use"] == 0
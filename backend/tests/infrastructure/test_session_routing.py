@@ -0,0 +1,96 @@
+from functools import partial
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, Integer, MetaData, Table, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.infrastructure.database import session as session_module
+from app.infrastructure.database.session import (
+    READ_PRIMARY_COOKIE,
+    after_commit,
+    get_db_session,
+    get_read_db_session,
+    read_only_session_factory,
+    transaction,
+)
+
+metadata = MetaData()
+items = Table("items", metadata, Column("id", Integer, primary_key=True))
+
+
+@pytest.fixture
+async def routed_client(tmp_path, monkeypatch):
+    engines = {}
+    for name in ("primary", "replica"):
+        engines[name] = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db")
+        async with engines[name].begin() as connection:
+            await connection.run_sync(metadata.create_all)
+    monkeypatch.setattr(session_module, "async_session_factory", sessionmaker(engines["primary"], class_=AsyncSession))
+    monkeypatch.setattr(session_module, "primary_read_session_factory", read_only_session_factory(engines["primary"]))
+    monkeypatch.setattr(session_module, "read_session_factory", read_only_session_factory(engines["replica"]))
+
+    app = FastAPI()
+
+    @app.get("/items")
+    async def read(session: AsyncSession = Depends(get_read_db_session)):
+        return {"database": session.bind.url.database.rsplit("/", 1)[-1]}
+
+    @app.get("/items/isolation-level")
+    async def isolation_level(session: AsyncSession = Depends(get_read_db_session)):
+        rows = len((await session.execute(select(items))).all())
+        connection = await session.connection()
+        return {"isolation_level": connection.sync_connection.get_execution_options()["isolation_level"], "rows": rows}
+
+    @app.post("/items")
+    async def write(session: AsyncSession = Depends(get_db_session)):
+        await session.execute(insert(items))
+
+    @app.post("/items/count")
+    async def count(session: AsyncSession = Depends(get_db_session)):
+        return len((await session.execute(select(items))).all())
+
+    # the cookie is Secure, so it only comes back over https
+    with TestClient(app, base_url="https://testserver") as client:
+        yield client
+    for engine in engines.values():
+        await engine.dispose()
+
+
+async def test_reads_go_to_the_replica_until_the_client_writes(routed_client: TestClient):
+    assert routed_client.get("/items").json() == {"database": "replica.db"}
+
+    response = routed_client.post("/items/count")
+    assert READ_PRIMARY_COOKIE not in response.cookies
+
+    response = routed_client.post("/items")
+    assert READ_PRIMARY_COOKIE in response.cookies
+    cookie = response.headers["set-cookie"].lower()
+    assert "samesite=none" in cookie and "secure" in cookie
+    assert routed_client.get("/items").json() == {"database": "primary.db"}
+
+
+async def test_read_sessions_run_without_a_transaction(routed_client: TestClient):
+    routed_client.post("/items")
+    # pinned to the primary after the write, the row is there without any commit on the read side
+    response = routed_client.get("/items/isolation-level")
+    assert response.json() == {"isolation_level": "AUTOCOMMIT", "rows": 1}
+
+
+async def test_after_commit_callbacks_run_only_once_the_transaction_commits(db_session):
+    calls = []
+
+    async def record(outcome: str) -> None:
+        calls.append(outcome)
+
+    with pytest.raises(RuntimeError):
+        async with transaction(db_session):
+            after_commit(db_session, partial(record, "rolled back"))
+            raise RuntimeError
+
+    async with transaction(db_session):
+        after_commit(db_session, partial(record, "committed"))
+        assert calls == []
+    assert calls == ["committed"]
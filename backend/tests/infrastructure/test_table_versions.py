@@ -0,0 +1,32 @@
+import pytest
+
+from app.domain.models.capacity_type import CapacityType
+from app.domain.models.facility import Facility
+from app.infrastructure.database.session import transaction
+from app.infrastructure.repositories.facility_repository import FacilityRepository
+
+
+def new_facility() -> Facility:
+    return Facility(name="Versioned", capacity=CapacityType.AVAILABLE, zip_code="10000")
+
+
+async def test_version_is_bumped_once_the_write_commits(db_session):
+    repository = FacilityRepository(db_session)
+    before = await repository.get_table_version()
+
+    async with transaction(db_session):
+        await repository.create_with_zip_ranges(new_facility(), [])
+        # the write transaction does not touch the version row
+        assert await repository.get_table_version() == before
+    assert await repository.get_table_version() > before
+
+
+async def test_rolled_back_writes_keep_the_version(db_session):
+    repository = FacilityRepository(db_session)
+    before = await repository.get_table_version()
+
+    with pytest.raises(RuntimeError):
+        async with transaction(db_session):
+            await repository.create_with_zip_ranges(new_facility(), [])
+            raise RuntimeError
+    assert await repository.get_table_version() == before
@@ -0,0 +1,42 @@
+from sqlalchemy import create_mock_engine, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.infrastructure.database.base import Base
+from app.infrastructure.database.models import ZipCodeRange, zip_code_values, zip_range_covers
+
+
+def compile_coverage(dialect) -> str:
+    stmt = select(ZipCodeRange.id).where(zip_range_covers(12345, dialect.name))
+    return str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+
+def test_postgres_uses_range_containment():
+    assert "zip_code_ranges.zip_range @> 12345" in compile_coverage(postgresql.dialect())
+
+
+def test_other_dialects_fall_back_to_bounds():
+    sql = compile_coverage(sqlite.dialect())
+    assert "@>" not in sql
+    assert "zip_code_ranges.min_zip_code <= 12345" in sql
+    assert "zip_code_ranges.max_zip_code >= 12345" in sql
+
+
+def test_postgres_joins_zip_code_values_on_range_containment():
+    patient_zips = zip_code_values([12345, 23456], "postgresql")
+    stmt = select(ZipCodeRange.id).join(patient_zips, zip_range_covers(patient_zips.c.zip_code, "postgresql"))
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "unnest(" in sql
+    assert "zip_code_ranges.zip_range @> anon_1.zip_code" in sql
+
+
+def test_postgres_schema_creates_gist_indexed_range():
+    statements = []
+    dialect = postgresql.dialect()
+    engine = create_mock_engine(
+        "postgresql://", lambda sql, *args, **kwargs: statements.append(str(sql.compile(dialect=dialect)))
+    )
+    Base.metadata.create_all(engine, checkfirst=False)
+
+    ddl = "\n".join(statements)
+    assert "ADD COLUMN zip_range int4range" in ddl
+    assert "USING gist (zip_range)" in ddl
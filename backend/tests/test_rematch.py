@@ -0,0 +1,89 @@
+import json
+import random
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.models.capacity_type import CapacityType
+from app.domain.models.care_type import CareType
+from app.domain.models.facility import Facility
+from app.domain.models.patient import Patient
+from app.infrastructure.database.models import Patient as PatientModel
+from app.infrastructure.repositories.facility_repository import FacilityRepository
+from app.infrastructure.repositories.patient_repository import PatientRepository
+from app.rematch import Checkpoint, rematch
+from app.use_cases.match_facility import MatchFacilityUseCase
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture
+async def seeded(db_engine) -> sessionmaker:
+    session_factory = sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+    rng = random.Random(5)
+    async with session_factory() as session:
+        facilities = FacilityRepository(session)
+        for zip_code, capacity, care_types in [
+            ("10000", CapacityType.AVAILABLE, [CareType.ambulatory]),
+            ("10400", CapacityType.AVAILABLE, [CareType.ambulatory, CareType.stationary]),
+            ("10200", CapacityType.FULL, [CareType.stationary]),
+        ]:
+            await facilities.create_with_zip_ranges(
+                Facility(name=f"Facility {zip_code}", zip_code=zip_code, capacity=capacity, care_types=care_types),
+                [{"min_zip_code": 9000, "max_zip_code": 12000}],
+            )
+
+        patients = PatientRepository(session)
+        for number in range(40):
+            zip_code = rng.choice([None, "unknown", *(str(rng.randint(8000, 14000)) for _ in range(8))])
+            patient = await patients.create(
+                Patient(name=f"Patient {number}", care_type=rng.choice(list(CareType)), zip_code=zip_code)
+            )
+            if number == 0:
+                await patients.soft_delete(patient.id)
+        await session.commit()
+    return session_factory
+
+
+async def assignments(session_factory: sessionmaker) -> dict[str, str | None]:
+    async with session_factory() as session:
+        result = await session.execute(
+            select(PatientModel.id, PatientModel.facility_id).where(PatientModel.deleted_at.is_(None))
+        )
+        return {str(id): str(facility_id) if facility_id else None for id, facility_id in result.all()}
+
+
+@pytest.mark.asyncio
+async def test_rematch_assigns_what_the_use_case_matches(seeded, tmp_path):
+    checkpoint_path = tmp_path / "checkpoint.json"
+
+    checkpoint = await rematch(seeded, chunk_size=7, workers=2, checkpoint_path=checkpoint_path, report=lambda _: None)
+
+    assert checkpoint.processed == 39
+    assert not checkpoint_path.exists()
+    assigned = await assignments(seeded)
+    async with seeded() as session:
+        use_case = MatchFacilityUseCase(FacilityRepository(session))
+        for patient in await PatientRepository(session).get_chunk(100):
+            zip_code = patient.zip_code if patient.zip_code and patient.zip_code.isdigit() else None
+            expected = await use_case.execute(patient.care_type, zip_code)
+            assert assigned[patient.id] == (expected.id if expected else None)
+    assert checkpoint.matched == sum(1 for facility_id in assigned.values() if facility_id)
+    assert checkpoint.matched > 0
+
+
+@pytest.mark.asyncio
+async def test_rematch_resumes_after_the_checkpoint(seeded, tmp_path):
+    async with seeded() as session:
+        patient_ids = [patient.id for patient in await PatientRepository(session).get_chunk(100)]
+    checkpoint_path = tmp_path / "checkpoint.json"
+    checkpoint_path.write_text(json.dumps({"after_id": patient_ids[19], "processed": 20, "matched": 0}))
+
+    checkpoint = await rematch(seeded, chunk_size=50, workers=1, checkpoint_path=checkpoint_path, report=lambda _: None)
+
+    assert checkpoint == Checkpoint(after_id=patient_ids[-1], processed=39, matched=checkpoint.matched)
+    async with seeded() as session:
+        result = await session.execute(select(PatientModel.id).where(PatientModel.matched_at.is_not(None)))
+        assert sorted(str(id) for id in result.scalars()) == sorted(patient_ids[20:])
@@ -0,0 +1,113 @@
+import asyncio
+
+from app.domain.models.capacity_type import CapacityType
+from app.domain.models.care_type import CareType
+from app.infrastructure.cache.backend import InMemoryCacheBackend
+from app.use_cases.facility_changes import FacilityChanges
+from app.use_cases.match_cache import MISS, MatchCache
+from app.use_cases.match_table import FacilityMatchTables
+from app.use_cases.zip_range_index import FacilityZipIndex
+from tests.factories import make_facility
+
+
+def make_worker(backend: InMemoryCacheBackend) -> FacilityChanges:
+    zip_index = FacilityZipIndex()
+    zip_index.load(CareType.ambulatory, [])
+    return FacilityChanges(zip_index, FacilityMatchTables(), MatchCache(backend), backend)
+
+
+async def test_writes_fan_out_to_other_workers():
+    backend = InMemoryCacheBackend()
+    writer, reader = make_worker(backend), make_worker(backend)
+    listener = asyncio.create_task(reader.listen())
+    await asyncio.sleep(0)
+
+    facility = make_facility([(9000, 20000)], zip_code="10000")
+    await writer.facility_saved(facility)
+    await asyncio.sleep(0)
+    assert [f.id for f in reader.zip_index.get(CareType.ambulatory).covering(10000)] == [facility.id]
+
+    await writer.capacity_changed(None, [facility.id], CapacityType.FULL)
+    await asyncio.sleep(0)
+    assert reader.zip_index.get(CareType.ambulatory).covering(10000)[0].capacity == CapacityType.FULL
+
+    await writer.facility_removed(facility.id)
+    await asyncio.sleep(0)
+    assert reader.zip_index.get(CareType.ambulatory).covering(10000) == []
+
+    await writer.facilities_imported([CareType.ambulatory])
+    await asyncio.sleep(0)
+    assert reader.zip_index.get(CareType.ambulatory) is None
+    listener.cancel()
+
+
+class FlakyBackend(InMemoryCacheBackend):
+    """Drops the first subscription once a message arrives, like a lost Redis connection."""
+
+    def __init__(self):
+        super().__init__()
+        self.subscriptions = 0
+
+    async def subscribe(self, channel: str):
+        self.subscriptions += 1
+        subscription = self.subscriptions
+        async for message in super().subscribe(channel):
+            if subscription == 1:
+                raise ConnectionError("connection lost")
+            yield message
+
+
+async def test_listener_skips_bad_messages_and_resubscribes_after_errors():
+    backend = FlakyBackend()
+    writer, reader = make_worker(backend), make_worker(backend)
+    listener = asyncio.create_task(reader.listen(retry_seconds=0))
+    await asyncio.sleep(0)
+
+    await backend.publish(writer.channel, "not json")
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert backend.subscriptions == 2
+    # writes published while disconnected are lost, the index is reloaded on next use
+    assert reader.zip_index.get(CareType.ambulatory) is None
+
+    reader.zip_index.load(CareType.ambulatory, [])
+    await backend.publish(writer.channel, "not json")
+    facility = make_facility([(9000, 20000)], zip_code="10000")
+    await writer.facility_saved(facility)
+    await asyncio.sleep(0)
+    assert [f.id for f in reader.zip_index.get(CareType.ambulatory).covering(10000)] == [facility.id]
+    assert backend.subscriptions == 2
+    listener.cancel()
+
+
+async def test_saving_a_facility_drops_the_matches_it_can_change():
+    changes = make_worker(InMemoryCacheBackend())
+    cache = changes.match_cache
+    facility = make_facility([(9000, 20000)], zip_code="12000")
+    await cache.put(CareType.ambulatory, 10000, None)
+    await cache.put(CareType.ambulatory, 16000, None)
+    await cache.put(CareType.stationary, 10000, None)
+
+    await changes.facility_saved(facility)
+
+    assert await cache.get(CareType.ambulatory, 10000) is MISS
+    # out of the match distance of the facility
+    assert await cache.get(CareType.ambulatory, 16000) is None
+    assert await cache.get(CareType.stationary, 10000) is None
+
+
+async def test_remote_writes_keep_pending_matches_from_being_cached():
+    backend = InMemoryCacheBackend()
+    writer, reader = make_worker(backend), make_worker(backend)
+    listener = asyncio.create_task(reader.listen())
+    await asyncio.sleep(0)
+
+    # the reader computes a match while the writer changes the facility
+    generation = reader.match_cache.generation
+    facility = make_facility([(9000, 20000)], zip_code="10000")
+    await writer.facility_saved(facility)
+    await asyncio.sleep(0)
+    await reader.match_cache.put(CareType.ambulatory, 10000, None, generation=generation)
+
+    assert await reader.match_cache.get(CareType.ambulatory, 10000) is MISS
+    listener.cancel()
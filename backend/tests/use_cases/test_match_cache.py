@@ -0,0 +1,60 @@
+from app.domain.models.care_type import CareType
+from app.infrastructure.cache.backend import InMemoryCacheBackend
+from app.use_cases.match_cache import MISS, MatchCache
+from tests.factories import make_facility
+
+
+async def test_hits_and_misses_are_counted():
+    cache = MatchCache(InMemoryCacheBackend())
+    facility = make_facility()
+
+    assert await cache.get(CareType.ambulatory, 10000) is MISS
+    await cache.put(CareType.ambulatory, 10000, facility)
+    await cache.put(CareType.ambulatory, 10001, None)
+    assert await cache.get(CareType.ambulatory, 10000) == facility
+    assert await cache.get(CareType.ambulatory, 10001) is None
+    assert cache.stats() == {"hits": 2, "misses": 1, "size": 2, "evictions": 0}
+
+
+async def test_workers_sharing_a_backend_share_entries():
+    backend = InMemoryCacheBackend()
+    facility = make_facility()
+    await MatchCache(backend).put(CareType.ambulatory, 10000, facility)
+
+    other_worker = MatchCache(backend)
+    assert await other_worker.get(CareType.ambulatory, 10000) == facility
+    await other_worker.invalidate_facility(facility.id)
+    assert await MatchCache(backend).get(CareType.ambulatory, 10000) is MISS
+
+
+async def test_invalidation_is_limited_to_the_affected_matches():
+    cache = MatchCache(InMemoryCacheBackend())
+    facility = make_facility()
+    await cache.put(CareType.ambulatory, 10000, facility)
+    await cache.put(CareType.ambulatory, 20000, facility)
+    await cache.put(CareType.ambulatory, 10500, None)
+    await cache.put(CareType.ambulatory, 30000, None)
+    await cache.put(CareType.stationary, 10500, None)
+
+    await cache.invalidate_span(CareType.ambulatory, 10100, 20000)
+    assert await cache.get(CareType.ambulatory, 10500) is MISS
+    assert await cache.get(CareType.ambulatory, 20000) is MISS
+    assert await cache.get(CareType.ambulatory, 10000) == facility
+    assert await cache.get(CareType.stationary, 10500) is None
+
+    await cache.invalidate_facility(facility.id)
+    assert await cache.get(CareType.ambulatory, 10000) is MISS
+    assert await cache.get(CareType.ambulatory, 30000) is None
+
+    await cache.invalidate_care_type(CareType.ambulatory)
+    assert await cache.get(CareType.ambulatory, 30000) is MISS
+    assert await cache.get(CareType.stationary, 10500) is None
+
+
+async def test_put_computed_before_an_invalidation_is_dropped():
+    cache = MatchCache(InMemoryCacheBackend())
+    generation = cache.generation
+    await cache.invalidate_care_type(CareType.ambulatory)
+    await cache.put(CareType.ambulatory, 10000, None, generation=generation)
+
+    assert await cache.get(CareType.ambulatory, 10000) is MISS
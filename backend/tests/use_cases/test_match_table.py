@@ -0,0 +1,43 @@
+import random
+
+from app.domain.models.care_type import CareType
+from app.use_cases.match_facility import MatchFacilityUseCase
+from app.use_cases.match_table import FacilityMatchTables, MatchTable
+from app.use_cases.zip_range_index import FacilityZipIndex, ZipRangeIndex
+from tests.factories import random_facility
+
+
+def assert_matches_use_case(table: MatchTable, index: ZipRangeIndex) -> None:
+    for zip_code in range(9000, 37000, 7):
+        expected = MatchFacilityUseCase._best_match(index.covering(zip_code), zip_code)
+        winner = table.lookup(zip_code)
+        assert (winner.id if winner else None) == (expected.id if expected else None), zip_code
+
+
+def test_table_matches_the_use_case_rules():
+    rng = random.Random(7)
+    index = ZipRangeIndex([random_facility(rng) for _ in range(60)])
+
+    assert_matches_use_case(MatchTable(index), index)
+
+
+def test_incremental_refresh_matches_a_full_rebuild():
+    rng = random.Random(11)
+    zip_index = FacilityZipIndex()
+    index = zip_index.load(CareType.ambulatory, [random_facility(rng) for _ in range(40)])
+    tables = FacilityMatchTables()
+    table = tables.get(CareType.ambulatory, index)
+
+    for _ in range(60):
+        facility_id = rng.choice(index.facilities()).id
+        before = zip_index.find(facility_id)
+        if rng.random() < 0.2:
+            zip_index.remove(facility_id)
+            tables.facility_changed(before, None)
+        else:
+            after = random_facility(rng, facility_id=facility_id if rng.random() < 0.7 else None)
+            zip_index.upsert(after)
+            tables.facility_changed(before if after.id == facility_id else None, after)
+
+    assert tables.get(CareType.ambulatory, index) is table
+    assert_matches_use_case(table, index)
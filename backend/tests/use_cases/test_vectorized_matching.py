@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from app.domain.models.care_type import CareType
+from app.use_cases.match_facility import MatchFacilityUseCase
+from app.use_cases.vectorized_matching import NO_MATCH, FacilityArrays
+from app.use_cases.zip_range_index import FacilityZipIndex
+from tests.factories import random_facility
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.mark.asyncio
+async def test_vectorized_matches_equal_the_use_case():
+    rng = random.Random(3)
+    facilities = [
+        random_facility(rng, care_types=rng.sample(list(CareType), rng.randint(1, 2)), min_ranges=0) for _ in range(200)
+    ]
+    zip_index = FacilityZipIndex()
+    for care_type in CareType:
+        zip_index.load(care_type, [f for f in facilities if care_type in f.care_types])
+    use_case = MatchFacilityUseCase(facility_repository=None, zip_index=zip_index)
+
+    arrays = FacilityArrays(facilities)
+    requests = [(rng.choice(list(CareType)), str(rng.randint(8000, 36000))) for _ in range(3000)]
+    requests += [(CareType.ambulatory, None), (CareType.stationary, "")]
+
+    expected = await use_case.execute_many(requests)
+    for care_type in CareType:
+        positions = [position for position, request in enumerate(requests) if request[0] == care_type]
+        matches = arrays.match(care_type, [requests[position][1] for position in positions])
+        assert [match.id if match else None for match in matches] == [
+            expected[position].id if expected[position] else None for position in positions
+        ]
+
+
+def test_no_facilities_match_nothing():
+    arrays = FacilityArrays([])
+
+    assert len(arrays) == 0
+    assert arrays.match_positions(CareType.ambulatory, np.array([10000, 20000])).tolist() == [NO_MATCH, NO_MATCH]
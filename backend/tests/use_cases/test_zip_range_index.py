@@ -0,0 +1,103 @@
+import random
+import uuid
+
+from app.domain.models.care_type import CareType
+from app.use_cases.zip_range_index import FacilityZipIndex, ZipRangeIndex
+from tests.factories import make_facility, random_facility
+
+
+def covering_ids(index: ZipRangeIndex, zip_code: int) -> set[str]:
+    return {facility.id for facility in index.covering(zip_code)}
+
+
+def test_covering_respects_inclusive_bounds():
+    first = make_facility([(10000, 10999)])
+    second = make_facility([(10500, 11500), (20000, 20000)])
+    index = ZipRangeIndex([first, second])
+
+    assert covering_ids(index, 9999) == set()
+    assert covering_ids(index, 10000) == {first.id}
+    assert covering_ids(index, 10500) == {first.id, second.id}
+    assert covering_ids(index, 10999) == {first.id, second.id}
+    assert covering_ids(index, 11000) == {second.id}
+    assert covering_ids(index, 11501) == set()
+    assert covering_ids(index, 20000) == {second.id}
+    assert covering_ids(index, 20001) == set()
+
+
+def test_overlapping_ranges_of_one_facility_are_reported_once():
+    facility = make_facility([(100, 300), (200, 400)])
+    index = ZipRangeIndex([facility])
+
+    assert [f.id for f in index.covering(250)] == [facility.id]
+    assert covering_ids(index, 350) == {facility.id}
+
+
+def test_upsert_and_remove_update_lookups():
+    facility = make_facility([(100, 200)])
+    index = ZipRangeIndex([facility])
+    assert covering_ids(index, 150) == {facility.id}
+
+    moved = facility.model_copy(
+        update={
+            "zip_code_ranges": [
+                facility.zip_code_ranges[0].model_copy(update={"min_zip_code": 500, "max_zip_code": 600})
+            ]
+        }
+    )
+    index.upsert(moved)
+    assert covering_ids(index, 150) == set()
+    assert covering_ids(index, 550) == {facility.id}
+
+    assert index.remove(facility.id)
+    assert covering_ids(index, 550) == set()
+    assert not index.remove(facility.id)
+
+
+def test_incremental_updates_match_a_scan():
+    rng = random.Random(7)
+    facilities = {}
+    index = ZipRangeIndex()
+    for step in range(400):
+        if facilities and rng.random() < 0.3:
+            facility_id = rng.choice(sorted(facilities))
+            del facilities[facility_id]
+            assert index.remove(facility_id)
+        else:
+            # reuse ids so that upserts also move ranges of indexed facilities
+            facility_id = str(uuid.UUID(int=rng.randrange(100)))
+            facilities[facility_id] = random_facility(rng, facility_id=facility_id)
+            index.upsert(facilities[facility_id])
+
+        if step % 20 == 0:
+            for zip_code in range(9900, 34200, 97):
+                expected = {
+                    facility.id
+                    for facility in facilities.values()
+                    if any(r.min_zip_code <= zip_code <= r.max_zip_code for r in facility.zip_code_ranges)
+                }
+                assert covering_ids(index, zip_code) == expected
+    assert len(index) == len(facilities)
+
+
+def test_facility_zip_index_follows_care_type_changes():
+    facility = make_facility([(100, 200)], care_types=[CareType.ambulatory])
+    zip_index = FacilityZipIndex()
+    zip_index.load(CareType.ambulatory, [facility])
+    zip_index.load(CareType.stationary, [])
+
+    zip_index.upsert(facility.model_copy(update={"care_types": [CareType.stationary]}))
+    assert covering_ids(zip_index.get(CareType.ambulatory), 150) == set()
+    assert covering_ids(zip_index.get(CareType.stationary), 150) == {facility.id}
+
+    zip_index.remove(facility.id)
+    assert covering_ids(zip_index.get(CareType.stationary), 150) == set()
+
+
+def test_stale_load_is_not_cached():
+    zip_index = FacilityZipIndex()
+    generation = zip_index.generation
+    zip_index.remove(str(uuid.uuid4()))
+
+    zip_index.load(CareType.ambulatory, [], generation=generation)
+    assert zip_index.get(CareType.ambulatory) is None